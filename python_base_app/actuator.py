@@ -29,7 +29,8 @@ ACTUATOR_BLUEPRINT_ADAPTER = blueprint_adapter.BlueprintAdapter()
 
 class ActuatorViewHandler(object):
 
-    def __init__(self, p_app, p_url_prefix):
+    def __init__(self, p_app, p_url_prefix, p_task_statistics_provider=None):
+        self._task_statistics_provider = p_task_statistics_provider
         self._blueprint = flask.Blueprint(ACTUATOR_BLUEPRINT_NAME, python_base_app.__name__)
         ACTUATOR_BLUEPRINT_ADAPTER.assign_view_handler_instance(p_blueprint=self._blueprint,
             p_view_handler_instance=self)
@@ -41,5 +42,13 @@ class ActuatorViewHandler(object):
 
         return flask.Response("ok", mimetype='application/txt')
 
+    @ACTUATOR_BLUEPRINT_ADAPTER.route_method(p_rule="/tasks")
+    def tasks(self):
+
+        if self._task_statistics_provider is None:
+            return flask.Response("no task statistics available", status=404, mimetype='application/txt')
+
+        return flask.jsonify(self._task_statistics_provider())
+
     def destroy(self):
         ACTUATOR_BLUEPRINT_ADAPTER.unassign_view_handler_instances()
\ No newline at end of file
@@ -19,21 +19,36 @@
 #    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
 import argparse
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
 import datetime
-import heapq
 import os
 import pathlib
+import random
+import select
 import signal
+import socket
+import threading
 import time
 
 import flask
 
+from python_base_app import config_cache
+from python_base_app import config_provider
+from python_base_app import config_validator
+from python_base_app import config_watcher
 from python_base_app import configuration
+from python_base_app import cron
 from python_base_app import daemon
 from python_base_app import exceptions
 from python_base_app import locale_helper
 from python_base_app import log_handling
+from python_base_app import scheduler
 from python_base_app import settings
+from python_base_app import stats
+from python_base_app import supervisor
 from python_base_app import tools
 from some_flask_helpers.blueprint_adapter import LOG_NAME as BLUEPRINT_ADAPTER_LOG_NAME
 
@@ -51,9 +66,24 @@ DEFAULT_LOCALE = "en_US"
 
 TIME_SLACK = 0.1  # seconds
 ETERNITY = 24 * 3600  # seconds
+WAKEUP_BUFFER_SIZE = 1024
 DEFAULT_TASK_INTERVAL = 10  # seconds
 DEFAULT_MAXIMUM_TIMER_SLACK = 5  # second
 DEFAULT_MINIMUM_DOWNTIME_DURATION = 20  # seconds
+DEFAULT_TASK_WORKER_COUNT = 0  # no thread pool: execute tasks inline in the event queue
+DEFAULT_TASK_CONCURRENCY_LIMIT = 1  # parallel runs of the same task
+DEFAULT_ASYNCIO_EVENT_LOOP = False
+DEFAULT_PERSIST_SCHEDULER_STATE = False
+DEFAULT_SCHEDULER_STATE_SAVE_INTERVAL = 60  # seconds
+DEFAULT_WORKER_PROCESSES = 0  # no supervisor: run the application in a single process
+DEFAULT_RELOAD_CONFIGURATION_ON_SIGHUP = False  # SIGHUP terminates the application
+DEFAULT_WATCH_CONFIGURATION_FILES = False
+DEFAULT_CONFIGURATION_POLL_INTERVAL = 5  # seconds, only used if inotify is not available
+DEFAULT_CONFIGURATION_PROVIDER_REFRESH_INTERVAL = 0  # seconds, 0 = no refresh
+SCHEDULER_STATE_FILENAME = "scheduler_state.json"
+WORKER_SCHEDULER_STATE_FILENAME = "scheduler_state.{index}.json"
+TASK_THREAD_NAME_PREFIX = "RecurringTask"
+ONE_SHOT_TASK_NAME = "one-shot"
 
 CONTRIB_LOG_PATHS = [
     "alembic.runtime.migration",
@@ -70,6 +100,19 @@ class BaseAppConfigModel(configuration.ConfigModel):
         self.spool_dir = configuration.NONE_STRING
         self.minimum_downtime_duration = DEFAULT_MINIMUM_DOWNTIME_DURATION
         self.maximum_timer_slack = DEFAULT_MAXIMUM_TIMER_SLACK
+        self.task_worker_count = DEFAULT_TASK_WORKER_COUNT
+        self.task_concurrency_limit = DEFAULT_TASK_CONCURRENCY_LIMIT
+        self.asyncio_event_loop = DEFAULT_ASYNCIO_EVENT_LOOP
+        self.persist_scheduler_state = DEFAULT_PERSIST_SCHEDULER_STATE
+        self.scheduler_state_save_interval = DEFAULT_SCHEDULER_STATE_SAVE_INTERVAL
+        self.worker_processes = DEFAULT_WORKER_PROCESSES
+        self.reload_configuration_on_sighup = DEFAULT_RELOAD_CONFIGURATION_ON_SIGHUP
+        self.watch_configuration_files = DEFAULT_WATCH_CONFIGURATION_FILES
+        self.configuration_poll_interval = DEFAULT_CONFIGURATION_POLL_INTERVAL
+        self.configuration_provider_refresh_interval = DEFAULT_CONFIGURATION_PROVIDER_REFRESH_INTERVAL
+
+        # Prefix of the environment variables overriding settings (e.g. "MYAPP_" for MYAPP_SECTION__option)
+        self.environment_prefix = configuration.NONE_STRING
 
     def is_active(self):
         return True
@@ -77,61 +120,295 @@ class BaseAppConfigModel(configuration.ConfigModel):
 
 class RecurringTask(object):
 
+    is_one_shot = False
+
+    __slots__ = ("name", "handler_method", "interval", "fixed_schedule", "ignore_exceptions",
+                 "concurrency_limit", "active_runs", "cron_expression", "jitter", "splay",
+                 "deadline", "base_deadline", "last_run", "statistics", "heap_entry", "paused", "cancelled")
+
     def __init__(self, p_name, p_handler_method, p_interval=DEFAULT_TASK_INTERVAL, p_fixed_schedule=False,
-                 p_ignore_exceptions=False):
+                 p_ignore_exceptions=False, p_concurrency_limit=None,
+                 p_cron_expression=None, p_jitter=0, p_splay=0):
+        """
+        :param p_cron_expression: optional cron expression (e.g. "*/5 * * * *") in local time replacing the
+                                  fixed interval
+        :param p_jitter: maximum random delay in seconds added to each execution
+        :param p_splay: maximum random delay in seconds of the first execution (also of cron schedules)
+        """
 
         self.name = p_name
         self.handler_method = p_handler_method
         self.interval = p_interval
-        self.next_execution = None
         self.fixed_schedule = p_fixed_schedule
         self.ignore_exceptions = p_ignore_exceptions
+        self.jitter = p_jitter
+        self.splay = p_splay
+
+        if p_cron_expression is not None:
+            self.cron_expression = cron.get_cron_expression(p_expression=p_cron_expression)
+
+        else:
+            self.cron_expression = None
+
+        # Only relevant if the tasks are executed by a thread pool (see [BaseApp]task_worker_count).
+        # None means that [BaseApp]task_concurrency_limit applies.
+        self.concurrency_limit = p_concurrency_limit
+        self.active_runs = 0
+
+        # Next execution time as value of the monotonic clock in nanoseconds (including jitter)
+        self.deadline = None
+
+        # Next execution time without jitter (so that the jitter does not accumulate for fixed schedules)
+        self.base_deadline = None
+
+        # Wall clock time (seconds since the epoch) of the latest execution
+        self.last_run = None
+
+        self.statistics = stats.TaskStatistics()
+
+        # State maintained by the scheduler
+        self.heap_entry = None
+        self.paused = False
+        self.cancelled = False
+
+    @property
+    def schedule_description(self):
+
+        if self.cron_expression is not None:
+            return f"at '{self.cron_expression}'"
+
+        return f"every {self.interval} seconds"
+
+    @property
+    def next_execution(self):
+
+        if self.deadline is None:
+            return None
+
+        seconds_from_now = scheduler.ns_to_seconds(self.deadline - scheduler.monotonic_ns())
+        return datetime.datetime.utcnow() + datetime.timedelta(seconds=seconds_from_now)
+
+    # The comparison and arithmetic operators and get_heap_entry() are kept for callers which used to order
+    # tasks by next_execution themselves. The scheduler only looks at the monotonic deadlines.
 
     def __lt__(self, p_other):
+        if isinstance(p_other, RecurringTask):
+            return self.deadline < p_other.deadline
+
         return self.next_execution < p_other
 
     def __gt__(self, p_other):
+        if isinstance(p_other, RecurringTask):
+            return self.deadline > p_other.deadline
+
         return self.next_execution > p_other
 
     def __sub__(self, p_other):
         if isinstance(p_other, RecurringTask):
-            return self.next_execution - p_other.next_execution
+            return datetime.timedelta(seconds=scheduler.ns_to_seconds(self.deadline - p_other.deadline))
 
         else:
             return self.next_execution - p_other
 
     def __rsub__(self, p_other):
         if isinstance(p_other, RecurringTask):
-            return p_other.next_execution - self.next_execution
+            return datetime.timedelta(seconds=scheduler.ns_to_seconds(p_other.deadline - self.deadline))
 
         else:
             return p_other - self.next_execution
 
     def get_heap_entry(self):
 
-        # return (self, self)
         return self
 
-    def compute_next_execution_time(self):
+    def adapt_to_delay(self, p_delay, p_now=None):
+        """
+        Postpones the task by p_delay seconds but not beyond get_deadline_limit(). Tasks held by a scheduler
+        have to be postponed by Scheduler.shift() (see BaseApp.adapt_active_recurring_tasks()) instead.
+        """
+
+        if self.deadline is None:
+            return
+
+        if p_now is None:
+            p_now = scheduler.monotonic_ns()
+
+        new_deadline = self.deadline + scheduler.seconds_to_ns(p_delay)
+        limit = self.get_deadline_limit(p_now=p_now)
+
+        if limit is not None and new_deadline > limit:
+            new_deadline = limit
 
-        if self.next_execution is None:
-            self.next_execution = datetime.datetime.utcnow()
+        self.shift_deadline(p_shift=new_deadline - self.deadline)
+
+    def get_next_cron_deadline(self, p_now, p_wall_now=None):
+        """
+        :param p_wall_now: wall clock time (seconds since the epoch) corresponding to p_now
+        """
+
+        if p_wall_now is None:
+            p_wall_now = time.time()
+
+        next_run = self.cron_expression.get_next_timestamp(p_after=p_wall_now)
+        return p_now + scheduler.seconds_to_ns(next_run - p_wall_now)
+
+    def compute_next_execution_time(self, p_now=None):
+
+        if p_now is None:
+            p_now = scheduler.monotonic_ns()
+
+        if self.cron_expression is not None:
+            first_execution = self.base_deadline is None
+            self.base_deadline = self.get_next_cron_deadline(p_now=p_now)
+
+            if first_execution and self.splay > 0:
+                self.base_deadline += scheduler.seconds_to_ns(random.uniform(0, self.splay))
+
+        elif self.base_deadline is None:
+            self.base_deadline = p_now
+
+            if self.splay > 0:
+                self.base_deadline += scheduler.seconds_to_ns(random.uniform(0, self.splay))
 
         elif self.fixed_schedule:
-            self.next_execution = self.next_execution + datetime.timedelta(seconds=self.interval)
+            self.base_deadline = self.base_deadline + scheduler.seconds_to_ns(self.interval)
 
         else:
-            self.next_execution = datetime.datetime.utcnow() + datetime.timedelta(seconds=self.interval)
+            self.base_deadline = p_now + scheduler.seconds_to_ns(self.interval)
+
+        self.deadline = self.base_deadline
+
+        if self.jitter > 0:
+            self.deadline += scheduler.seconds_to_ns(random.uniform(0, self.jitter))
+
+    def restore_schedule(self, p_next_run, p_now=None):
+        """
+        Continues a schedule persisted by a previous process.
+
+        :param p_next_run: wall clock time (seconds since the epoch) of the next execution
+        """
+
+        if self.cron_expression is not None:
+            # Cron schedules are based on the wall clock anyway
+            self.compute_next_execution_time(p_now=p_now)
+            return
 
-    def adapt_to_delay(self, p_delay):
+        if p_now is None:
+            p_now = scheduler.monotonic_ns()
+
+        seconds_from_now = p_next_run - time.time()
+
+        if seconds_from_now <= 0:
+            # The task became due while the process was not running. Spread all of these tasks over their
+            # interval so that they are not executed at the same time right after the restart.
+            seconds_from_now = random.uniform(0, self.interval)
+
+        self.base_deadline = p_now + scheduler.seconds_to_ns(min(seconds_from_now, self.interval))
+        self.deadline = self.base_deadline
+
+    def reset_schedule(self):
+
+        # The next call of compute_next_execution_time() will behave like the first one
+        self.deadline = None
+        self.base_deadline = None
+
+    def shift_deadline(self, p_shift):
+
+        if p_shift != 0:
+            self.deadline += p_shift
+
+            if self.base_deadline is not None:
+                self.base_deadline += p_shift
+
+    def get_deadline_limit(self, p_now):
+        """
+        :return: the latest deadline (monotonic clock in nanoseconds) that a delay may postpone the task to
+        """
+
+        if self.cron_expression is not None:
+            return self.get_next_cron_deadline(p_now=p_now)
+
+        # Don't schedule more than one interval into the future!
+        return p_now + scheduler.seconds_to_ns(self.interval)
+
+    def change_interval(self, p_interval, p_now):
+
+        interval_difference = scheduler.seconds_to_ns(p_interval - self.interval)
+        self.interval = p_interval
 
-        if self.next_execution is not None:
-            self.next_execution = self.next_execution + datetime.timedelta(seconds=p_delay)
-            limit = datetime.datetime.utcnow() + datetime.timedelta(seconds=self.interval)
+        if self.base_deadline is not None and self.cron_expression is None:
+            # Keep the time of the latest execution as reference but do not schedule into the past
+            self.base_deadline = max(p_now, self.base_deadline + interval_difference)
+            self.deadline = self.base_deadline
 
-            # Don't schedule more than one interval into the future!
-            if self.next_execution > limit:
-                self.next_execution = limit
+
+class OneShotTask(RecurringTask):
+    """
+    Task which is executed exactly once after a delay and reports its outcome through a future. It shares the
+    heap and the executor with the recurring tasks but it is never rescheduled.
+    """
+
+    __slots__ = ("delay", "future", "function", "args", "kwargs")
+
+    is_one_shot = True
+
+    def __init__(self, p_function, p_delay=0, *args, **kwargs):
+
+        if asyncio.iscoroutinefunction(p_function):
+            handler_method = self.execute_coroutine
+
+        else:
+            handler_method = self.execute
+
+        super().__init__(p_name=getattr(p_function, "__name__", ONE_SHOT_TASK_NAME),
+                         p_handler_method=handler_method, p_ignore_exceptions=True)
+
+        self.delay = p_delay
+        self.future = concurrent.futures.Future()
+        self.function = p_function
+        self.args = args
+        self.kwargs = kwargs
+
+    @property
+    def schedule_description(self):
+        return f"once in {self.delay} seconds"
+
+    def compute_next_execution_time(self, p_now=None):
+
+        if p_now is None:
+            p_now = scheduler.monotonic_ns()
+
+        self.base_deadline = p_now + scheduler.seconds_to_ns(self.delay)
+        self.deadline = self.base_deadline
+
+    def get_deadline_limit(self, p_now):
+
+        # One-shot tasks are postponed by the complete delay
+        return None
+
+    def execute(self):
+
+        if not self.future.set_running_or_notify_cancel():
+            return
+
+        try:
+            self.future.set_result(self.function(*self.args, **self.kwargs))
+
+        except Exception as e:
+            self.future.set_exception(e)
+            raise e
+
+    async def execute_coroutine(self):
+
+        if not self.future.set_running_or_notify_cancel():
+            return
+
+        try:
+            self.future.set_result(await self.function(*self.args, **self.kwargs))
+
+        except Exception as e:
+            self.future.set_exception(e)
+            raise e
 
 
 class BaseApp(daemon.Daemon):
@@ -146,7 +423,28 @@ class BaseApp(daemon.Daemon):
         self._arguments = p_arguments
         self._logger = log_handling.get_logger(self.__class__.__name__)
         self._config = None
-        self._recurring_tasks = []
+        self._scheduler = scheduler.Scheduler(p_wakeup_callback=self.wakeup_event_queue)
+        self._clock_drift_detector = scheduler.ClockDriftDetector()
+        self._task_executor = None
+        self._task_lock = threading.Lock()
+        self._task_exceptions = collections.deque()
+        self._event_loop = None
+        self._event_loop_timer = None
+        self._event_loop_stopped = None
+        self._event_loop_runs = set()
+        self._event_queue_thread_id = None
+        self._worker_index = None
+        self._configuration_watcher = None
+        self._configuration_provider = None
+        self._configuration_validator = None
+        self._scheduler_state_store = None
+        self._scheduler_state = None
+        self._latest_scheduler_state_save = None
+        self._wakeup_receiver = None
+        self._wakeup_sender = None
+        self.create_wakeup_sockets()
+        self._reload_requested = False
+        self._posted_callbacks = collections.deque()
         self._downtime = 0
         self._locale_helper = None
         self._latest_request = None
@@ -238,33 +536,318 @@ class BaseApp(daemon.Daemon):
     def reset_down_time(self):
         self._downtime = 0
 
+    def get_task_statistics(self):
+        """
+        :return: dictionary of the runtime statistics (see stats.TaskStatistics) by task name
+        """
+
+        return {task.name: task.statistics.get_summary()
+                for task in self._scheduler.tasks() if not task.is_one_shot}
+
+    @property
+    def worker_index(self):
+        """
+        :return: index of the current worker process or None if the application does not run in
+                 worker mode (see [BaseApp]worker_processes)
+        """
+        return self._worker_index
+
+    @property
+    def is_primary_worker(self):
+        """
+        True if the process is responsible for the singleton services (e.g. the web server).
+        """
+        return self._worker_index is None or self._worker_index == 0
+
+    def is_responsible_for_task(self, p_name):
+
+        if self._worker_index is None:
+            return True
+
+        return supervisor.get_shard(p_name=p_name, p_shard_count=self._app_config.worker_processes) == \
+            self._worker_index
+
     def add_recurring_task(self, p_recurring_task):
+        """
+        :return: TaskHandle of the task or None if the task is executed by another worker process
+        """
+
+        if not self.is_responsible_for_task(p_name=p_recurring_task.name):
+            fmt = "Recurring task '{task}' is executed by another worker"
+            self._logger.debug(fmt.format(task=p_recurring_task.name))
+            return None
+
+        self._logger.info(f"Adding recurring task '{p_recurring_task.name}' {p_recurring_task.schedule_description}.")
 
-        self._logger.info(f"Adding recurring task '{p_recurring_task.name}' every {p_recurring_task.interval} seconds.")
+        task_state = self.get_persisted_task_state(p_name=p_recurring_task.name)
+        restored = task_state is not None and task_state.get("next_run") is not None
 
-        p_recurring_task.compute_next_execution_time()
-        heapq.heappush(self._recurring_tasks, p_recurring_task.get_heap_entry())
+        if restored:
+            fmt = "Restoring schedule of task '{task}'"
+            self._logger.debug(fmt.format(task=p_recurring_task.name))
+
+            p_recurring_task.last_run = task_state.get("last_run")
+            p_recurring_task.restore_schedule(p_next_run=task_state["next_run"])
+
+        return self._scheduler.add(p_task=p_recurring_task, p_keep_deadline=restored)
+
+    def get_scheduler_state_store(self):
+
+        if not self._app_config.persist_scheduler_state or self._app_config.spool_dir is None:
+            return None
+
+        if self._scheduler_state_store is None:
+            if self._worker_index is None:
+                filename = SCHEDULER_STATE_FILENAME
+
+            else:
+                filename = WORKER_SCHEDULER_STATE_FILENAME.format(index=self._worker_index)
+
+            self._scheduler_state_store = scheduler.SchedulerStateStore(
+                p_filename=os.path.join(self._app_config.spool_dir, filename))
+
+        return self._scheduler_state_store
+
+    def get_persisted_task_state(self, p_name):
+
+        store = self.get_scheduler_state_store()
+
+        if store is None:
+            return None
+
+        if self._scheduler_state is None:
+            try:
+                self._scheduler_state = store.load()
+
+            except Exception as e:
+                fmt = "Cannot read scheduler state from '{filename}': {msg} -> starting with a fresh schedule"
+                self._logger.warning(fmt.format(filename=store.filename, msg=str(e)))
+                self._scheduler_state = {}
+
+        return self._scheduler_state.get(p_name)
+
+    def save_scheduler_state(self, p_force=True):
+
+        store = self.get_scheduler_state_store()
+
+        if store is None:
+            return
+
+        now = scheduler.monotonic_ns()
+
+        if (not p_force and self._latest_scheduler_state_save is not None and
+                scheduler.ns_to_seconds(now - self._latest_scheduler_state_save) <
+                self._app_config.scheduler_state_save_interval):
+            return
+
+        self._latest_scheduler_state_save = now
+
+        try:
+            store.save(p_tasks=[task for task in self._scheduler.tasks() if not task.is_one_shot], p_now=now)
+
+        except Exception as e:
+            fmt = "Cannot write scheduler state to '{filename}': {msg}"
+            self._logger.warning(fmt.format(filename=store.filename, msg=str(e)))
+
+    def get_task_handle(self, p_name):
+
+        task = self._scheduler.get_task(p_name=p_name)
+
+        if task is None:
+            return None
+
+        return scheduler.TaskHandle(p_scheduler=self._scheduler, p_task=task)
+
+    def schedule_once(self, p_delay, p_function, *args, **kwargs):
+        """
+        Executes a function once after a delay using the same scheduler and executor as the recurring tasks.
+        May be called from any thread.
+
+        :param p_delay: delay in seconds
+        :return: concurrent.futures.Future receiving the result (or the exception) of the function.
+                 Cancelling the future removes the function from the schedule.
+        """
+
+        task = OneShotTask(p_function, p_delay, *args, **kwargs)
+
+        fmt = "Scheduling one-shot task '{task}' {description}"
+        self._logger.debug(fmt.format(task=task.name, description=task.schedule_description))
+
+        self._scheduler.add(p_task=task)
+        task.future.add_done_callback(lambda future: self.handle_one_shot_task_done(p_task=task))
+
+        return task.future
+
+    def handle_one_shot_task_done(self, p_task):
+
+        if p_task.future.cancelled():
+            self._scheduler.cancel(p_task=p_task)
+
+    def submit(self, p_function, *args, **kwargs):
+        """
+        Executes a function as soon as possible (see schedule_once()).
+        """
+
+        return self.schedule_once(0, p_function, *args, **kwargs)
+
+    def schedule_task(self, p_task, p_now=None):
+
+        if p_task.is_one_shot:
+            self._scheduler.remove(p_task=p_task)
+            return
+
+        p_task.compute_next_execution_time(p_now=p_now)
+        self._scheduler.push(p_task)
 
     @staticmethod
     def configuration_factory():
         return configuration.Configuration()
 
+    def read_configuration(self, p_configuration):
+        """
+        Reads the configuration files, the environment and the command line into a configuration without
+        touching the state of the application. May be called from any thread.
+        """
+
+        validator = self._configuration_validator
+
+        if validator is not None and validator.configuration is p_configuration:
+            # called by check_configuration() through prepare_configuration()
+            return self.validate_configuration(p_configuration=p_configuration, p_validator=validator)
+
+        app_config = p_configuration[self._app_name]
+        provider = self.get_configuration_provider()
+        provider_settings = None
+
+        if provider is not None:
+            # Reloads use the settings of the refresh thread instead of blocking the event queue with a request
+            provider_settings = provider.get_settings()
+
+        cache, cache_key = self.get_configuration_cache_entry(p_configuration=p_configuration,
+                                                              p_provider_settings=provider_settings)
+
+        if not self.restore_cached_configuration(p_configuration=p_configuration, p_cache=cache,
+                                                 p_cache_key=cache_key):
+            for afile in self._arguments.configurations:
+                p_configuration.read_config_file(afile)
+
+            if provider_settings is not None:
+                p_configuration.read_settings(p_settings=provider_settings, p_source=provider.source)
+
+            p_configuration.read_environment_parameters(p_environment_dict=os.environ,
+                                                        p_prefix=app_config.environment_prefix)
+            p_configuration.read_command_line_parameters(p_parameters=self._arguments.cmd_line_options)
+
+            if cache is not None:
+                cache.save(p_key=cache_key, p_snapshot=p_configuration.get_snapshot())
+
+        if app_config.spool_dir is None:
+            app_config.spool_dir = os.path.join(DEFAULT_SPOOL_BASE_DIR, self._dir_name)
+
+        p_configuration.check_constraints()
+
+        return p_configuration
+
+    def get_configuration_cache_entry(self, p_configuration, p_provider_settings):
+        """
+        :return: tuple (cache, key) or (None, None) if the configuration cannot be cached
+        """
+
+        cache = self.get_configuration_cache()
+
+        if cache is None:
+            return None, None
+
+        try:
+            cache_key = cache.get_key(p_filenames=self._arguments.configurations, p_environment=os.environ,
+                                      p_cmd_line_options=self._arguments.cmd_line_options,
+                                      p_configuration=p_configuration, p_provider_settings=p_provider_settings,
+                                      p_application_version=self.get_application_version())
+
+        except OSError:
+            # missing configuration file: reading it will report the error
+            return None, None
+
+        return cache, cache_key
+
+    def restore_cached_configuration(self, p_configuration, p_cache, p_cache_key):
+        """
+        :return: True if the configuration has been restored from the cache
+        """
+
+        if p_cache is None:
+            return False
+
+        snapshot = p_cache.load(p_key=p_cache_key)
+
+        if snapshot is None:
+            return False
+
+        fmt = "Using cached configuration from '{filename}'"
+        self._logger.info(fmt.format(filename=p_cache.filename))
+        p_configuration.restore_snapshot(p_snapshot=snapshot)
+
+        return True
+
+    def get_bootstrap_directory(self):
+        """
+        :return: directory for files needed before the configuration is read (so the configured spool directory
+                 cannot be used): the directory of the option --config-cache or the default spool directory
+        """
+
+        directory = getattr(self._arguments, "config_cache", None)
+
+        if not directory:
+            directory = os.path.join(DEFAULT_SPOOL_BASE_DIR, self._dir_name)
+
+        return directory
+
+    def get_application_version(self):
+        """
+        Override to return the version of the application. It is part of the key of the configuration cache so
+        that a new release never uses a configuration cached by the previous one.
+        """
+
+        return None
+
+    def get_configuration_cache(self):
+
+        if getattr(self._arguments, "config_cache", None) is None:
+            return None
+
+        return config_cache.ConfigurationCache(p_directory=self.get_bootstrap_directory())
+
+    def get_configuration_provider(self):
+
+        url = getattr(self._arguments, "config_provider_url", None)
+
+        if url is None:
+            return None
+
+        if self._configuration_provider is None:
+            # Like the configuration cache the fallback copy has to be found before the configuration is read
+            self._configuration_provider = config_provider.HttpJsonConfigurationProvider(
+                p_url=url, p_cache_directory=self.get_bootstrap_directory())
+
+        return self._configuration_provider
+
     def prepare_configuration(self, p_configuration):
+        """
+        Reads a configuration. Applications override this method to add their sections before calling it.
+        Only the first configuration becomes the live configuration of the application. Later ones are
+        candidates for reload_configuration() and may be prepared in any thread.
+        """
 
-        self._app_config = p_configuration[self._app_name]
+        live = self._config is None
 
-        for afile in self._arguments.configurations:
-            p_configuration.read_config_file(afile)
+        if live:
+            self._app_config = p_configuration[self._app_name]
 
-        p_configuration.read_environment_parameters(p_environment_dict=os.environ)
-        p_configuration.read_command_line_parameters(p_parameters=self._arguments.cmd_line_options)
+        self.read_configuration(p_configuration)
 
-        if self._app_config.log_level is not None:
+        if live and self._app_config.log_level is not None:
             log_handling.set_level(self._app_config.log_level)
 
-        if self._app_config.spool_dir is None:
-            self._app_config.spool_dir = os.path.join(DEFAULT_SPOOL_BASE_DIR, self._dir_name)
-
         return p_configuration
 
     def load_configuration(self):
@@ -281,23 +864,243 @@ class BaseApp(daemon.Daemon):
 
         self._config.write_to_file(p_filename=p_filename)
 
+    def validate_configuration(self, p_configuration, p_validator):
+        """
+        Reads the same sources as read_configuration() but collects all errors in the validator instead of
+        stopping at the first one. A configuration found in the cache has been read without errors before, so
+        only its constraints are checked again.
+        """
+
+        provider = self.get_configuration_provider()
+        provider_settings = None
+        settings_layers = []
+
+        if provider is not None:
+            provider_settings = provider.get_settings()
+            settings_layers.append((provider_settings, provider.source))
+
+        cache, cache_key = self.get_configuration_cache_entry(p_configuration=p_configuration,
+                                                              p_provider_settings=provider_settings)
+
+        if not self.restore_cached_configuration(p_configuration=p_configuration, p_cache=cache,
+                                                 p_cache_key=cache_key):
+            p_validator.validate_files(p_filenames=self._arguments.configurations,
+                                       p_settings_layers=settings_layers)
+
+            app_config = p_configuration[self._app_name]
+            p_validator.validate_overrides(
+                p_environment_dict=os.environ,
+                p_environment_prefix=app_config.environment_prefix if app_config else None,
+                p_cmd_line_options=self._arguments.cmd_line_options)
+
+            if cache is not None and len(p_validator.errors) == 0:
+                cache.save(p_key=cache_key, p_snapshot=p_configuration.get_snapshot())
+
+        app_config = p_configuration[self._app_name]
+
+        if app_config is not None and app_config.spool_dir is None:
+            app_config.spool_dir = os.path.join(DEFAULT_SPOOL_BASE_DIR, self._dir_name)
+
+        p_validator.validate_constraints()
+
+        return p_configuration
+
     def check_configuration(self):
+        """
+        Validates all configuration files, the environment and the command line settings and reports all errors
+        at once. The configuration is prepared by prepare_configuration() just like at startup so that sections
+        and checks added by applications apply.
+        """
 
         logger = log_handling.get_logger()
 
-        self.prepare_configuration(self.configuration_factory())
+        a_configuration = self.configuration_factory()
+        validator = config_validator.ConfigurationValidator(p_configuration=a_configuration)
+        self._configuration_validator = validator
+
+        try:
+            self.prepare_configuration(a_configuration)
+
+        except configuration.ConfigurationException as e:
+            # raised by checks of the application after the configuration has been read
+            validator.errors.append(configuration.ConfigurationError(p_message=str(e)))
+
+        finally:
+            self._configuration_validator = None
+
+        a_configuration.log_optional_section_report()
+
+        errors = validator.get_errors()
+
+        for error in errors:
+            logger.error(str(error))
+
+        if len(errors) > 0:
+            fmt = "Found {count} error(s) in {files} configuration file(s)"
+            raise configuration.ConfigurationException(
+                fmt.format(count=len(errors), files=len(self._arguments.configurations)))
 
         fmt = "%d configuration files are Ok!" % len(self._arguments.configurations)
         logger.info(fmt)
 
+        return a_configuration
+
     def reevaluate_configuration(self):
         pass
 
+    def reevaluate_configuration_section(self, p_section_name, p_section, p_changes):
+        """
+        Called by reload_configuration() for each section with changed options after the changes have been
+        applied to the section. Override to restart the services depending on the section.
+
+        :param p_section: the section or for removed sections the section which has been removed
+        :param p_changes: dictionary {option name: (old value, new value)}, new values are None for removed
+                          sections
+        """
+
+        for option_name, (old_value, new_value) in p_changes.items():
+            fmt = "Changed setting '[{section}]{option}' from '{old_value}' to '{new_value}'"
+            self._logger.info(fmt.format(section=p_section_name, option=option_name,
+                                         old_value=tools.protect_password_value(p_name=option_name,
+                                                                                p_value=old_value),
+                                         new_value=tools.protect_password_value(p_name=option_name,
+                                                                                p_value=new_value)))
+
+    def reload_configuration(self, p_new_configuration=None):
+        """
+        Applies the changes of a new configuration to the live configuration. Services are only notified about
+        the sections which have actually changed.
+
+        :param p_new_configuration: configuration already prepared (and validated) by another thread. By
+                                    default the configuration is read again.
+        :return: dictionary of the changes (see configuration.Configuration.get_changes())
+        """
+
+        if self._config is None:
+            self._logger.warning("No configuration loaded yet -> nothing to reload")
+            return {}
+
+        self._logger.info("Reloading configuration...")
+
+        new_configuration = p_new_configuration
+
+        if new_configuration is None:
+            try:
+                new_configuration = self.prepare_configuration(self.configuration_factory())
+
+            except Exception as e:
+                fmt = "Error '{msg}' while reloading configuration -> keeping current configuration"
+                self._logger.error(fmt.format(msg=str(e)))
+                return {}
+
+        changes = self._config.get_changes(p_other_configuration=new_configuration)
+
+        if len(changes) == 0:
+            self._logger.info("Configuration has not changed")
+            return changes
+
+        removed_sections = {section_name: self._config[section_name] for section_name in changes
+                            if not new_configuration.section_exists(section_name)}
+        self._config.apply_changes(p_other_configuration=new_configuration, p_changes=changes)
+
+        if self._app_name in changes and self._app_config.log_level is not None:
+            log_handling.set_level(self._app_config.log_level)
+
+        for section_name, section_changes in changes.items():
+            if section_name in removed_sections:
+                section = removed_sections[section_name]
+
+            else:
+                section = self._config[section_name]
+
+            self.reevaluate_configuration_section(p_section_name=section_name, p_section=section,
+                                                  p_changes=section_changes)
+
+        self.reevaluate_configuration()
+
+        fmt = "Reloaded configuration with changes in {count} section(s)"
+        self._logger.info(fmt.format(count=len(changes)))
+
+        return changes
+
+    def start_configuration_watcher(self):
+
+        if not self._app_config.watch_configuration_files or len(self._arguments.configurations) == 0:
+            return
+
+        self._configuration_watcher = config_watcher.ConfigurationWatcher(
+            p_filenames=self._arguments.configurations, p_callback=self.handle_changed_configuration_files,
+            p_poll_interval=self._app_config.configuration_poll_interval)
+        self._configuration_watcher.start()
+
+    def stop_configuration_watcher(self):
+
+        if self._configuration_watcher is not None:
+            self._configuration_watcher.stop()
+            self._configuration_watcher = None
+
+    def start_configuration_provider_refresh(self):
+
+        provider = self.get_configuration_provider()
+
+        if provider is None or self._app_config.configuration_provider_refresh_interval <= 0:
+            return
+
+        provider.start_refresh(p_interval=self._app_config.configuration_provider_refresh_interval,
+                               p_callback=self.handle_changed_provider_settings)
+
+    def stop_configuration_provider_refresh(self):
+
+        if self._configuration_provider is not None:
+            self._configuration_provider.stop_refresh()
+
+    def handle_changed_provider_settings(self, p_settings):
+
+        _ = p_settings
+        self.validate_and_reload_configuration()
+
+    def handle_changed_configuration_files(self, p_filenames):
+
+        _ = p_filenames
+        self.validate_and_reload_configuration()
+
+    def validate_and_reload_configuration(self):
+        """
+        Called by the configuration watcher and the refresh of the configuration provider in their own threads.
+        The new configuration is prepared and validated right here so that the event queue is not blocked. The
+        validated configuration itself is handed over to the event queue, so changes made to the files in the
+        meantime are not applied without validation.
+        """
+
+        try:
+            new_configuration = self.prepare_configuration(self.configuration_factory())
+            new_configuration.load_lazy_sections()
+
+        except Exception as e:
+            fmt = "Changed configuration is invalid: {msg} -> keeping current configuration"
+            self._logger.error(fmt.format(msg=str(e)))
+            return
+
+        self.post(self.reload_configuration, p_new_configuration=new_configuration)
+
+    def is_reload_signal(self, p_signum):
+
+        return (not tools.is_windows() and p_signum == signal.SIGHUP and
+                self._app_config.reload_configuration_on_sighup)
+
     def handle_signal(self, p_signum, p_stackframe):
 
         fmt = "Received signal %d" % p_signum
         _ = p_stackframe
         self._logger.info(fmt)
+
+        if self.is_reload_signal(p_signum=p_signum):
+            # The handler is executed by the thread of the event queue which may just be holding a lock
+            # -> only set a flag and wake up the event queue through its socket.
+            self._reload_requested = True
+            self.send_wakeup()
+            return
+
         self._done = True
 
         raise exceptions.SignalHangUp()
@@ -323,42 +1126,451 @@ class BaseApp(daemon.Daemon):
 
     def adapt_active_recurring_tasks(self, p_delay):
 
-        # for (_next_execution, task) in self._recurring_tasks:
-        #    task.adapt_to_delay(p_delay=p_delay)
-        for task in self._recurring_tasks:
-            task.adapt_to_delay(p_delay=p_delay)
+        self._scheduler.shift(p_delay=scheduler.seconds_to_ns(p_delay))
+
+    def start_task_executor(self):
+
+        if self._app_config.task_worker_count > 0 and self._task_executor is None:
+            fmt = "Executing recurring tasks in a thread pool with {count} workers"
+            self._logger.info(fmt.format(count=self._app_config.task_worker_count))
+
+            self._task_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._app_config.task_worker_count, thread_name_prefix=TASK_THREAD_NAME_PREFIX)
+
+    def stop_task_executor(self):
+
+        if self._task_executor is not None:
+            self._logger.info("Waiting for running recurring tasks to finish...")
+            self._task_executor.shutdown(wait=True)
+            self._task_executor = None
+
+    def get_task_concurrency_limit(self, p_task):
+
+        if p_task.concurrency_limit is not None:
+            return p_task.concurrency_limit
+
+        return self._app_config.task_concurrency_limit
+
+    def admit_task(self, p_task, p_delay):
+        """
+        Registers a new run of `p_task` unless the concurrency limit of the task has been reached.
+        Every admitted run must be finished by `track_task_execution`.
+
+        :return: True if the task may be executed, False if the run was skipped
+        """
+
+        with self._task_lock:
+            if p_task.active_runs >= self.get_task_concurrency_limit(p_task=p_task):
+                fmt = "Skipping task {task} {secs:.3f} [s] behind schedule since {runs} run(s) are still active"
+                self._logger.warning(fmt.format(task=p_task.name, secs=p_delay, runs=p_task.active_runs))
+                p_task.statistics.add_skipped_execution()
+                return False
+
+            p_task.active_runs += 1
+
+        return True
+
+    @contextlib.contextmanager
+    def track_task_execution(self, p_task, p_context, p_hand_over_exception):
+        """
+        Wraps the execution of an admitted run of `p_task`: logs start and end, records the statistics and
+        releases the run. Exceptions of tasks not ignoring them are either raised again (inline execution) or
+        handed over to the event queue which treats them as if the task had been executed inline.
+        """
+
+        fmt = "Executing task {task} {context}... *** START ***"
+        self._logger.debug(fmt.format(task=p_task.name, context=p_context))
+
+        start_time = time.perf_counter()
+        failed = False
+
+        try:
+            yield
+
+        except Exception as e:
+            failed = True
+            self._logger.error(f"Exception {str(e)}  while executing task {p_task.name}")
+            tools.log_stack_trace(p_logger=self._logger)
+
+            if not p_task.ignore_exceptions:
+                if not p_hand_over_exception:
+                    raise e
+
+                self._task_exceptions.append(e)
+
+        finally:
+            p_task.statistics.add_execution(p_runtime=time.perf_counter() - start_time, p_failed=failed)
+
+            with self._task_lock:
+                p_task.active_runs -= 1
 
-        heapq.heapify(self._recurring_tasks)
+        fmt = "Executing task {task} {context}... *** END ***"
+        self._logger.debug(fmt.format(task=p_task.name, context=p_context))
+
+    def dispatch_task(self, p_task, p_delay):
+
+        if not self.admit_task(p_task=p_task, p_delay=p_delay):
+            return
+
+        if self._task_executor is None:
+            context = "{secs:.3f} [s] behind schedule".format(secs=p_delay)
+
+            with self.track_task_execution(p_task=p_task, p_context=context, p_hand_over_exception=False):
+                p_task.handler_method()
+
+            return
+
+        fmt = "Submitting task {task} {secs:.3f} [s] behind schedule to thread pool"
+        self._logger.debug(fmt.format(task=p_task.name, secs=p_delay))
+
+        self._task_executor.submit(self.execute_task_in_worker, p_task)
+
+    def execute_task_in_worker(self, p_task):
+
+        with self.track_task_execution(p_task=p_task, p_context="in worker thread", p_hand_over_exception=True):
+            p_task.handler_method()
+
+    def raise_pending_task_exception(self):
+
+        if len(self._task_exceptions) > 0:
+            raise self._task_exceptions.popleft()
 
     def stop_event_queue(self):
         self._done = True
+        self.send_wakeup()
+
+        if self._event_loop is not None:
+            self._event_loop.call_soon_threadsafe(self._event_loop_stopped.set)
+
+    def wakeup_event_queue(self):
+        """
+        Makes the event queue re-evaluate its task heap and posted callbacks immediately.
+        May be called from any thread.
+        """
+
+        event_loop = self._event_loop
+
+        if event_loop is not None:
+            # No shortcut for the thread of the event loop: coroutine tasks run in that thread, too, and the timer
+            # has to be re-armed for the new deadline.
+            try:
+                event_loop.call_soon_threadsafe(self.handle_asyncio_wakeup)
+
+            except RuntimeError:
+                # event loop has already been closed
+                pass
+
+        elif threading.get_ident() != self._event_queue_thread_id:
+            # (The synchronous event queue will look at the heap anyway before going to sleep again)
+            self.send_wakeup()
+
+    def create_wakeup_sockets(self):
+        """
+        Creates the socket pair used to wake up the event queue. Contrary to locks and events the socket may also
+        be used by signal handlers. Forked worker processes need their own pair (see run_worker()) since the
+        wakeups of one worker would otherwise be consumed by its siblings.
+        """
+
+        if self._wakeup_receiver is not None:
+            self._wakeup_receiver.close()
+            self._wakeup_sender.close()
+
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self._wakeup_receiver.setblocking(False)
+        self._wakeup_sender.setblocking(False)
+
+    def send_wakeup(self):
+
+        try:
+            self._wakeup_sender.send(b"\0")
+
+        except (BlockingIOError, InterruptedError):
+            # the event queue has not consumed the previous wakeups yet -> it will wake up anyway
+            pass
+
+    def clear_wakeups(self):
+
+        try:
+            while len(self._wakeup_receiver.recv(WAKEUP_BUFFER_SIZE)) > 0:
+                pass
+
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def wait_for_wakeup(self, p_timeout):
+
+        select.select([self._wakeup_receiver], [], [], p_timeout)
+
+    def post(self, p_callback, *args, **kwargs):
+        """
+        Executes a callback in the thread of the event queue as soon as possible. May be called from any thread.
+        """
+
+        self._posted_callbacks.append((p_callback, args, kwargs))
+        self.wakeup_event_queue()
+
+    def execute_posted_callbacks(self):
+
+        while len(self._posted_callbacks) > 0:
+            callback, args, kwargs = self._posted_callbacks.popleft()
+
+            try:
+                callback(*args, **kwargs)
+
+            except Exception as e:
+                fmt = "Exception {msg} while executing posted callback {callback}"
+                self._logger.error(fmt.format(msg=str(e), callback=getattr(callback, "__name__", str(callback))))
+                tools.log_stack_trace(p_logger=self._logger)
+
+    def check_oversleeping(self, p_deadline):
+
+        overslept_in_seconds = scheduler.ns_to_seconds(scheduler.monotonic_ns() - p_deadline)
+
+        if overslept_in_seconds > self._app_config.maximum_timer_slack:
+            self.track_downtime(p_downtime=overslept_in_seconds)
+
+    def check_clock_drift(self):
+
+        # The monotonic clock stands still while the host is suspended. So, the deadlines of the tasks
+        # are not affected, but the application may want to know about the downtime nevertheless.
+        drift_in_seconds = self._clock_drift_detector.get_drift()
+
+        if drift_in_seconds > self._app_config.maximum_timer_slack:
+            self.track_downtime(p_downtime=drift_in_seconds, p_adapt_tasks=False)
+
+    def execute_requested_reload(self):
+
+        if self._reload_requested:
+            self._reload_requested = False
+            self.reload_configuration()
+
+    def execute_due_tasks(self, p_dispatch_method):
+
+        self.execute_requested_reload()
+        self.execute_posted_callbacks()
+        self.check_clock_drift()
+
+        while True:
+            now = scheduler.monotonic_ns()
+            task = self._scheduler.pop_due_task(p_now=now)
+
+            if task is None:
+                break
+
+            delay = scheduler.ns_to_seconds(now - task.deadline)
+            task.statistics.add_lateness(p_lateness=delay)
+            task.last_run = time.time()
+            self.schedule_task(p_task=task, p_now=now)
+            p_dispatch_method(p_task=task, p_delay=delay)
+
+            if delay > self._app_config.minimum_downtime_duration:
+                self.track_downtime(p_downtime=delay)
+
+            self.save_scheduler_state(p_force=False)
+
+        if self._downtime > 0:
+            self.handle_downtime(p_downtime=int(self._downtime))
+            self.reset_down_time()
+
+    def dispatch_asyncio_task(self, p_task, p_delay):
+
+        if not self.admit_task(p_task=p_task, p_delay=p_delay):
+            return
+
+        fmt = "Starting task {task} {secs:.3f} [s] behind schedule in asyncio event loop"
+        self._logger.debug(fmt.format(task=p_task.name, secs=p_delay))
+
+        if asyncio.iscoroutinefunction(p_task.handler_method):
+            run = self._event_loop.create_task(self.execute_coroutine_task(p_task=p_task))
+
+        else:
+            # Synchronous handlers must not block the event loop -> use the default executor
+            run = self._event_loop.run_in_executor(None, self.execute_task_in_worker, p_task)
+
+        self._event_loop_runs.add(run)
+        run.add_done_callback(self._event_loop_runs.discard)
+
+    async def execute_coroutine_task(self, p_task):
+
+        with self.track_task_execution(p_task=p_task, p_context="as coroutine", p_hand_over_exception=True):
+            await p_task.handler_method()
+
+    def schedule_asyncio_tick(self):
+
+        if self._event_loop_timer is not None:
+            self._event_loop_timer.cancel()
+
+        deadline = self._scheduler.get_next_deadline()
+
+        if deadline is not None:
+            wait_in_seconds = max(0.0, scheduler.ns_to_seconds(deadline - scheduler.monotonic_ns()))
+
+        else:
+            wait_in_seconds = ETERNITY
+
+        fmt = "Waiting for {seconds} seconds (or until next signal)"
+        self._logger.debug(fmt.format(seconds=wait_in_seconds))
+
+        self._event_loop_timer = self._event_loop.call_at(
+            self._event_loop.time() + wait_in_seconds, self.asyncio_tick, deadline)
+
+    def asyncio_tick(self, p_deadline):
+
+        self._event_loop_timer = None
+
+        try:
+            self.raise_pending_task_exception()
+
+            if p_deadline is not None:
+                self.check_oversleeping(p_deadline=p_deadline)
+
+            self.execute_due_tasks(p_dispatch_method=self.dispatch_asyncio_task)
+
+        except Exception as e:
+            if self._app_config.debug_mode:
+                fmt = "Propagating exception due to debug_mode=True"
+                self._logger.warning(fmt)
+                self._task_exceptions.appendleft(e)
+                self._done = True
+
+            else:
+                fmt = "Exception %s in event queue" % str(e)
+                self._logger.error(fmt)
+                tools.log_stack_trace(p_logger=self._logger)
+
+        if self._arguments.single_run:
+            self._done = True
+
+        if self._done:
+            self._event_loop_stopped.set()
+
+        else:
+            self.schedule_asyncio_tick()
+
+    def handle_asyncio_wakeup(self):
+
+        if self._event_loop_timer is not None:
+            self._event_loop_timer.cancel()
+            self._event_loop_timer = None
+
+        if not self._done:
+            self.asyncio_tick(p_deadline=None)
+
+    def handle_asyncio_signal(self, p_signum):
+
+        fmt = "Received signal %d" % p_signum
+        self._logger.info(fmt)
+
+        if self.is_reload_signal(p_signum=p_signum):
+            self._posted_callbacks.append((self.reload_configuration, (), {}))
+            self.handle_asyncio_wakeup()
+            return
+
+        fmt = "Event queue interrupted by signal"
+        self._logger.info(fmt)
+
+        self._done = True
+        self._event_loop_stopped.set()
+
+    async def run_asyncio_event_queue(self):
+
+        self._event_loop_stopped = asyncio.Event()
+        self._event_loop = asyncio.get_running_loop()
+        # {signal: previous handler} -- remove_signal_handler() would reset the signals to their default handling
+        installed_signals = {}
+
+        if self._app_config.task_worker_count > 0:
+            self._event_loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._app_config.task_worker_count, thread_name_prefix=TASK_THREAD_NAME_PREFIX))
+
+        if not tools.is_windows():
+            for signal_id in self._active_signals:
+                try:
+                    previous_handler = signal.getsignal(signal_id)
+                    self._event_loop.add_signal_handler(signal_id, self.handle_asyncio_signal, signal_id)
+                    installed_signals[signal_id] = previous_handler
+
+                except (RuntimeError, ValueError) as e:
+                    fmt = "Cannot install asyncio handler for signal {signal}: {msg}"
+                    self._logger.warning(fmt.format(signal=signal_id, msg=str(e)))
+
+        try:
+            self.schedule_asyncio_tick()
+            await self._event_loop_stopped.wait()
+
+        finally:
+            if self._event_loop_timer is not None:
+                self._event_loop_timer.cancel()
+                self._event_loop_timer = None
+
+            for signal_id, previous_handler in installed_signals.items():
+                self._event_loop.remove_signal_handler(signal_id)
+
+                if previous_handler is not None:
+                    signal.signal(signal_id, previous_handler)
+
+            if len(self._event_loop_runs) > 0:
+                self._logger.info("Waiting for running recurring tasks to finish...")
+                await asyncio.gather(*self._event_loop_runs, return_exceptions=True)
+
+            self._event_loop = None
+
+        if self._app_config.debug_mode or self._arguments.single_run:
+            self.raise_pending_task_exception()
+
+    def asyncio_event_queue(self):
+
+        self._done = False
+        self._event_queue_thread_id = threading.get_ident()
+        self._logger.info("Entering asyncio event queue...")
+
+        try:
+            asyncio.run(self.run_asyncio_event_queue())
+
+        finally:
+            self.save_scheduler_state()
+            self._event_queue_thread_id = None
+
+        self._logger.info("Leaving asyncio event queue...")
 
     def event_queue(self):
 
+        if self._app_config.asyncio_event_loop:
+            self.asyncio_event_queue()
+            return
+
         self._done = False
+        self._event_queue_thread_id = threading.get_ident()
         self._logger.info("Entering event queue...")
 
+        self.start_task_executor()
+
         while not self._done:
             try:
-                now = datetime.datetime.utcnow()
+                # Clear the wakeups before looking at the heap so that no wakeup can get lost
+                self.clear_wakeups()
+                self.raise_pending_task_exception()
+                deadline = self._scheduler.get_next_deadline()
 
-                if len(self._recurring_tasks) > 0:
-                    task = self._recurring_tasks[0]
-                    wait_in_seconds = (task - now).total_seconds()
+                if deadline is not None:
+                    wait_in_seconds = scheduler.ns_to_seconds(deadline - scheduler.monotonic_ns())
 
                 else:
-                    task = None
                     wait_in_seconds = ETERNITY
 
+                if len(self._posted_callbacks) > 0 or self._reload_requested:
+                    wait_in_seconds = 0
+
                 if wait_in_seconds > 0:
                     try:
-                        fmt = "Sleeping for {seconds} seconds (or until next signal)"
+                        fmt = "Sleeping for {seconds} seconds (or until next wakeup or signal)"
                         self._logger.debug(fmt.format(seconds=wait_in_seconds))
 
                         if not tools.is_windows():
                             signal.pthread_sigmask(signal.SIG_UNBLOCK, self._active_signals)
 
-                        time.sleep(wait_in_seconds)
+                        # Signal handlers may raise exceptions interrupting the wait just like time.sleep()
+                        self.wait_for_wakeup(p_timeout=wait_in_seconds)
 
                     except exceptions.SignalHangUp as e:
                         raise e
@@ -372,53 +1584,13 @@ class BaseApp(daemon.Daemon):
                         fmt = "Exception %s while waiting for signal" % str(e)
                         self._logger.error(fmt)
 
-                    fmt = "Woken by signal"
+                    fmt = "Woken up"
                     self._logger.debug(fmt)
 
-                    if task is not None:
-                        now = datetime.datetime.utcnow()
-                        overslept_in_seconds = (now - task).total_seconds()
-
-                        if overslept_in_seconds > self._app_config.maximum_timer_slack:
-                            self.track_downtime(p_downtime=overslept_in_seconds)
+                    if deadline is not None:
+                        self.check_oversleeping(p_deadline=deadline)
 
-                if len(self._recurring_tasks) > 0:
-                    task_executed = True
-
-                    while task_executed:
-                        task : RecurringTask = self._recurring_tasks[0]
-                        now = datetime.datetime.utcnow()
-
-                        if now > task:
-                            delay = (now - task).total_seconds()
-
-                            task = heapq.heappop(self._recurring_tasks)
-                            self.add_recurring_task(p_recurring_task=task)
-
-                            fmt = "Executing task {task} {secs:.3f} [s] behind schedule... *** START ***"
-                            self._logger.debug(fmt.format(task=task.name, secs=delay))
-
-                            try:
-                                task.handler_method()
-
-                            except Exception as e:
-                                self._logger.error(f"Exception {str(e)}  while executing task {task.name}")
-
-                                if not task.ignore_exceptions:
-                                    raise e
-
-                            fmt = "Executing task {task} {secs:.3f} [s] behind schedule... *** END ***"
-                            self._logger.debug(fmt.format(task=task.name, secs=delay))
-
-                            if delay > self._app_config.minimum_downtime_duration:
-                                self.track_downtime(p_downtime=delay)
-
-                        else:
-                            task_executed = False
-
-                    if self._downtime > 0:
-                        self.handle_downtime(p_downtime=int(self._downtime))
-                        self.reset_down_time()
+                self.execute_due_tasks(p_dispatch_method=self.dispatch_task)
 
             except exceptions.SignalHangUp:
                 fmt = "Event queue interrupted by signal"
@@ -439,15 +1611,24 @@ class BaseApp(daemon.Daemon):
             if self._arguments.single_run:
                 self._done = True
 
+        self.stop_task_executor()
+        self.save_scheduler_state()
+        self._event_queue_thread_id = None
         self._logger.info("Leaving event queue...")
 
-    def track_downtime(self, p_downtime):
+        if self._arguments.single_run:
+            # The workers have finished by now -> hand over their exceptions instead of dropping them
+            self.raise_pending_task_exception()
+
+    def track_downtime(self, p_downtime, p_adapt_tasks=True):
 
         fmt = "Detected delay of {seconds} seconds -> adding to downtime timer"
         self._logger.info(fmt.format(seconds=p_downtime))
 
         self._downtime += p_downtime
-        self.adapt_active_recurring_tasks(p_delay=p_downtime)
+
+        if p_adapt_tasks:
+            self.adapt_active_recurring_tasks(p_delay=p_downtime)
 
     def handle_downtime(self, p_downtime):
 
@@ -477,8 +1658,41 @@ class BaseApp(daemon.Daemon):
             self._logger.error(fmt.format(msg=str(e)))
             raise e
 
+    def run_supervisor(self):
+
+        a_supervisor = supervisor.Supervisor(p_worker_count=self._app_config.worker_processes,
+                                             p_worker_method=self.run_worker)
+        a_supervisor.run()
+
+    def run_worker(self, p_worker_index):
+
+        self._worker_index = p_worker_index
+        self.create_wakeup_sockets()
+        self._logger = log_handling.get_logger("{name}[{index}]".format(name=self.__class__.__name__,
+                                                                          index=p_worker_index))
+        main_pid_file = self.pidfile
+        self.pidfile = supervisor.get_worker_pid_file(p_pid_file=main_pid_file, p_worker_index=p_worker_index)
+
+        if self.pidfile is not None:
+            self.writepid()
+
+        try:
+            self.run()
+
+        finally:
+            if self.pidfile is not None:
+                self.delpid()
+
+            self.pidfile = main_pid_file
+
+        return 0
+
     def run(self):
 
+        if self._app_config.worker_processes > 0 and self._worker_index is None and not tools.is_windows():
+            self.run_supervisor()
+            return
+
         previous_exception = None
 
         if tools.running_in_docker():
@@ -495,6 +1709,12 @@ class BaseApp(daemon.Daemon):
             self.basic_init()
             self.install_handlers()
             self.start_services()
+
+            if self._config is not None:
+                self._config.log_optional_section_report()
+
+            self.start_configuration_watcher()
+            self.start_configuration_provider_refresh()
             self.event_queue()
 
         except Exception as e:
@@ -505,6 +1725,9 @@ class BaseApp(daemon.Daemon):
 
         finally:
             try:
+                self.stop_configuration_provider_refresh()
+                self.stop_configuration_watcher()
+                self.stop_task_executor()
                 self.stop_services()
 
             except Exception as e:
@@ -549,6 +1772,13 @@ def get_argument_parser(p_app_name):
     parser.add_argument('--check-configuration', dest='check_configuration', action='store_const', const=True,
                         default=False,
                         help='Validates the configurations files')
+    parser.add_argument('--config-cache', dest='config_cache', nargs='?', const='', default=None,
+                        metavar='DIRECTORY',
+                        help='Caches the parsed configuration in the given directory (default: spool directory '
+                             'of the application) to speed up subsequent starts')
+    parser.add_argument('--config-provider-url', dest='config_provider_url', default=None, metavar='URL',
+                        help='Reads additional settings as JSON document from the given URL (overriding the '
+                             'configuration files)')
     parser.add_argument('--kill', dest='kill', action='store_const', const=True, default=False,
                         help='Terminates the running daemon process')
     parser.add_argument('--single-run', dest='single_run', action='store_const', const=True, default=False,
@@ -95,7 +95,7 @@ class BaseWebServerConfigModel(configuration.ConfigModel):
 class BaseWebServer(object):
 
     def __init__(self, p_name, p_config, p_package_name, p_user_handler=None,
-                 p_login_view=None, p_logged_out_endpoint=None):
+                 p_login_view=None, p_logged_out_endpoint=None, p_task_statistics_provider=None):
 
         self._process = None
         self._login_manager = None
@@ -147,8 +147,9 @@ class BaseWebServer(object):
         self._server_exception = None
 
         # Install the actuator handler for the health check
-        self.register_view_handler(actuator.ActuatorViewHandler(p_app=self._app,
-                                                                p_url_prefix=self._config.internal_base_url))
+        self.register_view_handler(actuator.ActuatorViewHandler(
+            p_app=self._app, p_url_prefix=self._config.internal_base_url,
+            p_task_statistics_provider=p_task_statistics_provider))
 
         logger = log_handling.get_logger("werkzeug")
         logger.setLevel(self._config.werkzeug_log_level)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import hashlib
+import json
+import os
+
+from python_base_app import configuration
+from python_base_app import log_handling
+from python_base_app import settings
+from python_base_app import tools
+
+CONFIGURATION_CACHE_FILENAME = "configuration.cache"
+
+# Increase whenever the layout of the cached data changes
+CONFIGURATION_CACHE_FORMAT = 4
+
+
+def get_file_signature(p_filename):
+
+    stat = os.stat(p_filename)
+    return os.path.abspath(p_filename), stat.st_mtime_ns, stat.st_size
+
+
+def get_section_signature(p_section):
+    """
+    :return: the schema of a section (option names, types and defaults) so that a changed config model
+             invalidates the cache even if its class has not been renamed. Must be called before the settings
+             have been read into the section. Lazy sections are identified by their name only since their
+             values are not cached (see Configuration.get_snapshot()).
+    """
+
+    if isinstance(p_section, configuration.LazySection):
+        return p_section.section_name, "lazy"
+
+    section_class = p_section.__class__
+    options = []
+
+    for option_name in sorted(p_section.get_option_names()):
+        try:
+            spec = p_section.get_option_spec(p_option_name=option_name)
+            option_type = (spec.type_name, spec.is_list) if spec is not None else None
+
+        except configuration.ConfigurationException:
+            # e.g. empty list without type
+            option_type = None
+
+        options.append((option_name, option_type, getattr(p_section, option_name, None)))
+
+    return p_section.section_name, section_class.__module__, section_class.__qualname__, options
+
+
+class ConfigurationCache(object):
+    """
+    Stores a snapshot of a completely read configuration (see Configuration.get_snapshot()) as a JSON file.
+    The snapshot is only used again if the configuration files (path, modification time and size), the
+    relevant environment variables, the command line settings, the schemas of the sections and the versions of
+    the library and of the application are still the same. The values are stored as strings and converted
+    back by the converters of the options, so the file never contains objects which would have to be
+    unpickled.
+    """
+
+    def __init__(self, p_directory):
+
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+        self._filename = os.path.join(p_directory, CONFIGURATION_CACHE_FILENAME)
+
+    @property
+    def filename(self):
+        return self._filename
+
+    @staticmethod
+    def get_key(p_filenames, p_environment, p_cmd_line_options, p_configuration, p_provider_settings=None,
+                p_application_version=None):
+
+        digest = hashlib.sha256()
+
+        for item in [CONFIGURATION_CACHE_FORMAT, settings.settings["version"], p_application_version]:
+            digest.update(repr(item).encode())
+
+        for filename in p_filenames:
+            digest.update(repr(get_file_signature(p_filename=filename)).encode())
+
+        for name, value in sorted(p_environment.items()):
+            if configuration.REGEX_ENV_PARAMETER.match(name):
+                digest.update(repr((name, value)).encode())
+
+        for option in p_cmd_line_options:
+            digest.update(repr(option).encode())
+
+        if p_provider_settings is not None:
+            digest.update(json.dumps(p_provider_settings, sort_keys=True).encode())
+
+        for section_name in p_configuration.section_names():
+            digest.update(repr(get_section_signature(p_section=p_configuration[section_name])).encode())
+
+        return digest.hexdigest()
+
+    def load(self, p_key):
+        """
+        :return: the cached snapshot or None if there is no valid snapshot for the key
+        """
+
+        if not os.path.exists(self._filename):
+            return None
+
+        try:
+            with open(self._filename, "r") as cache_file:
+                content = json.load(cache_file)
+
+            key = content["key"]
+            snapshot = content["snapshot"]
+
+        except Exception as e:
+            fmt = "Cannot read configuration cache '{filename}': {msg}"
+            self._logger.warning(fmt.format(filename=self._filename, msg=str(e)))
+            return None
+
+        if key != p_key:
+            return None
+
+        return snapshot
+
+    def save(self, p_key, p_snapshot):
+
+        try:
+            with tools.atomic_write(self._filename) as cache_file:
+                json.dump({"key": p_key, "snapshot": p_snapshot}, cache_file)
+
+        except Exception as e:
+            fmt = "Cannot write configuration cache '{filename}': {msg}"
+            self._logger.warning(fmt.format(filename=self._filename, msg=str(e)))
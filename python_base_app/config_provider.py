@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import abc
+import hashlib
+import json
+import os
+import threading
+
+import requests
+
+from python_base_app import configuration
+from python_base_app import log_handling
+from python_base_app import tools
+
+DEFAULT_REQUEST_TIMEOUT = 5  # seconds
+
+HTTP_STATUS_NOT_MODIFIED = 304
+
+PROVIDER_CACHE_FILENAME_FORMAT = "configuration_provider.{key}.json"
+
+
+def get_raw_value(p_value):
+
+    return configuration.format_value(p_value).replace("%", "%%")
+
+
+def get_raw_settings(p_document):
+    """
+    Converts a JSON document {section name: {option name: value}} into the raw string settings expected by
+    Configuration.read_settings(). Lists are converted into indexed options (e.g. "hosts[0]", "hosts[1]").
+    The values are literals, so "%" is escaped for the interpolation of the configuration.
+    """
+
+    if not isinstance(p_document, dict):
+        raise configuration.ConfigurationException("Configuration document must be a JSON object")
+
+    settings = {}
+
+    for section_name, options in p_document.items():
+        if not isinstance(options, dict):
+            fmt = "Section '{section}' of configuration document must be a JSON object"
+            raise configuration.ConfigurationException(fmt.format(section=section_name))
+
+        section_settings = {}
+
+        for option_name, value in options.items():
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    section_settings["{option}[{index}]".format(option=option_name, index=index)] = \
+                        get_raw_value(p_value=item)
+
+            elif value is not None:
+                section_settings[option_name] = get_raw_value(p_value=value)
+
+        settings[section_name] = section_settings
+
+    return settings
+
+
+class ConfigurationProvider(object, metaclass=abc.ABCMeta):
+    """
+    Source of settings which are not read from configuration files (e.g. a central configuration store).
+    The settings are fed into the configuration by Configuration.read_settings() and are overridden by
+    environment variables and command line settings just like the settings of configuration files.
+    """
+
+    def __init__(self, p_name):
+
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+        self._name = p_name
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def source(self):
+        return configuration.OptionSource(p_layer=configuration.SOURCE_PROVIDER, p_location=self._name)
+
+    @abc.abstractmethod
+    def fetch(self):
+        """
+        :return: tuple (settings, changed) with settings as dictionary {section name: {option name: raw value}}
+                 and changed being True if the settings differ from the ones returned by the previous call
+        """
+
+        pass
+
+    def get_settings(self):
+        """
+        :return: the settings of the latest fetch() (e.g. by the refresh thread) without contacting the source
+                 again. Only the first call fetches the settings.
+        """
+
+        settings, _changed = self.fetch()
+        return settings
+
+    def start_refresh(self, p_interval, p_callback):
+        """
+        Fetches the settings every p_interval seconds in a background thread and calls p_callback (in that
+        thread) with the settings whenever they have changed.
+        """
+
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=self.run_refresh, args=(p_interval, p_callback),
+                                                name=self.__class__.__name__, daemon=True)
+        self._refresh_thread.start()
+
+    def stop_refresh(self):
+
+        self._stop_event.set()
+
+        if self._refresh_thread is not None:
+            self._refresh_thread.join()
+            self._refresh_thread = None
+
+    def run_refresh(self, p_interval, p_callback):
+
+        while not self._stop_event.wait(p_interval):
+            try:
+                settings, changed = self.fetch()
+
+                if changed:
+                    fmt = "Detected changed settings of configuration provider '{name}'"
+                    self._logger.info(fmt.format(name=self._name))
+                    p_callback(settings)
+
+            except Exception as e:
+                fmt = "Exception '{msg}' while refreshing configuration provider '{name}'"
+                self._logger.error(fmt.format(msg=str(e), name=self._name))
+                tools.log_stack_trace(p_logger=self._logger)
+
+
+class HttpJsonConfigurationProvider(ConfigurationProvider):
+    """
+    Fetches the settings as JSON document {section name: {option name: value}} from a URL. Conditional requests
+    (ETag) avoid transferring unchanged documents. The last document is stored in a local cache file which is
+    used if the server cannot be reached.
+    """
+
+    def __init__(self, p_url, p_cache_directory=None, p_request_timeout=DEFAULT_REQUEST_TIMEOUT):
+
+        super().__init__(p_name=tools.anonymize_url(p_url))
+
+        self._url = p_url
+        self._request_timeout = p_request_timeout
+        self._session = requests.Session()
+        self._etag = None
+        self._settings = None
+        self._cache_filename = None
+        self._lock = threading.Lock()
+
+        if p_cache_directory is not None:
+            key = hashlib.sha256(p_url.encode()).hexdigest()[:16]
+            self._cache_filename = os.path.join(p_cache_directory, PROVIDER_CACHE_FILENAME_FORMAT.format(key=key))
+
+    @property
+    def cache_filename(self):
+        return self._cache_filename
+
+    def fetch(self):
+
+        # The provider is used by the event queue, the configuration watcher and the refresh thread
+        with self._lock:
+            return self.fetch_document()
+
+    def get_settings(self):
+
+        with self._lock:
+            if self._settings is not None:
+                return self._settings
+
+            settings, _changed = self.fetch_document()
+            return settings
+
+    def fetch_document(self):
+
+        headers = {}
+
+        if self._etag is not None and self._settings is not None:
+            headers["If-None-Match"] = self._etag
+
+        try:
+            response = self._session.get(self._url, headers=headers, timeout=self._request_timeout)
+
+            if response.status_code == HTTP_STATUS_NOT_MODIFIED:
+                return self._settings, False
+
+            response.raise_for_status()
+            settings = get_raw_settings(p_document=response.json())
+
+        except (requests.RequestException, ValueError) as e:
+            return self.fetch_from_cache(p_exception=e)
+
+        changed = settings != self._settings
+        self._settings = settings
+        self._etag = response.headers.get("ETag")
+
+        if changed:
+            self.save_cache()
+
+        return settings, changed
+
+    def fetch_from_cache(self, p_exception):
+
+        if self._settings is not None:
+            fmt = "Cannot fetch configuration from '{name}': {msg} -> keeping current settings"
+            self._logger.warning(fmt.format(name=self._name, msg=str(p_exception)))
+            return self._settings, False
+
+        if self._cache_filename is None or not os.path.exists(self._cache_filename):
+            fmt = "Cannot fetch configuration from '{name}': {msg}"
+            raise configuration.ConfigurationException(fmt.format(name=self._name, msg=str(p_exception)))
+
+        fmt = "Cannot fetch configuration from '{name}': {msg} -> using cached settings from '{filename}'"
+        self._logger.warning(fmt.format(name=self._name, msg=str(p_exception), filename=self._cache_filename))
+
+        try:
+            with open(self._cache_filename, encoding="UTF-8") as cache_file:
+                cache = json.load(cache_file)
+
+        except Exception as e:
+            fmt = "Cannot read cached configuration '{filename}': {msg}"
+            raise configuration.ConfigurationException(fmt.format(filename=self._cache_filename, msg=str(e)))
+
+        # The ETag of the cache is not used: the next successful request has to return the complete document
+        self._settings = cache["settings"]
+        return self._settings, True
+
+    def save_cache(self):
+
+        if self._cache_filename is None:
+            return
+
+        try:
+            with tools.atomic_write(self._cache_filename) as cache_file:
+                json.dump({"etag": self._etag, "settings": self._settings}, cache_file)
+
+        except Exception as e:
+            fmt = "Cannot write configuration provider cache '{filename}': {msg}"
+            self._logger.warning(fmt.format(filename=self._cache_filename, msg=str(e)))
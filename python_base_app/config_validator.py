@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import concurrent.futures
+import configparser
+import re
+
+from python_base_app import configuration
+from python_base_app import log_handling
+
+DEFAULT_MAX_WORKERS = 4
+
+REGEX_SECTION_LINE = re.compile(r"\s*\[([^]]+)\]")
+REGEX_OPTION_LINE = re.compile(r"([^=:\s\[#;][^=:]*?)\s*[=:]")
+
+
+class ParsedFile(object):
+
+    def __init__(self, p_filename):
+
+        self.filename = p_filename
+        self.parser = None
+        self.errors = []
+        self.section_lines = {}
+        self.option_lines = {}
+
+
+class ConfigurationValidator(object):
+    """
+    Validates a set of configuration files in one pass and collects all errors instead of stopping at the
+    first one. The files are parsed in parallel and then merged into the configuration in their given order
+    so that the usual override semantics apply. Each error carries the file and line of the offending setting
+    where available.
+    """
+
+    def __init__(self, p_configuration, p_max_workers=DEFAULT_MAX_WORKERS):
+
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+        self._configuration = p_configuration
+        self._max_workers = p_max_workers
+        self._errors = []
+        self._section_locations = {}
+        self._option_locations = {}
+
+    @property
+    def configuration(self):
+        return self._configuration
+
+    @property
+    def errors(self):
+        return self._errors
+
+    def parse_file(self, p_filename):
+        """
+        Parses a single file. Called in a worker thread so it must not touch the configuration.
+        """
+
+        parsed_file = ParsedFile(p_filename=p_filename)
+        source = configuration.OptionSource(p_layer=configuration.SOURCE_FILE, p_location=p_filename)
+
+        try:
+            with open(p_filename, encoding="UTF-8") as config_file:
+                lines = config_file.read().splitlines()
+
+        except Exception as e:
+            fmt = "Exception '{msg}' while reading configuration file"
+            parsed_file.errors.append(configuration.ConfigurationError(p_message=fmt.format(msg=str(e)),
+                                                                       p_source=source))
+            return parsed_file
+
+        parser = self._configuration.create_layer_parser()
+
+        try:
+            parser.read_string("\n".join(lines), source=p_filename)
+
+        except configparser.MissingSectionHeaderError as e:
+            parsed_file.errors.append(configuration.ConfigurationError(
+                p_message="File contains no section headers", p_source=source, p_line=e.lineno))
+            return parsed_file
+
+        except configparser.ParsingError as e:
+            # the parser keeps all valid lines so the remaining settings can still be checked
+            for line_number, line in e.errors:
+                fmt = "Syntax error in line '{line}'"
+                parsed_file.errors.append(configuration.ConfigurationError(
+                    p_message=fmt.format(line=line.strip()), p_source=source, p_line=line_number))
+
+        except configparser.Error as e:
+            parsed_file.errors.append(configuration.ConfigurationError(
+                p_message=e.message, p_source=source, p_line=getattr(e, "lineno", None)))
+            return parsed_file
+
+        parsed_file.parser = parser
+        section_name = None
+
+        for line_number, line in enumerate(lines, start=1):
+            match = REGEX_SECTION_LINE.match(line)
+
+            if match is not None:
+                section_name = match.group(1)
+                parsed_file.section_lines.setdefault(section_name, line_number)
+                continue
+
+            match = REGEX_OPTION_LINE.match(line)
+
+            if match is not None and section_name is not None:
+                option_name = parser.optionxform(match.group(1))
+                parsed_file.option_lines[(section_name, option_name)] = line_number
+
+        return parsed_file
+
+    def validate_files(self, p_filenames, p_settings_layers=None):
+        """
+        :param p_settings_layers: optional list of tuples (settings, source) of settings which have not been read
+                                  from a file (see Configuration.read_settings()) overriding the files
+        """
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            parsed_files = list(executor.map(self.parse_file, p_filenames))
+
+        for parsed_file in parsed_files:
+            self.merge_file(p_parsed_file=parsed_file)
+
+        for settings, source in p_settings_layers or []:
+            parser = self._configuration.create_layer_parser()
+
+            try:
+                parser.read_dict(settings)
+
+            except Exception as e:
+                self._errors.append(configuration.ConfigurationError(p_message=str(e), p_source=source))
+                continue
+
+            self._configuration.merge_layer(p_parser=parser, p_source=source)
+
+        self._configuration.set_error_collector(self._errors)
+
+        try:
+            # All files are merged first so that each section is scanned exactly once
+            for section_name in self._configuration.config.sections():
+                if self._configuration.section_exists(section_name):
+                    self._configuration.scan_section(p_section_name=section_name)
+                    continue
+
+                try:
+                    self._configuration.handle_section(p_section_name=section_name)
+
+                except configuration.ConfigurationException as e:
+                    self.add_error(p_message=str(e), p_section_name=section_name)
+
+            # Lazy optional sections have to be loaded to be validated
+            for section_name in self._configuration.section_names():
+                section = self._configuration[section_name]
+
+                if isinstance(section, configuration.LazySection):
+                    try:
+                        section.load()
+
+                    except configuration.ConfigurationException as e:
+                        self.add_error(p_message=str(e), p_section_name=section_name)
+
+        finally:
+            self._configuration.set_error_collector(None)
+
+    def merge_file(self, p_parsed_file):
+
+        self._errors.extend(p_parsed_file.errors)
+
+        if p_parsed_file.parser is None:
+            return
+
+        source = configuration.OptionSource(p_layer=configuration.SOURCE_FILE, p_location=p_parsed_file.filename)
+        self._configuration.merge_layer(p_parser=p_parsed_file.parser, p_source=source)
+
+        for section_name, line_number in p_parsed_file.section_lines.items():
+            self._section_locations.setdefault(section_name, (source, line_number))
+
+        for key, line_number in p_parsed_file.option_lines.items():
+            # later files override earlier ones
+            self._option_locations[key] = (source, line_number)
+
+    def validate_overrides(self, p_environment_dict=None, p_environment_prefix=None, p_cmd_line_options=None):
+
+        self._configuration.set_error_collector(self._errors)
+
+        try:
+            if p_environment_dict is not None:
+                self._configuration.read_environment_parameters(p_environment_dict=p_environment_dict,
+                                                                p_prefix=p_environment_prefix)
+
+            if p_cmd_line_options is not None:
+                self._configuration.read_command_line_parameters(p_parameters=p_cmd_line_options)
+
+        finally:
+            self._configuration.set_error_collector(None)
+
+    def validate_constraints(self):
+
+        self._configuration.set_error_collector(self._errors)
+
+        try:
+            self._configuration.check_constraints()
+
+        finally:
+            self._configuration.set_error_collector(None)
+
+    def add_error(self, p_message, p_section_name):
+
+        source, line_number = self._section_locations.get(p_section_name, (None, None))
+        self._errors.append(configuration.ConfigurationError(p_message=p_message, p_source=source,
+                                                             p_section_name=p_section_name, p_line=line_number))
+
+    def get_errors(self):
+        """
+        :return: the errors found so far with the file and line of the settings filled in
+        """
+
+        for error in self._errors:
+            if error.line is not None or error.section_name is None:
+                continue
+
+            if error.option_name is not None:
+                if error.source is None or error.source.layer == configuration.SOURCE_FILE:
+                    source, line_number = self._option_locations.get(
+                        (error.section_name, error.option_name), (error.source, None))
+                    error.source = source
+                    error.line = line_number
+
+            elif error.source is None:
+                error.source, error.line = self._section_locations.get(error.section_name, (None, None))
+
+        return self._errors
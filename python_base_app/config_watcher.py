@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+
+from python_base_app import log_handling
+from python_base_app import tools
+
+DEFAULT_DEBOUNCE_DELAY = 0.5  # seconds
+DEFAULT_POLL_INTERVAL = 5  # seconds
+
+# see /usr/include/linux/inotify.h
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Configuration files are usually replaced by renaming a new file (editors, deployment tools) so the
+# directories are watched and not the files themselves.
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ATTRIB
+
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+INOTIFY_BUFFER_SIZE = 64 * 1024
+
+
+def get_libc():
+
+    library_name = ctypes.util.find_library("c")
+
+    if library_name is None:
+        return None
+
+    try:
+        libc = ctypes.CDLL(library_name, use_errno=True)
+
+    except OSError:
+        return None
+
+    if not hasattr(libc, "inotify_init1"):
+        return None
+
+    return libc
+
+
+def get_file_signature(p_filename):
+
+    try:
+        stat = os.stat(p_filename)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    except OSError:
+        return None
+
+
+class ConfigurationWatcher(object):
+    """
+    Watches a set of (configuration) files in a background thread and calls a callback once the files have
+    stopped changing for the debounce delay. Uses inotify on Linux and falls back to comparing the modification
+    time and size of the files periodically.
+    """
+
+    def __init__(self, p_filenames, p_callback, p_debounce_delay=DEFAULT_DEBOUNCE_DELAY,
+                 p_poll_interval=DEFAULT_POLL_INTERVAL, p_use_inotify=True):
+        """
+        :param p_callback: function called (in the thread of the watcher) with the list of changed files
+        """
+
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+        self._filenames = [os.path.abspath(filename) for filename in p_filenames]
+        self._callback = p_callback
+        self._debounce_delay = p_debounce_delay
+        self._poll_interval = p_poll_interval
+        self._use_inotify = p_use_inotify and not tools.is_windows()
+        self._signatures = {filename: get_file_signature(filename) for filename in self._filenames}
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._stop_pipe = None
+        self._inotify_fd = None
+
+    @property
+    def uses_inotify(self):
+        return self._inotify_fd is not None
+
+    def start(self):
+
+        if self._use_inotify:
+            self._inotify_fd = self.create_inotify_watches()
+
+        if self._inotify_fd is not None:
+            self._stop_pipe = os.pipe()
+            target = self.run_inotify
+
+        else:
+            target = self.run_polling
+
+        fmt = "Watching {count} configuration file(s) using {method}"
+        self._logger.info(fmt.format(count=len(self._filenames), method="inotify" if self.uses_inotify else "polling"))
+
+        self._thread = threading.Thread(target=target, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+
+        self._stop_event.set()
+
+        if self._stop_pipe is not None:
+            os.write(self._stop_pipe[1], b"x")
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+        if self._stop_pipe is not None:
+            for fd in self._stop_pipe:
+                os.close(fd)
+
+            self._stop_pipe = None
+
+    def create_inotify_watches(self):
+
+        libc = get_libc()
+
+        if libc is None:
+            return None
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if fd < 0:
+            fmt = "Cannot initialize inotify (errno {errno}) -> falling back to polling"
+            self._logger.warning(fmt.format(errno=ctypes.get_errno()))
+            return None
+
+        for directory in {os.path.dirname(filename) for filename in self._filenames}:
+            if libc.inotify_add_watch(fd, directory.encode(), WATCH_MASK) < 0:
+                fmt = "Cannot watch directory '{directory}' (errno {errno}) -> falling back to polling"
+                self._logger.warning(fmt.format(directory=directory, errno=ctypes.get_errno()))
+                os.close(fd)
+                return None
+
+        return fd
+
+    def read_inotify_events(self):
+        """
+        :return: True if one of the watched files is affected by the pending events
+        """
+
+        try:
+            buffer = os.read(self._inotify_fd, INOTIFY_BUFFER_SIZE)
+
+        except BlockingIOError:
+            return False
+
+        basenames = {os.path.basename(filename) for filename in self._filenames}
+        offset = 0
+        relevant = False
+
+        while offset + INOTIFY_EVENT_HEADER.size <= len(buffer):
+            _wd, _mask, _cookie, length = INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = buffer[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+
+            if name in basenames:
+                relevant = True
+
+        return relevant
+
+    def get_changed_files(self):
+
+        changed_files = []
+
+        for filename in self._filenames:
+            signature = get_file_signature(filename)
+
+            if signature != self._signatures[filename]:
+                self._signatures[filename] = signature
+                changed_files.append(filename)
+
+        return changed_files
+
+    def notify(self):
+
+        changed_files = self.get_changed_files()
+
+        if len(changed_files) == 0:
+            return
+
+        fmt = "Detected changes of configuration file(s) {files}"
+        self._logger.info(fmt.format(files=", ".join(changed_files)))
+
+        try:
+            self._callback(changed_files)
+
+        except Exception as e:
+            fmt = "Exception '{msg}' while handling changed configuration files"
+            self._logger.error(fmt.format(msg=str(e)))
+            tools.log_stack_trace(p_logger=self._logger)
+
+    def run_inotify(self):
+
+        debounce_deadline = None
+
+        while not self._stop_event.is_set():
+            timeout = None
+
+            if debounce_deadline is not None:
+                timeout = max(0.0, debounce_deadline - time.monotonic())
+
+            readable, _, _ = select.select([self._inotify_fd, self._stop_pipe[0]], [], [], timeout)
+
+            if self._stop_pipe[0] in readable:
+                break
+
+            if self._inotify_fd in readable:
+                if self.read_inotify_events():
+                    # Restart the debounce delay with each event
+                    debounce_deadline = time.monotonic() + self._debounce_delay
+
+            elif debounce_deadline is not None:
+                debounce_deadline = None
+                self.notify()
+
+    def run_polling(self):
+
+        observed_signatures = dict(self._signatures)
+        pending_changes = False
+
+        while True:
+            # Once a change has been seen check again after the debounce delay whether the files are still changing
+            if self._stop_event.wait(self._debounce_delay if pending_changes else self._poll_interval):
+                break
+
+            signatures = {filename: get_file_signature(filename) for filename in self._filenames}
+
+            if signatures != observed_signatures:
+                observed_signatures = signatures
+                pending_changes = True
+
+            elif pending_changes:
+                pending_changes = False
+                self.notify()
@@ -20,19 +20,51 @@
 
 import abc
 import configparser
+import datetime
 import importlib
+import itertools
 import re
+import threading
+import time
+import types
 
 from python_base_app import log_handling
 from python_base_app import tools
 
 REGEX_CMDLINE_PARAMETER = re.compile(r"([-a-zA-Z_0-9]+)\.([a-zA-Z_0-9]+)=(.*)")
 REGEX_ENV_PARAMETER = re.compile("([a-zA-Z_0-9]+)__([a-zA-Z_0-9]+)")
+ENVIRONMENT_SEPARATOR = "__"
 
 NONE_BOOLEAN = type(True)
 NONE_INTEGER = type(1)
 NONE_STRING = type("X")
 
+
+class Duration(int):
+    """
+    Duration in seconds. Configured as "1h 30m 10s" (see tools.get_string_as_duration()) or as plain number of
+    seconds.
+    """
+
+    pass
+
+
+class CommaSeparatedList(list):
+    """
+    List of strings configured as a single comma separated value (contrary to array options which are
+    configured by one setting per element).
+    """
+
+    def __str__(self):
+        return ",".join(self)
+
+
+NONE_FLOAT = float
+NONE_DURATION = Duration
+NONE_TIME = datetime.time
+NONE_COMMA_SEPARATED_LIST = CommaSeparatedList
+NONE_DICT = dict  # configured as "key1=value1,key2=value2"
+
 OPTION_ARRAY_PATTERN = re.compile(r"([^[]*)\[([0-9]+)\]")
 
 VALID_BOOLEAN_TRUE_VALUES = ['1', 'TRUE', 'T', 'YES', 'WAHR', 'JA', 'J']
@@ -43,12 +75,85 @@ IGNORED_DICT_KEYS = [
     '_options'
 ]
 
+LIST_TYPE_PREFIX = "list_"
+
+INVALID_VALUE_MESSAGES = {
+    "bool": "Invalid Boolean value '{value}' in setting '{option}' of section '{section}'",
+    "int": "Invalid numerical value '{value}' in setting '{option}' of section '{section}': {msg}",
+    "float": "Invalid numerical value '{value}' in setting '{option}' of section '{section}': {msg}",
+    "Duration": "Invalid duration '{value}' in setting '{option}' of section '{section}': {msg}",
+    "time": "Invalid time of day '{value}' in setting '{option}' of section '{section}': {msg}",
+    "dict": "Invalid key value list '{value}' in setting '{option}' of section '{section}': {msg}",
+}
+
+DEFAULT_INVALID_VALUE_MESSAGE = "Invalid value '{value}' in setting '{option}' of section '{section}': {msg}"
+
+# Layers a setting may come from (see Configuration.get_option_source())
+SOURCE_DEFAULT = "default"
+SOURCE_FILE = "file"
+SOURCE_STRING = "string"
+SOURCE_ENVIRONMENT = "environment"
+SOURCE_COMMAND_LINE = "command line"
+SOURCE_PROVIDER = "provider"
+SOURCE_API = "api"
+
+# Compiled schemas (option name -> OptionSpec) by config model class
+_compiled_schemas = {}
+
+
 class ConfigurationException(Exception):
 
     def __init__(self, p_text):
         super(ConfigurationException, self).__init__(p_text)
 
 
+class ConfigurationError(object):
+    """
+    Error found while reading a configuration with an error collector (see Configuration.set_error_collector()).
+    """
+
+    def __init__(self, p_message, p_source=None, p_section_name=None, p_option_name=None, p_line=None):
+
+        self.message = p_message
+        self.source = p_source
+        self.section_name = p_section_name
+        self.option_name = p_option_name
+        self.line = p_line
+
+    @property
+    def filename(self):
+
+        if self.source is None or self.source.layer != SOURCE_FILE:
+            return None
+
+        return self.source.location
+
+    def __str__(self):
+
+        location = ""
+
+        if self.filename is not None:
+            location = self.filename
+
+            if self.line is not None:
+                location += ":{line}".format(line=self.line)
+
+            location += ": "
+
+        elif self.source is not None:
+            location = "{source}: ".format(source=self.source)
+
+        if self.section_name is not None:
+            location += "[{section}]".format(section=self.section_name)
+
+            if self.option_name is not None:
+                location += self.option_name
+
+            location += ": "
+
+        return location + self.message
+
+
 class ConfigurationSectionHandler(object, metaclass=abc.ABCMeta):
 
     def __init__(self, p_section_prefix):
@@ -76,6 +181,187 @@ NONE_TYPE_PREFIX = "_TYPE_"
 NONE_ARRAY_TYPE_PREFIX = "_ARRAY_TYPE_"
 
 
+def convert_boolean(p_value):
+
+    upper_value = p_value.upper()
+
+    if upper_value in VALID_BOOLEAN_TRUE_VALUES:
+        return True
+
+    if upper_value in VALID_BOOLEAN_FALSE_VALUES:
+        return False
+
+    raise ValueError("invalid Boolean value")
+
+
+def convert_string(p_value):
+    return p_value
+
+
+def convert_duration(p_value):
+
+    if p_value.strip().isdigit():
+        return Duration(p_value.strip())
+
+    seconds = tools.get_string_as_duration(p_string=p_value)
+    return None if seconds is None else Duration(seconds)
+
+
+def convert_time(p_value):
+    return tools.get_string_as_time(p_string=p_value)
+
+
+def convert_comma_separated_list(p_value):
+    return CommaSeparatedList(item.strip() for item in p_value.split(",") if item.strip() != "")
+
+
+def convert_dict(p_value):
+
+    result = {}
+
+    for item in p_value.split(","):
+        if item.strip() == "":
+            continue
+
+        if "=" not in item:
+            raise ValueError(f"'{item.strip()}' is not formatted as key=value")
+
+        key, value = item.split("=", 1)
+        result[key.strip()] = value.strip()
+
+    return result
+
+
+CONVERTERS = {
+    "float": float,
+    "Duration": convert_duration,
+    "time": convert_time,
+    "CommaSeparatedList": convert_comma_separated_list,
+    "dict": convert_dict,
+}
+
+
+def format_value(p_value):
+    """
+    Formats an option value so that it can be read again by the converter of the option.
+    """
+
+    if isinstance(p_value, dict):
+        return ",".join(f"{key}={value}" for key, value in p_value.items())
+
+    if isinstance(p_value, datetime.time):
+        return p_value.strftime("%H:%M:%S")
+
+    return str(p_value)
+
+
+def freeze_value(p_value):
+    """
+    :return: immutable copy of a configuration value (lists become tuples, dictionaries read-only mappings)
+    """
+
+    if isinstance(p_value, list):
+        return tuple(freeze_value(value) for value in p_value)
+
+    if isinstance(p_value, dict):
+        return types.MappingProxyType({key: freeze_value(value) for key, value in p_value.items()})
+
+    return p_value
+
+
+class OptionSource(object):
+    """
+    Describes the layer (see SOURCE_*) which has set the current value of an option and where applicable its
+    location (e.g. the name of the configuration file or of the environment variable).
+    """
+
+    __slots__ = ("layer", "location")
+
+    def __init__(self, p_layer, p_location=None):
+
+        self.layer = p_layer
+        self.location = p_location
+
+    def __eq__(self, p_other):
+
+        return isinstance(p_other, OptionSource) and \
+               (self.layer, self.location) == (p_other.layer, p_other.location)
+
+    def __hash__(self):
+
+        return hash((self.layer, self.location))
+
+    def __str__(self):
+
+        if self.location is None:
+            return self.layer
+
+        return "{layer} '{location}'".format(layer=self.layer, location=self.location)
+
+
+DEFAULT_OPTION_SOURCE = OptionSource(p_layer=SOURCE_DEFAULT)
+API_OPTION_SOURCE = OptionSource(p_layer=SOURCE_API)
+
+
+def get_serialized_sources(p_sources):
+    """
+    :param p_sources: dictionary {(section name, option name): OptionSource}
+    :return: list of [section name, option name, layer, location] which can be stored as JSON
+    """
+
+    return [[section_name, option_name, source.layer, source.location]
+            for (section_name, option_name), source in p_sources.items()]
+
+
+def get_deserialized_sources(p_sources):
+    """
+    :return: dictionary {(section name, option name): OptionSource} (see get_serialized_sources())
+    """
+
+    return {(section_name, option_name): OptionSource(p_layer=layer, p_location=location)
+            for section_name, option_name, layer, location in p_sources}
+
+
+class OptionSpec(object):
+    """
+    Compiled description of a single option of a config model: the key under which the option is stored in
+    the model, the base type name, whether it is a list and the function converting a string into a value.
+    """
+
+    __slots__ = ("name", "key", "type_name", "is_list", "converter")
+
+    def __init__(self, p_name, p_key, p_option_type):
+
+        self.name = p_name
+        self.key = p_key
+        self.is_list = p_option_type.startswith(LIST_TYPE_PREFIX)
+        self.type_name = p_option_type[len(LIST_TYPE_PREFIX):] if self.is_list else p_option_type
+
+        if self.type_name in CONVERTERS:
+            self.converter = CONVERTERS[self.type_name]
+
+        elif 'bool' in self.type_name:
+            self.type_name = "bool"
+            self.converter = convert_boolean
+
+        elif 'int' in self.type_name:
+            self.type_name = "int"
+            self.converter = int
+
+        else:
+            self.converter = convert_string
+
+    def convert(self, p_section_name, p_value):
+
+        try:
+            return self.converter(p_value)
+
+        except (ValueError, TypeError, ConfigurationException) as e:
+            fmt = INVALID_VALUE_MESSAGES.get(self.type_name, DEFAULT_INVALID_VALUE_MESSAGE)
+            raise ConfigurationException(fmt.format(value=p_value, option=self.name, section=p_section_name,
+                                                    msg=str(e)))
+
+
 class SimpleConfigurationSectionHandler(ConfigurationSectionHandler):
 
     def __init__(self, p_config_model):
@@ -116,7 +402,7 @@ class ConfigModel(object):
             else:
                 value = self.__dict__[p_option_name]
 
-                if isinstance(value, list):
+                if isinstance(value, list) and not isinstance(value, CommaSeparatedList):
                     if len(value) == 0:
                         fmt = "Option '{option}' defines empty array without type"
                         raise ConfigurationException(fmt.format(option=p_option_name))
@@ -126,6 +412,157 @@ class ConfigModel(object):
                 else:
                     return type(value).__name__
 
+    def get_option_key(self, p_option_name):
+
+        for key in (NONE_ARRAY_TYPE_PREFIX + p_option_name, NONE_TYPE_PREFIX + p_option_name, p_option_name):
+            if key in self.__dict__:
+                return key
+
+        return None
+
+    def compile_option_spec(self, p_option_name):
+
+        return OptionSpec(p_name=p_option_name, p_key=self.get_option_key(p_option_name=p_option_name),
+                          p_option_type=self.get_option_type(p_option_name=p_option_name))
+
+    def get_option_names(self):
+
+        option_names = []
+
+        for key in self.__dict__:
+            if key in IGNORED_DICT_KEYS:
+                continue
+
+            if key.startswith(NONE_ARRAY_TYPE_PREFIX):
+                option_name = key[len(NONE_ARRAY_TYPE_PREFIX):]
+
+            elif key.startswith(NONE_TYPE_PREFIX):
+                option_name = key[len(NONE_TYPE_PREFIX):]
+
+            else:
+                option_name = key
+
+            if option_name not in option_names:
+                option_names.append(option_name)
+
+        return option_names
+
+    def get_option_values(self):
+
+        return {option_name: getattr(self, option_name, None) for option_name in self.get_option_names()}
+
+    def get_serialized_values(self):
+        """
+        :return: dictionary {option name: value formatted as string or list of strings for array options} which
+                 can be stored as JSON and is converted back by set_serialized_values()
+        """
+
+        values = {}
+
+        for option_name, value in self.get_option_values().items():
+            try:
+                spec = self.get_option_spec(p_option_name=option_name)
+
+            except ConfigurationException:
+                # empty array without type: cannot be set by a setting either
+                continue
+
+            if value is None:
+                values[option_name] = None
+
+            elif spec.is_list:
+                values[option_name] = [format_value(element) for element in value]
+
+            else:
+                values[option_name] = format_value(value)
+
+        return values
+
+    def set_serialized_values(self, p_values):
+        """
+        Sets the options from values returned by get_serialized_values() using the converters of the options.
+        """
+
+        for option_name, value in p_values.items():
+            spec = self.get_option_spec(p_option_name=option_name)
+
+            if spec is None:
+                continue
+
+            if value is not None:
+                if spec.is_list:
+                    value = [spec.convert(p_section_name=self.section_name, p_value=element) for element in value]
+
+                else:
+                    value = spec.convert(p_section_name=self.section_name, p_value=value)
+
+            setattr(self, option_name, value)
+
+    def get_changes(self, p_other_section):
+        """
+        :return: dictionary {option name: (current value, other value)} of all options having different values
+                 in the other section
+        """
+
+        changes = {}
+
+        for option_name in set(self.get_option_names()) | set(p_other_section.get_option_names()):
+            value = getattr(self, option_name, None)
+            other_value = getattr(p_other_section, option_name, None)
+
+            if value != other_value:
+                changes[option_name] = (value, other_value)
+
+        return changes
+
+    def compile_schema(self):
+
+        schema = {}
+
+        for option_name in self.get_option_names():
+
+            try:
+                schema[option_name] = self.compile_option_spec(p_option_name=option_name)
+
+            except ConfigurationException:
+                # e.g. empty list without type: reported when the option is actually set
+                pass
+
+        return schema
+
+    def get_schema(self):
+        """
+        Returns the schema of the class of the config model. Since the options are defined in the constructor,
+        the schema is compiled from the first instance of each class.
+        """
+
+        schema = _compiled_schemas.get(self.__class__)
+
+        if schema is None:
+            schema = self.compile_schema()
+            _compiled_schemas[self.__class__] = schema
+
+        return schema
+
+    def get_option_spec(self, p_option_name):
+        """
+        :return: the OptionSpec of an option or None if the section does not have the option
+        """
+
+        schema = self.get_schema()
+        spec = schema.get(p_option_name)
+
+        if spec is not None and spec.key in self.__dict__:
+            return spec
+
+        if not self.has_option(p_option_name=p_option_name):
+            return None
+
+        # Option defined differently by this instance (e.g. added after the schema was compiled)
+        spec = self.compile_option_spec(p_option_name=p_option_name)
+        schema[p_option_name] = spec
+        return spec
+
     def has_option(self, p_option_name):
 
         p_effective_name = NONE_TYPE_PREFIX + p_option_name
@@ -177,6 +614,15 @@ class ConfigModel(object):
 
         pass
 
+    def check_constraints(self):
+        """
+        Override to check constraints between the options of the section.
+
+        :return: list of error messages
+        """
+
+        return []
+
 class OptionalSectionHandlerDefinition:
 
     def __init__(self):
@@ -186,6 +632,59 @@ class OptionalSectionHandlerDefinition:
         self.module_name = None
         self.config_model_class_name = None
 
+        # If True, the module is only imported when the section is accessed for the first time
+        self.lazy = False
+
+
+class OptionalSectionTiming:
+
+    def __init__(self, p_section_name):
+
+        self.section_name = p_section_name
+        self.import_time = None
+        self.instantiation_time = None
+
+    def __str__(self):
+
+        if self.import_time is None:
+            return f"[{self.section_name}]: not loaded (lazy)"
+
+        return f"[{self.section_name}]: import {1000 * self.import_time:.1f} ms, " \
+               f"instantiation {1000 * self.instantiation_time:.1f} ms"
+
+
+class LazySection(object):
+    """
+    Placeholder for an optional section whose module has not been imported yet. The first access to any
+    attribute (other than `section_name` and `is_loaded`) imports the module, instantiates the config model,
+    scans the settings and replaces the placeholder in the configuration. Note that `isinstance()` checks
+    on the placeholder do not see the class of the config model.
+    """
+
+    def __init__(self, p_configuration, p_section_name):
+
+        self.__dict__["section_name"] = p_section_name
+        self.__dict__["_configuration"] = p_configuration
+        self.__dict__["_section"] = None
+
+    @property
+    def is_loaded(self):
+        return self._section is not None
+
+    def load(self):
+
+        if self._section is None:
+            self.__dict__["_section"] = self._configuration.instantiate_optional_section(
+                p_section_name=self.section_name)
+
+        return self._section
+
+    def __getattr__(self, p_name):
+        return getattr(self.load(), p_name)
+
+    def __setattr__(self, p_name, p_value):
+        setattr(self.load(), p_name, p_value)
+
 class Configuration(object):
 
     def __init__(self):
@@ -194,15 +693,30 @@ class Configuration(object):
         self._logger = log_handling.get_logger(self.__class__.__name__)
         self._section_handlers = []
         self._optional_section_handler_definitions : dict[str, OptionalSectionHandlerDefinition] = {}
+        self._optional_section_timings : dict[str, OptionalSectionTiming] = {}
         self.config = configparser.ConfigParser(strict=False)
 
+        # (section name, option name) -> OptionSource of the raw settings and of the current values
+        self._setting_sources = {}
+        self._option_sources = {}
+
+        # Frozen view shared by all readers until the configuration is changed (see get_frozen_view())
+        self._lock = threading.RLock()
+        self._generation = 0
+        self._frozen_view = None
+        self._frozen_view_generation = None
+
+        self._error_collector = None
+
     def add_section(self, p_section):
 
         if p_section.section_name in self._sections:
             fmt = "Overwriting existing section '%s'" % p_section.section_name
             self._logger.warning(fmt)
 
-        self._sections[p_section.section_name] = p_section
+        with self._lock:
+            self._sections[p_section.section_name] = p_section
+            self._generation += 1
 
     def register_section_handler(self, p_section_handler):
 
@@ -219,6 +733,233 @@ class Configuration(object):
         self._optional_section_handler_definitions[p_optional_section_handler_definition.section_name] = \
             p_optional_section_handler_definition
 
+    def section_names(self):
+        return list(self._sections)
+
+    def get_changes(self, p_other_configuration):
+        """
+        Compares the configuration with another configuration (e.g. freshly read from the same files).
+
+        :return: dictionary {section name: {option name: (current value, other value)}} of all sections having
+                 changed options. Sections which only exist in one of the configurations contain all their
+                 options (with None as missing value). Removed lazy sections which have never been loaded are
+                 reported without options.
+        """
+
+        changes = {}
+
+        for section_name, section in self._sections.items():
+            if p_other_configuration.section_exists(section_name):
+                continue
+
+            if isinstance(section, LazySection) and not section.is_loaded:
+                changes[section_name] = {}
+                continue
+
+            changes[section_name] = {option_name: (getattr(section, option_name, None), None)
+                                     for option_name in section.get_option_names()}
+
+        for section_name in p_other_configuration.section_names():
+            other_section = p_other_configuration[section_name]
+            section = self._sections.get(section_name)
+
+            if section is None:
+                section_changes = {option_name: (None, getattr(other_section, option_name, None))
+                                   for option_name in other_section.get_option_names()}
+
+            else:
+                section_changes = section.get_changes(p_other_section=other_section)
+
+            if len(section_changes) > 0:
+                changes[section_name] = section_changes
+
+        return changes
+
+    def apply_changes(self, p_other_configuration, p_changes):
+        """
+        Applies the changes determined by get_changes() to the sections of this configuration in place so that
+        references to the sections held by services remain valid.
+        """
+
+        with self._lock:
+            for section_name, section_changes in p_changes.items():
+                section = self._sections.get(section_name)
+
+                if not p_other_configuration.section_exists(section_name):
+                    # removed section
+                    self._sections.pop(section_name, None)
+
+                    if self.config.has_section(section_name):
+                        self.config.remove_section(section_name)
+
+                    continue
+
+                if section is None:
+                    self.add_section(p_section=p_other_configuration[section_name])
+                    continue
+
+                for option_name, (_old_value, new_value) in section_changes.items():
+                    setattr(section, option_name, new_value)
+
+            self.merge_option_sources(p_other_configuration=p_other_configuration, p_changes=p_changes)
+            self._generation += 1
+
+    def merge_option_sources(self, p_other_configuration, p_changes):
+        """
+        Changed options take over the source of the other configuration. Unchanged options keep their source
+        (e.g. set by the application through the API) unless they did not have one yet.
+        """
+
+        other_sources = p_other_configuration.get_option_sources()
+
+        for section_name, section_changes in p_changes.items():
+            if not p_other_configuration.section_exists(section_name):
+                for key in [key for key in self._option_sources if key[0] == section_name]:
+                    del self._option_sources[key]
+
+                continue
+
+            for option_name in section_changes:
+                key = (section_name, option_name)
+
+                if key in other_sources:
+                    self._option_sources[key] = other_sources[key]
+
+                else:
+                    self._option_sources.pop(key, None)
+
+        for key, source in other_sources.items():
+            self._option_sources.setdefault(key, source)
+
+    def get_snapshot(self):
+        """
+        :return: representation of the configuration which can be stored as JSON consisting of the raw settings
+                 as read from the files and the values of all sections (including overrides) formatted as strings
+        """
+
+        return {
+            "raw": {section_name: dict(self.config.items(section_name, raw=True))
+                    for section_name in self.config.sections()},
+            # Lazy sections are not loaded just for the snapshot: they are restored from the raw settings
+            "values": {section_name: section.get_serialized_values()
+                       for section_name, section in self._sections.items()
+                       if not isinstance(section, LazySection)},
+            "setting_sources": get_serialized_sources(p_sources=self._setting_sources),
+            "option_sources": get_serialized_sources(p_sources=self._option_sources)
+        }
+
+    def restore_snapshot(self, p_snapshot):
+        """
+        Restores a configuration from a snapshot (see get_snapshot()) without parsing and converting the settings
+        again (only the converters of the options are applied to the formatted values). Sections created by
+        section handlers are created the same way as when reading a file.
+        """
+
+        self.config.optionxform = str  # make options case sensitive
+        self.config.read_dict(p_snapshot["raw"])
+        self._setting_sources.update(get_deserialized_sources(p_sources=p_snapshot["setting_sources"]))
+
+        for section_name in p_snapshot["raw"]:
+            if section_name not in self._sections:
+                self.handle_section(p_section_name=section_name, p_ignore_invalid_sections=True)
+
+            if section_name in self._sections:
+                setattr(self, section_name, self._sections[section_name])
+
+        for section_name, values in p_snapshot["values"].items():
+            section = self._sections.get(section_name)
+
+            if section is None:
+                continue
+
+            section.set_serialized_values(p_values=values)
+
+        with self._lock:
+            self._option_sources.update(get_deserialized_sources(p_sources=p_snapshot["option_sources"]))
+            self._generation += 1
+
+    def set_error_collector(self, p_errors):
+        """
+        :param p_errors: list receiving a ConfigurationError for each invalid setting instead of raising an exception
+                         for the first one, None to raise exceptions again
+        """
+
+        self._error_collector = p_errors
+
+    def report_error(self, p_exception, p_source=None, p_section_name=None, p_option_name=None):
+
+        if self._error_collector is None:
+            raise p_exception
+
+        self._error_collector.append(ConfigurationError(p_message=str(p_exception), p_source=p_source,
+                                                        p_section_name=p_section_name, p_option_name=p_option_name))
+
+    def check_constraints(self):
+        """
+        Checks the constraints between options declared by the loaded sections (see ConfigModel.check_constraints()).
+        """
+
+        for section_name, section in list(self._sections.items()):
+            if isinstance(section, LazySection):
+                continue
+
+            for message in section.check_constraints():
+                self.report_error(p_exception=ConfigurationException(message), p_section_name=section_name)
+
+    def get_option_source(self, p_section_name, p_option_name):
+        """
+        :return: the OptionSource of the current value of an option or None if the option does not exist
+        """
+
+        source = self._option_sources.get((p_section_name, p_option_name))
+
+        if source is not None:
+            return source
+
+        section = self._sections.get(p_section_name)
+
+        if section is None:
+            return None
+
+        if not isinstance(section, LazySection) and not section.has_option(p_option_name=p_option_name):
+            return None
+
+        return DEFAULT_OPTION_SOURCE
+
+    def has_recorded_sources(self, p_section_name):
+        """
+        :return: True if any setting or option of the section has been set by a source other than the defaults
+        """
+
+        return any(section_name == p_section_name
+                   for section_name, _option_name in itertools.chain(self._setting_sources, self._option_sources))
+
+    def get_option_sources(self):
+        """
+        :return: dictionary {(section name, option name): OptionSource} of all options not having their default value
+        """
+
+        return dict(self._option_sources)
+
+    def get_frozen_view(self):
+        """
+        Returns a read-only view {section name: {option name: value}} of the loaded sections. The view is built
+        once per change of the configuration and shared by all callers so that request handlers can take it
+        cheaply and will never see a partially applied reload. Note that direct assignments to the attributes of
+        the sections bypass the configuration and are not detected.
+        """
+
+        with self._lock:
+            if self._frozen_view_generation != self._generation:
+                self._frozen_view = types.MappingProxyType({
+                    section_name: types.MappingProxyType(
+                        {option_name: freeze_value(value) for option_name, value in section.get_option_values().items()})
+                    for section_name, section in self._sections.items() if not isinstance(section, LazySection)
+                })
+                self._frozen_view_generation = self._generation
+
+            return self._frozen_view
+
     def section_exists(self, p_key:str):
         return p_key in self._sections
 
@@ -229,7 +970,11 @@ class Configuration(object):
 
         return self._sections[p_key]
 
-    def set_config_value(self, p_section_name, p_option, p_option_value):
+    def set_config_value(self, p_section_name, p_option, p_option_value, p_source=None):
+        """
+        :param p_source: OptionSource recorded for the option, by default the value is considered to be set by the
+                         application
+        """
 
         section = self._sections.get(p_section_name)
         append_to_list = False
@@ -244,54 +989,54 @@ class Configuration(object):
                 append_to_list = True
             p_option = match.group(1)
 
-        if not section.has_option(p_option_name=p_option):
+        spec = section.get_option_spec(p_option_name=p_option)
+
+        if spec is None:
             raise ConfigurationException(
                 "Configuration file contains invalid setting '%s' in section '%s'" % (p_option, p_section_name))
 
-        option_type = section.get_option_type(p_option_name=p_option)
-        upper_value = p_option_value.upper()
+        value = spec.convert(p_section_name=p_section_name, p_value=p_option_value)
 
-        if 'bool' in option_type:
-            if upper_value in VALID_BOOLEAN_TRUE_VALUES:
-                value = True
+        with self._lock:
+            if spec.is_list:
+                if append_to_list:
+                    getattr(section, p_option).append(value)
 
-            elif upper_value in VALID_BOOLEAN_FALSE_VALUES:
-                value = False
+                else:
+                    setattr(section, p_option, [value])
 
             else:
-                raise ConfigurationException("Invalid Boolean value '%s' in setting '%s' of section '%s'" % (
-                    p_option_value, p_option, p_section_name))
+                setattr(section, p_option, value)
 
-        elif 'int' in option_type:
-            try:
-                value = int(p_option_value)
+            self._option_sources[(p_section_name, p_option)] = p_source or API_OPTION_SOURCE
+            self._generation += 1
 
-            except Exception as e:
-                raise ConfigurationException("Invalid numerical value '%s' in setting '%s' of section '%s': %s" % (
-                    p_option_value, p_option, p_section_name, str(e)))
+    def load_optional_section_handler(self, p_section_name: str):
 
-        else:
-            value = p_option_value
+        if p_section_name not in self._optional_section_handler_definitions:
 
-        if 'list' in option_type:
-            if append_to_list:
-                getattr(section, p_option).append(value)
+            msg = f"No optional section handler definition found for section name '{p_section_name}'"
+            raise ConfigurationException(msg)
 
-            else:
-                setattr(section, p_option, [value])
+        definition =  self._optional_section_handler_definitions[p_section_name]
 
-        else:
-            setattr(section, p_option, value)
+        if definition.lazy:
+            msg = f"Deferring import of package '{definition.package_name}' for optional section '{p_section_name}'."
+            self._logger.info(msg)
 
-    def load_optional_section_handler(self, p_section_name: str):
+            section = LazySection(p_configuration=self, p_section_name=p_section_name)
+            self._sections[p_section_name] = section
+            self._optional_section_timings[p_section_name] = OptionalSectionTiming(p_section_name=p_section_name)
+            return section
 
-        if p_section_name not in self._optional_section_handler_definitions:
+        return self.instantiate_optional_section(p_section_name=p_section_name)
 
-            msg = f"No optional section handler definition found for section name '{p_section_name}'"
-            raise ConfigurationException(msg)
+    def instantiate_optional_section(self, p_section_name: str):
 
         definition =  self._optional_section_handler_definitions[p_section_name]
         module_name = definition.package_name + "." + definition.module_name
+        timing = OptionalSectionTiming(p_section_name=p_section_name)
+        start_time = time.perf_counter()
 
         try:
             module = importlib.import_module(module_name)
@@ -301,9 +1046,13 @@ class Configuration(object):
                   f"optional config section '{p_section_name}'!"
             raise ConfigurationException(msg)
 
+        timing.import_time = time.perf_counter() - start_time
+
         msg = f"Imported package '{definition.package_name}' for handling optional section '{p_section_name}'."
         self._logger.info(msg)
 
+        start_time = time.perf_counter()
+
         try:
             my_class = getattr(module, definition.config_model_class_name)
             section = my_class()
@@ -313,15 +1062,46 @@ class Configuration(object):
                   f"for optional config section '{p_section_name}'"
             raise ConfigurationException(msg)
 
+        timing.instantiation_time = time.perf_counter() - start_time
+        self._optional_section_timings[p_section_name] = timing
+
         msg = f"Instantiated config model class '{definition.config_model_class_name}' " +\
               f"for optional config section '{p_section_name}'..."
         self._logger.info(msg)
 
-        self._sections[p_section_name] = section
+        with self._lock:
+            self._sections[p_section_name] = section
+            self._generation += 1
+
+        if hasattr(self, p_section_name):
+            # replace the lazy placeholder
+            setattr(self, p_section_name, section)
+
         self.scan_section(p_section_name)
 
         return section
 
+    def load_lazy_sections(self):
+        """
+        Loads all optional sections which have been deferred so far (e.g. to validate them).
+        """
+
+        for section in list(self._sections.values()):
+            if isinstance(section, LazySection):
+                section.load()
+
+    def get_optional_section_report(self):
+        """
+        :return: list of lines describing the import and instantiation times of the optional sections
+        """
+
+        return [str(timing) for timing in self._optional_section_timings.values()]
+
+    def log_optional_section_report(self):
+
+        for line in self.get_optional_section_report():
+            self._logger.info("Optional section " + line)
+
     def scan_section(self, p_section_name):
 
         section = self._sections.get(p_section_name)
@@ -332,12 +1112,24 @@ class Configuration(object):
         if section is None:
             raise ConfigurationException("Invalid section name '%s'" % p_section_name)
 
+        if isinstance(section, LazySection):
+            # The settings will be scanned when the section is loaded
+            return
+
         for option in self.config.options(p_section_name):
-            option_value = self.config.get(p_section_name, option)
-            self.set_config_value(
-                p_section_name=p_section_name,
-                p_option=option,
-                p_option_value=option_value)
+            source = self._setting_sources.get((p_section_name, option))
+
+            try:
+                option_value = self.config.get(p_section_name, option)
+                self.set_config_value(
+                    p_section_name=p_section_name,
+                    p_option=option,
+                    p_option_value=option_value,
+                    p_source=source)
+
+            except (ConfigurationException, configparser.Error) as e:
+                self.report_error(p_exception=ConfigurationException(str(e)), p_source=source,
+                                  p_section_name=p_section_name, p_option_name=option)
 
     def handle_section(self, p_section_name, p_ignore_invalid_sections=False, p_warn_about_invalid_sections=False):
 
@@ -373,12 +1165,17 @@ class Configuration(object):
             self.config.optionxform = str  # make options case sensitive
 
             try:
-                filesRead = self.config.read([p_filename], encoding="UTF-8")
+                # Each file is parsed separately so that the settings can be attributed to the file
+                parser = self.create_layer_parser()
+                filesRead = parser.read([p_filename], encoding="UTF-8")
 
                 if len(filesRead) != 1:
                     fmt = "Error while reading configuration file '{filename}' (file probably does not exist)"
                     errorMessage = fmt.format(filename=p_filename)
 
+                else:
+                    self.merge_layer(p_parser=parser, p_source=OptionSource(p_layer=SOURCE_FILE, p_location=p_filename))
+
             except Exception as e:
                 fmt = "Exception '{msg}' while reading configuration file '{filename}'"
                 errorMessage = fmt.format(msg=str(e), filename=p_filename)
@@ -386,7 +1183,9 @@ class Configuration(object):
         if p_config_string is not None:
 
             try:
-                self.config.read_string(p_config_string)
+                parser = self.create_layer_parser()
+                parser.read_string(p_config_string)
+                self.merge_layer(p_parser=parser, p_source=OptionSource(p_layer=SOURCE_STRING))
 
             except Exception as e:
                 fmt = "Exception '{msg}' while reading setting"
@@ -395,7 +1194,42 @@ class Configuration(object):
         if errorMessage is not None:
             raise ConfigurationException(errorMessage)
 
-        for section_name in self.config.sections():
+        self.scan_sections(p_ignore_invalid_sections=p_ignore_invalid_sections,
+                           p_warn_about_invalid_sections=p_warn_about_invalid_sections)
+
+    def read_settings(self, p_settings, p_source, p_ignore_invalid_sections=False,
+                      p_warn_about_invalid_sections=False):
+        """
+        Reads settings which have not been read from a file (e.g. from a configuration provider).
+
+        :param p_settings: dictionary {section name: {option name: raw value}}
+        :param p_source: OptionSource recorded for the settings
+        """
+
+        self.config.optionxform = str  # make options case sensitive
+        parser = self.create_layer_parser()
+
+        try:
+            parser.read_dict(p_settings)
+
+        except Exception as e:
+            fmt = "Exception '{msg}' while reading settings from {source}"
+            raise ConfigurationException(fmt.format(msg=str(e), source=p_source))
+
+        self.merge_layer(p_parser=parser, p_source=p_source)
+        self.scan_sections(p_section_names=parser.sections(), p_ignore_invalid_sections=p_ignore_invalid_sections,
+                           p_warn_about_invalid_sections=p_warn_about_invalid_sections)
+
+    def scan_sections(self, p_section_names=None, p_ignore_invalid_sections=False,
+                      p_warn_about_invalid_sections=False):
+        """
+        :param p_section_names: names of the sections to be scanned, by default all sections read so far
+        """
+
+        if p_section_names is None:
+            p_section_names = self.config.sections()
+
+        for section_name in p_section_names:
             if section_name in self._sections:
 
                 new_section = self._sections[section_name]
@@ -408,18 +1242,40 @@ class Configuration(object):
                                     p_ignore_invalid_sections=p_ignore_invalid_sections,
                                     p_warn_about_invalid_sections=p_warn_about_invalid_sections)
 
-    def write_to_file(self, p_filename):
+    def create_layer_parser(self):
+
+        # The values are interpolated by self.config once all layers have been merged
+        parser = configparser.ConfigParser(strict=False, interpolation=None)
+        parser.optionxform = self.config.optionxform
+        return parser
+
+    def merge_layer(self, p_parser, p_source):
+
+        self.config.read_dict(p_parser)
+
+        for section_name in p_parser.sections():
+            for option in p_parser.options(section_name):
+                self._setting_sources[(section_name, self.config.optionxform(option))] = p_source
+
+    def write_to_file(self, p_filename, p_include_defaults=True):
+        """
+        :param p_include_defaults: if False only the options which have been set by a file, the environment,
+                                   the command line or the application are written. Lazy sections are then only
+                                   loaded if they have settings.
+        """
+
         with open(p_filename, 'w') as configfile:
             first = True
 
             for section_name, config in self._sections.items():
-                if first:
-                    first = False
+                if isinstance(config, LazySection):
+                    if not p_include_defaults and not config.is_loaded and \
+                            not self.has_recorded_sources(p_section_name=section_name):
+                        continue
 
-                else:
-                    configfile.write("\n")
+                    config = config.load()
 
-                configfile.write("[{name}]\n".format(name=section_name))
+                lines = []
 
                 for key, value in config.__dict__.items():
                     if key in IGNORED_DICT_KEYS:
@@ -428,7 +1284,24 @@ class Configuration(object):
                     if key.startswith(NONE_TYPE_PREFIX) or key.startswith(NONE_ARRAY_TYPE_PREFIX):
                         continue
 
-                    configfile.write("{key}={value}\n".format(key=key, value=value))
+                    if not p_include_defaults and (section_name, key) not in self._option_sources:
+                        continue
+
+                    lines.append("{key}={value}\n".format(key=key, value=format_value(value)))
+
+                if not p_include_defaults and len(lines) == 0:
+                    continue
+
+                if first:
+                    first = False
+
+                else:
+                    configfile.write("\n")
+
+                configfile.write("[{name}]\n".format(name=section_name))
+
+                for line in lines:
+                    configfile.write(line)
 
     def read_command_line_parameters(self, p_parameters):
 
@@ -447,30 +1320,81 @@ class Configuration(object):
                     section_name, option_name, protected_value)
                 self._logger.info(fmt)
 
-                self.set_config_value(
-                    p_section_name=section_name,
-                    p_option=option_name,
-                    p_option_value=value)
+                source = OptionSource(p_layer=SOURCE_COMMAND_LINE)
+
+                try:
+                    self.set_config_value(
+                        p_section_name=section_name,
+                        p_option=option_name,
+                        p_option_value=value,
+                        p_source=source)
+
+                except ConfigurationException as e:
+                    self.report_error(p_exception=e, p_source=source,
+                                      p_section_name=section_name, p_option_name=option_name)
 
             else:
                 fmt = "Incorrectly formatted command line setting: %s" % par
                 self._logger.warning(fmt)
 
-    def read_environment_parameters(self, p_environment_dict):
+    def get_environment_index(self, p_prefix=None):
+        """
+        :return: dictionary {environment variable name: (section name, option name)} of all options of the
+                 registered sections
+        """
 
-        for (name, value) in dict(p_environment_dict).items():
-            result = REGEX_ENV_PARAMETER.match(name)
+        prefix = p_prefix or ""
+        index = {}
 
-            if result:
-                section_name = result.group(1)
-                option_name = result.group(2)
+        for section_name, section in self._sections.items():
+            if isinstance(section, LazySection):
+                continue
 
-                protected_value = tools.protect_password_value(p_name=option_name, p_value=value)
+            for option_name in section.get_option_names():
+                index[f"{prefix}{section_name}{ENVIRONMENT_SEPARATOR}{option_name}"] = (section_name, option_name)
+
+        return index
+
+    def read_environment_parameters(self, p_environment_dict, p_prefix=None):
+        """
+        Overrides settings by environment variables named [PREFIX]SECTION__OPTION. Only the names of the options of
+        the registered sections are looked up, all other variables are ignored.
+        """
 
-                fmt = "Environment setting: set '[{section_name}]{option_name}' to value '{value}'"
-                self._logger.info(fmt.format(section_name=section_name, option_name=option_name, value=protected_value))
+        settings = []
 
+        for name, (section_name, option_name) in self.get_environment_index(p_prefix=p_prefix).items():
+            value = p_environment_dict.get(name)
+
+            if value is not None:
+                settings.append((name, section_name, option_name, value))
+
+        lazy_section_prefixes = {f"{p_prefix or ''}{section_name}{ENVIRONMENT_SEPARATOR}": section_name
+                                 for section_name, section in self._sections.items()
+                                 if isinstance(section, LazySection)}
+
+        if len(lazy_section_prefixes) > 0:
+            # The options of lazy sections are unknown until the section has been loaded
+            for name, value in p_environment_dict.items():
+                for section_prefix, section_name in lazy_section_prefixes.items():
+                    if name.startswith(section_prefix):
+                        settings.append((name, section_name, name[len(section_prefix):], value))
+
+        for name, section_name, option_name, value in settings:
+            protected_value = tools.protect_password_value(p_name=option_name, p_value=value)
+
+            fmt = "Environment setting: set '[{section_name}]{option_name}' to value '{value}'"
+            self._logger.info(fmt.format(section_name=section_name, option_name=option_name, value=protected_value))
+
+            source = OptionSource(p_layer=SOURCE_ENVIRONMENT, p_location=name)
+
+            try:
                 self.set_config_value(
                     p_section_name=section_name,
                     p_option=option_name,
-                    p_option_value=value)
+                    p_option_value=value,
+                    p_source=source)
+
+            except ConfigurationException as e:
+                self.report_error(p_exception=e, p_source=source,
+                                  p_section_name=section_name, p_option_name=option_name)
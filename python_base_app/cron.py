@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import bisect
+import datetime
+import functools
+
+from python_base_app import configuration
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+DAY_OF_WEEK_NAMES = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+
+# (name, minimum, maximum, symbolic names starting at minimum)
+FIELD_DEFINITIONS = [
+    ("minute", 0, 59, None),
+    ("hour", 0, 23, None),
+    ("day of month", 1, 31, None),
+    ("month", 1, 12, MONTH_NAMES),
+    ("day of week", 0, 7, DAY_OF_WEEK_NAMES),
+]
+
+# No valid expression needs more than four years to find the next matching day (February 29th).
+MAXIMUM_SEARCH_DAYS = 4 * 366 + 1
+
+
+def _parse_value(p_value, p_minimum, p_names):
+
+    if p_names is not None and p_value.lower() in p_names:
+        return p_names.index(p_value.lower()) + p_minimum
+
+    return int(p_value)
+
+
+def _parse_field(p_field, p_name, p_minimum, p_maximum, p_names):
+
+    values = set()
+
+    for part in p_field.split(","):
+        step = 1
+
+        if "/" in part:
+            part, step_string = part.split("/", 1)
+            step = int(step_string)
+
+            if step < 1:
+                raise ValueError("step must be positive")
+
+        if part == "*":
+            first, last = p_minimum, p_maximum
+
+        elif "-" in part:
+            first_string, last_string = part.split("-", 1)
+            first = _parse_value(first_string, p_minimum, p_names)
+            last = _parse_value(last_string, p_minimum, p_names)
+
+        else:
+            first = _parse_value(part, p_minimum, p_names)
+            last = p_maximum if step > 1 else first
+
+        if first < p_minimum or last > p_maximum or first > last:
+            fmt = "value out of range {minimum}-{maximum} for {name}"
+            raise ValueError(fmt.format(minimum=p_minimum, maximum=p_maximum, name=p_name))
+
+        values.update(range(first, last + 1, step))
+
+    return values
+
+
+class CronExpression(object):
+    """
+    Standard five field cron expression (minute, hour, day of month, month, day of week) with support for
+    lists, ranges, steps, month and day names as well as the usual @-macros. The fields are parsed once into
+    sorted tuples so that the computation of the next fire time only requires a few bisections. The most
+    recent result is cached since tasks sharing an expression usually ask for the same minute.
+    """
+
+    def __init__(self, p_expression):
+
+        self._expression = p_expression.strip()
+        fields = MACROS.get(self._expression.lower(), self._expression).split()
+
+        if len(fields) != len(FIELD_DEFINITIONS):
+            fmt = "Cron expression '{expression}' must contain {count} fields"
+            raise configuration.ConfigurationException(
+                fmt.format(expression=p_expression, count=len(FIELD_DEFINITIONS)))
+
+        parsed_fields = []
+
+        for field, (name, minimum, maximum, names) in zip(fields, FIELD_DEFINITIONS):
+            try:
+                parsed_fields.append(_parse_field(field, name, minimum, maximum, names))
+
+            except ValueError as e:
+                fmt = "Invalid field '{field}' in cron expression '{expression}': {msg}"
+                raise configuration.ConfigurationException(
+                    fmt.format(field=field, expression=p_expression, msg=str(e)))
+
+        minutes, hours, days_of_month, months, days_of_week = parsed_fields
+
+        if 7 in days_of_week:
+            days_of_week.discard(7)
+            days_of_week.add(0)
+
+        self._minutes = tuple(sorted(minutes))
+        self._hours = tuple(sorted(hours))
+        self._days_of_month = frozenset(days_of_month)
+        self._months = frozenset(months)
+
+        # Python: Monday == 0, cron: Sunday == 0
+        self._weekdays = frozenset((day + 6) % 7 for day in days_of_week)
+
+        # Vixie cron semantics: if both day fields are restricted a day matches if either field matches
+        self._day_of_month_restricted = fields[2] != "*"
+        self._day_of_week_restricted = fields[4] != "*"
+
+        # (start, result) of the latest computation -- one tuple so that concurrent readers see a consistent pair
+        self._cache = (None, None)
+
+    @property
+    def expression(self):
+        return self._expression
+
+    def __str__(self):
+        return self._expression
+
+    def _matches_day(self, p_date):
+
+        if p_date.month not in self._months:
+            return False
+
+        day_of_month_matches = p_date.day in self._days_of_month
+        day_of_week_matches = p_date.weekday() in self._weekdays
+
+        if self._day_of_month_restricted and self._day_of_week_restricted:
+            return day_of_month_matches or day_of_week_matches
+
+        return day_of_month_matches and day_of_week_matches
+
+    def get_next_time(self, p_after):
+        """
+        :param p_after: reference time (naive local time)
+        :return: the first matching time strictly after the reference time
+        """
+
+        start = p_after.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+
+        cached_start, cached_result = self._cache
+
+        if start == cached_start:
+            return cached_result
+
+        day = start.date()
+        hour = start.hour
+        minute = start.minute
+
+        for _ in range(MAXIMUM_SEARCH_DAYS):
+            if self._matches_day(day):
+                hour_index = bisect.bisect_left(self._hours, hour)
+
+                while hour_index < len(self._hours):
+                    matching_hour = self._hours[hour_index]
+                    minute_index = bisect.bisect_left(self._minutes, minute if matching_hour == hour else 0)
+
+                    if minute_index < len(self._minutes):
+                        result = datetime.datetime.combine(
+                            day, datetime.time(hour=matching_hour, minute=self._minutes[minute_index]))
+                        self._cache = (start, result)
+                        return result
+
+                    hour_index += 1
+
+            day = day + datetime.timedelta(days=1)
+            hour = 0
+            minute = 0
+
+        fmt = "Cron expression '{expression}' never matches"
+        raise configuration.ConfigurationException(fmt.format(expression=self._expression))
+
+    def get_next_timestamp(self, p_after):
+        """
+        Converts the next matching local time into an absolute point in time using the local time zone so that
+        changes of the UTC offset (daylight saving time) are taken into account. Like cron, local times occurring
+        twice when the clocks are turned back match only once (at their first occurrence) and local times skipped
+        when the clocks are turned forward match at the end of the skipped period.
+
+        :param p_after: reference time (seconds since the epoch)
+        :return: the first matching time strictly after the reference time (seconds since the epoch)
+        """
+
+        local_time = datetime.datetime.fromtimestamp(p_after)
+
+        while True:
+            local_time = self.get_next_time(p_after=local_time)
+            timestamp = local_time.timestamp()
+
+            if datetime.datetime.fromtimestamp(timestamp) != local_time:
+                # The local time does not exist -> use the first existing minute after the skipped period
+                end_of_gap = local_time
+
+                while datetime.datetime.fromtimestamp(end_of_gap.timestamp()) != end_of_gap:
+                    end_of_gap += datetime.timedelta(minutes=1)
+
+                timestamp = end_of_gap.timestamp()
+
+            # Local times preceding the reference time belong to the first occurrence of a repeated hour
+            if timestamp > p_after:
+                return timestamp
+
+
+@functools.lru_cache(maxsize=None)
+def get_cron_expression(p_expression):
+    """
+    Returns a shared parsed instance for the given expression.
+    """
+
+    return CronExpression(p_expression=p_expression)
@@ -137,8 +137,12 @@ class Daemon(object):
         # Write pidfile
         atexit.register(
             self.delpid)  # Make sure pid file is removed if we quit
+        self.writepid()
+
+    def writepid(self):
         pid = str(os.getpid())
-        open(self.pidfile, 'w+').write("%s\n" % pid)
+        with open(self.pidfile, 'w+') as pf:
+            pf.write("%s\n" % pid)
 
     def delpid(self):
         try:
@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import concurrent.futures
+import itertools
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+
+from python_base_app import configuration
+from python_base_app import log_handling
+
+DEFAULT_TIMEOUT = 1  # seconds
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+ICMP_HEADER = struct.Struct("!BBHHH")
+PAYLOAD = b"python_base_app-ping".ljust(32, b".")
+RECEIVE_BUFFER_SIZE = 2048
+MAXIMUM_RESOLVER_THREADS = 16
+
+# Shared by all engines since raw sockets of the same process use the same identifier
+_sequence_numbers = itertools.count(1)
+_sequence_lock = threading.Lock()
+
+
+def get_checksum(p_data):
+    """
+    :return: the internet checksum (RFC 1071) of the data
+    """
+
+    if len(p_data) % 2 == 1:
+        p_data += b"\0"
+
+    checksum = sum(struct.unpack("!%dH" % (len(p_data) // 2), p_data))
+    checksum = (checksum >> 16) + (checksum & 0xffff)
+    checksum += checksum >> 16
+    return ~checksum & 0xffff
+
+
+def create_echo_request(p_family, p_identifier, p_sequence):
+
+    request_type = ICMP_ECHO_REQUEST if p_family == socket.AF_INET else ICMPV6_ECHO_REQUEST
+    header = ICMP_HEADER.pack(request_type, 0, 0, p_identifier, p_sequence)
+
+    if p_family == socket.AF_INET:
+        # The kernel computes the checksum of ICMPv6 packets itself
+        header = ICMP_HEADER.pack(request_type, 0, get_checksum(header + PAYLOAD), p_identifier, p_sequence)
+
+    return header + PAYLOAD
+
+
+def parse_echo_reply(p_family, p_packet, p_raw):
+    """
+    :return: tuple (identifier, sequence) if the packet is an echo reply, None otherwise
+    """
+
+    if p_family == socket.AF_INET and p_raw:
+        # Raw IPv4 sockets deliver the IP header as well
+        p_packet = p_packet[(p_packet[0] & 0x0f) * 4:]
+
+    if len(p_packet) < ICMP_HEADER.size:
+        return None
+
+    reply_type, _code, _checksum, identifier, sequence = ICMP_HEADER.unpack_from(p_packet)
+
+    if reply_type != (ICMP_ECHO_REPLY if p_family == socket.AF_INET else ICMPV6_ECHO_REPLY):
+        return None
+
+    return identifier, sequence
+
+
+class EchoSocket(object):
+
+    def __init__(self, p_family, p_allow_raw_socket=True):
+
+        self.family = p_family
+        self.raw = False
+        protocol = socket.IPPROTO_ICMP if p_family == socket.AF_INET else socket.IPPROTO_ICMPV6
+
+        try:
+            # Unprivileged ICMP sockets (Linux: allowed for the groups in net.ipv4.ping_group_range)
+            self.socket = socket.socket(p_family, socket.SOCK_DGRAM, protocol)
+
+        except OSError as e:
+            if not p_allow_raw_socket:
+                raise e
+
+            # Requires root or CAP_NET_RAW
+            self.socket = socket.socket(p_family, socket.SOCK_RAW, protocol)
+            self.raw = True
+
+        self.socket.setblocking(False)
+
+        if self.raw:
+            self.identifier = os.getpid() & 0xffff
+
+        else:
+            # The kernel replaces the identifier by the local "port" of datagram sockets. The port is only
+            # assigned when the socket is bound, so bind it before the first request is sent.
+            self.socket.bind(("0.0.0.0", 0) if p_family == socket.AF_INET else ("::", 0))
+            self.identifier = self.socket.getsockname()[1] & 0xffff
+
+    def close(self):
+        self.socket.close()
+
+
+class IcmpEchoEngine(object):
+    """
+    Sends ICMP echo requests from within the process instead of running the ping command. Many requests can be
+    outstanding at the same time: they are sent on one socket per address family and the replies are matched by
+    identifier and sequence number.
+    """
+
+    def __init__(self, p_timeout=DEFAULT_TIMEOUT, p_allow_raw_sockets=True):
+        """
+        :param p_allow_raw_sockets: if False only unprivileged ICMP sockets are used
+        """
+
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+        self._timeout = p_timeout
+        self._allow_raw_sockets = p_allow_raw_sockets
+
+    @staticmethod
+    def next_sequence_number():
+
+        with _sequence_lock:
+            return next(_sequence_numbers) & 0xffff
+
+    def resolve(self, p_host):
+        """
+        :return: tuple (address family, socket address) of the host
+        """
+
+        try:
+            family, _type, _proto, _name, address = socket.getaddrinfo(p_host, None, proto=socket.IPPROTO_TCP)[0]
+
+        except (socket.gaierror, UnicodeError) as e:
+            fmt = "Cannot resolve host {host}: {msg}"
+            raise configuration.ConfigurationException(fmt.format(host=p_host, msg=str(e)))
+
+        return family, address
+
+    def resolve_many(self, p_hosts):
+        """
+        Resolves the hosts concurrently. Hosts which cannot be resolved within the timeout are reported as failed.
+
+        :return: tuple (dictionary {host: (address family, socket address)}, dictionary {host: exception})
+        """
+
+        addresses = {}
+        failures = {}
+
+        if len(p_hosts) == 0:
+            return addresses, failures
+
+        # Do not use the executor as context manager: it would wait for hanging name lookups
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(len(p_hosts), MAXIMUM_RESOLVER_THREADS),
+                                                         thread_name_prefix="IcmpResolver")
+
+        try:
+            futures = {host: executor.submit(self.resolve, host) for host in p_hosts}
+            concurrent.futures.wait(futures.values(), timeout=self._timeout)
+
+            for host, future in futures.items():
+                if not future.done():
+                    future.cancel()
+                    fmt = "Cannot resolve host {host}: no result within {timeout} [s]"
+                    failures[host] = configuration.ConfigurationException(
+                        fmt.format(host=host, timeout=self._timeout))
+
+                elif future.exception() is not None:
+                    failures[host] = future.exception()
+
+                else:
+                    addresses[host] = future.result()
+
+        finally:
+            executor.shutdown(wait=False)
+
+        return addresses, failures
+
+    def ping(self, p_host):
+        """
+        :return: the delay in milliseconds (as float) if the host responds, None otherwise
+        """
+
+        return self.ping_many(p_hosts=[p_host], p_ignore_unknown_hosts=False)[p_host]
+
+    def ping_many(self, p_hosts, p_ignore_unknown_hosts=True):
+        """
+        :return: dictionary {host: delay in milliseconds or None if the host does not respond}
+        """
+
+        results = {host: None for host in p_hosts}
+        addresses, failures = self.resolve_many(p_hosts=list(results))
+
+        for host, e in failures.items():
+            if not p_ignore_unknown_hosts:
+                raise e
+
+            self._logger.warning(str(e))
+
+        destinations = [(host,) + addresses[host] for host in results if host in addresses]
+
+        if len(destinations) == 0:
+            return results
+
+        echo_sockets = {}
+        pending = {}
+        selector = selectors.DefaultSelector()
+
+        try:
+            for host, family, address in destinations:
+                echo_socket = echo_sockets.get(family)
+
+                if echo_socket is None:
+                    try:
+                        echo_socket = EchoSocket(p_family=family, p_allow_raw_socket=self._allow_raw_sockets)
+
+                    except OSError as e:
+                        fmt = "Cannot open ICMP socket: {msg} (check net.ipv4.ping_group_range or use " \
+                              "[Pinger]ping_engine=command)"
+                        raise configuration.ConfigurationException(fmt.format(msg=str(e)))
+
+                    echo_sockets[family] = echo_socket
+                    selector.register(echo_socket.socket, selectors.EVENT_READ, echo_socket)
+
+                sequence = self.next_sequence_number()
+                packet = create_echo_request(p_family=family, p_identifier=echo_socket.identifier,
+                                             p_sequence=sequence)
+                pending[(family, sequence)] = (host, address[0], time.perf_counter())
+
+                try:
+                    echo_socket.socket.sendto(packet, address)
+
+                except OSError as e:
+                    fmt = "Cannot send ICMP echo request to host {host}: {msg}"
+                    self._logger.debug(fmt.format(host=host, msg=str(e)))
+                    del pending[(family, sequence)]
+
+            deadline = time.monotonic() + self._timeout
+
+            while len(pending) > 0:
+                timeout = deadline - time.monotonic()
+
+                if timeout <= 0:
+                    break
+
+                for key, _events in selector.select(timeout):
+                    self.receive_replies(p_echo_socket=key.data, p_pending=pending, p_results=results)
+
+        finally:
+            selector.close()
+
+            for echo_socket in echo_sockets.values():
+                echo_socket.close()
+
+        return results
+
+    def receive_replies(self, p_echo_socket, p_pending, p_results):
+
+        while True:
+            try:
+                packet, address = p_echo_socket.socket.recvfrom(RECEIVE_BUFFER_SIZE)
+
+            except (BlockingIOError, InterruptedError):
+                return
+
+            receive_time = time.perf_counter()
+            reply = parse_echo_reply(p_family=p_echo_socket.family, p_packet=packet, p_raw=p_echo_socket.raw)
+
+            if reply is None:
+                continue
+
+            identifier, sequence = reply
+
+            if identifier != p_echo_socket.identifier:
+                # Raw sockets receive the replies of all processes
+                continue
+
+            key = (p_echo_socket.family, sequence)
+            request = p_pending.get(key)
+
+            if request is None or request[1] != address[0]:
+                continue
+
+            host, _address, send_time = p_pending.pop(key)
+            p_results[host] = (receive_time - send_time) * 1000
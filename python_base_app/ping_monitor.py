@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import threading
+import time
+
+from python_base_app import base_app
+from python_base_app import configuration
+from python_base_app import log_handling
+from python_base_app import stats
+from python_base_app import tools
+
+SECTION_NAME = "PingMonitor"
+
+DEFAULT_PING_INTERVAL = 60  # seconds
+DEFAULT_SAMPLE_SIZE = 20  # number of pings per host used for the rolling statistics
+DEFAULT_UP_THRESHOLD = 2  # consecutive responses required to consider a host up
+DEFAULT_DOWN_THRESHOLD = 3  # consecutive missing responses required to consider a host down
+
+STATE_UNKNOWN = "unknown"
+STATE_UP = "up"
+STATE_DOWN = "down"
+
+
+class PingMonitorConfigModel(configuration.ConfigModel):
+
+    def __init__(self):
+        super().__init__(p_section_name=SECTION_NAME)
+
+        self.ping_interval = configuration.Duration(DEFAULT_PING_INTERVAL)
+        self.sample_size = DEFAULT_SAMPLE_SIZE
+        self.up_threshold = DEFAULT_UP_THRESHOLD
+        self.down_threshold = DEFAULT_DOWN_THRESHOLD
+        self.hosts = [str]
+
+    def is_active(self):
+        return True
+
+    def check_constraints(self):
+
+        errors = []
+
+        if self.ping_interval <= 0:
+            errors.append("ping_interval must be positive")
+
+        for option_name in ("sample_size", "up_threshold", "down_threshold"):
+            if getattr(self, option_name) < 1:
+                errors.append("{option} must be at least 1".format(option=option_name))
+
+        return errors
+
+
+class HostStatistics(object):
+    """
+    Rolling statistics of the latest [PingMonitor]sample_size pings of a host. The memory consumption does not
+    depend on the number of pings.
+    """
+
+    __slots__ = ("host", "state", "last_seen", "last_delay", "consecutive_responses", "consecutive_losses",
+                 "ping_count", "_delays", "_jitters", "_losses")
+
+    def __init__(self, p_host, p_sample_size=DEFAULT_SAMPLE_SIZE):
+
+        self.host = p_host
+        self.state = STATE_UNKNOWN
+
+        # Wall clock time (seconds since the epoch) of the latest response
+        self.last_seen = None
+
+        self.last_delay = None
+        self.consecutive_responses = 0
+        self.consecutive_losses = 0
+        self.ping_count = 0
+
+        self._delays = stats.MovingAverage(p_sample_size=p_sample_size)
+        # Absolute difference of consecutive delays (see RFC 3550 section 6.4.1)
+        self._jitters = stats.MovingAverage(p_sample_size=p_sample_size)
+        # 1 for each missing response, 0 for each response
+        self._losses = stats.MovingAverage(p_sample_size=p_sample_size)
+
+    @property
+    def mean_delay(self):
+        return self._delays.get_value()
+
+    @property
+    def jitter(self):
+        return self._jitters.get_value()
+
+    @property
+    def packet_loss(self):
+        """
+        :return: fraction (0..1) of the latest pings without response
+        """
+
+        return self._losses.get_value()
+
+    def add_result(self, p_delay, p_now=None):
+        """
+        :param p_delay: delay in milliseconds or None if the host did not respond
+        """
+
+        self.ping_count += 1
+
+        if p_delay is None:
+            self._losses.add_value(1)
+            self.consecutive_losses += 1
+            self.consecutive_responses = 0
+            return
+
+        if p_now is None:
+            p_now = time.time()
+
+        if self.last_delay is not None:
+            self._jitters.add_value(abs(p_delay - self.last_delay))
+
+        self._delays.add_value(p_delay)
+        self._losses.add_value(0)
+        self.last_delay = p_delay
+        self.last_seen = p_now
+        self.consecutive_responses += 1
+        self.consecutive_losses = 0
+
+    def update_state(self, p_up_threshold, p_down_threshold):
+        """
+        Changes the state only after p_up_threshold consecutive responses or p_down_threshold consecutive missing
+        responses so that single lost pings do not make the state flap.
+
+        :return: the new state if it has changed, None otherwise
+        """
+
+        if self.state != STATE_UP and self.consecutive_responses >= p_up_threshold:
+            self.state = STATE_UP
+            return self.state
+
+        if self.state != STATE_DOWN and self.consecutive_losses >= p_down_threshold:
+            self.state = STATE_DOWN
+            return self.state
+
+        return None
+
+    def get_summary(self):
+        """
+        :return: dictionary of the statistics (e.g. for REST APIs)
+        """
+
+        return {
+            "host": self.host,
+            "state": self.state,
+            "mean_delay": self.mean_delay,
+            "jitter": self.jitter,
+            "packet_loss": self.packet_loss,
+            "last_seen": self.last_seen,
+            "ping_count": self.ping_count
+        }
+
+
+class PingMonitor(object):
+    """
+    Pings a set of hosts on a schedule (see create_recurring_task()), maintains rolling statistics per host and
+    notifies listeners when hosts go up or down.
+    """
+
+    def __init__(self, p_pinger, p_config=None):
+
+        if p_config is None:
+            p_config = PingMonitorConfigModel()
+
+        errors = p_config.check_constraints()
+
+        if len(errors) > 0:
+            fmt = "Invalid settings in section [{section}]: {errors}"
+            raise configuration.ConfigurationException(fmt.format(section=SECTION_NAME, errors=", ".join(errors)))
+
+        self._pinger = p_pinger
+        self._config = p_config
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+        self._statistics = {}
+        self._state_listeners = []
+
+        # Checks run in the task workers while the statistics are read by other threads (e.g. the web server)
+        self._lock = threading.Lock()
+
+        for host in self._config.hosts:
+            self.add_host(p_host=host)
+
+    @property
+    def hosts(self):
+
+        with self._lock:
+            return list(self._statistics)
+
+    def add_host(self, p_host):
+
+        with self._lock:
+            if p_host not in self._statistics:
+                self._statistics[p_host] = HostStatistics(p_host=p_host, p_sample_size=self._config.sample_size)
+
+    def remove_host(self, p_host):
+
+        with self._lock:
+            self._statistics.pop(p_host, None)
+
+    def add_state_listener(self, p_listener):
+        """
+        :param p_listener: function called with the host statistics (HostStatistics) and the previous state
+                           whenever a host goes up or down
+        """
+
+        self._state_listeners.append(p_listener)
+
+    def get_statistics(self, p_host):
+        """
+        :return: the statistics of the host or None if the host is not monitored
+        """
+
+        with self._lock:
+            return self._statistics.get(p_host)
+
+    def get_summaries(self):
+        """
+        :return: list of the statistics of all hosts as dictionaries
+        """
+
+        with self._lock:
+            return [statistics.get_summary() for statistics in self._statistics.values()]
+
+    def check(self):
+        """
+        Pings all hosts once, updates their statistics and notifies the listeners about changed states.
+        """
+
+        hosts = self.hosts
+
+        if len(hosts) == 0:
+            return
+
+        results = self._pinger.ping_many(p_hosts=hosts)
+        now = time.time()
+        transitions = []
+
+        with self._lock:
+            for host, delay in results.items():
+                statistics = self._statistics.get(host)
+
+                if statistics is None:
+                    # removed during the pings
+                    continue
+
+                old_state = statistics.state
+                statistics.add_result(p_delay=delay, p_now=now)
+                new_state = statistics.update_state(p_up_threshold=self._config.up_threshold,
+                                                    p_down_threshold=self._config.down_threshold)
+
+                if new_state is not None:
+                    transitions.append((statistics, old_state))
+
+        # The listeners are called without holding the lock so that they may query the monitor
+        for statistics, old_state in transitions:
+            fmt = "Host {host} changed from state '{old_state}' to '{new_state}'"
+            self._logger.info(fmt.format(host=statistics.host, old_state=old_state, new_state=statistics.state))
+
+            for listener in self._state_listeners:
+                try:
+                    listener(statistics, old_state)
+
+                except Exception as e:
+                    fmt = "Exception '{msg}' in state listener of host {host}"
+                    self._logger.error(fmt.format(msg=str(e), host=statistics.host))
+                    tools.log_stack_trace(p_logger=self._logger)
+
+    def create_recurring_task(self, p_name=SECTION_NAME):
+        """
+        :return: recurring task running check() every [PingMonitor]ping_interval seconds (see
+                 BaseApp.add_recurring_task())
+        """
+
+        return base_app.RecurringTask(p_name=p_name, p_handler_method=self.check,
+                                      p_interval=self._config.ping_interval, p_ignore_exceptions=True)
@@ -17,14 +17,21 @@
 #    You should have received a copy of the GNU General Public License along
 #    with this program; if not, write to the Free Software Foundation, Inc.,
 #    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+import asyncio
+import concurrent.futures
+import json
 import os
 import re
 import shlex
 import subprocess
+import threading
+import urllib.parse
 
 import requests
+import requests.adapters
 
 from python_base_app import configuration
+from python_base_app import icmp_engine
 from python_base_app import log_handling
 from python_base_app import tools
 from python_base_app.configuration import ConfigurationException
@@ -49,6 +56,20 @@ else:
 
 DEFAULT_PING_RESULT_REGEX = r"(rtt|round-trip) min/avg/max/(mdev|stddev) = [\d\.]+/([\d\.]+)/[\d\.]+/([\d\.]+|nan) ms"
 DEFAULT_PING_TIMEOUT_IN_SECONDS = 5
+DEFAULT_PING_POOL_SIZE = 32  # maximum number of concurrent pings of ping_many()
+DEFAULT_LOCAL_PING_TIMEOUT_IN_SECONDS = 1
+DEFAULT_RELAY_POOL_SIZE = 10  # maximum number of kept-alive connections per relay host
+
+# Optional API of relay hosts pinging several hosts at once: POST {"hosts": [...]} returns {host: delay or null}
+RELAY_BATCH_API_PATH = "/api/ping_many"
+HTTP_STATUS_OK = 200
+HTTP_STATUS_NOT_FOUND = 404
+HTTP_STATUS_METHOD_NOT_ALLOWED = 405
+
+PING_ENGINE_COMMAND = "command"  # runs the ping command for each host
+PING_ENGINE_NATIVE = "native"  # sends ICMP echo requests from within the process
+PING_ENGINES = [PING_ENGINE_COMMAND, PING_ENGINE_NATIVE]
+DEFAULT_PING_ENGINE = PING_ENGINE_COMMAND
 
 
 class PingerConfigModel(configuration.ConfigModel):
@@ -62,6 +83,9 @@ class PingerConfigModel(configuration.ConfigModel):
         self.ping_command = DEFAULT_PING_COMMAND
         self.ping_result_regex = DEFAULT_PING_RESULT_REGEX
         self.ping_wait_option = DEFAULT_PING_WAIT_OPTION
+        self.ping_pool_size = DEFAULT_PING_POOL_SIZE
+        self.ping_engine = DEFAULT_PING_ENGINE
+        self.relay_pool_size = DEFAULT_RELAY_POOL_SIZE
 
 
 class Pinger(object):
@@ -82,6 +106,28 @@ class Pinger(object):
             raise configuration.ConfigurationException(
                 fmt.format(regex=self._config.ping_result_regex, section=SECTION_NAME))
 
+        if self._config.ping_engine not in PING_ENGINES:
+            fmt = "Invalid ping engine '{engine}' in [{section}]ping_engine (valid values: {engines})"
+            raise configuration.ConfigurationException(
+                fmt.format(engine=self._config.ping_engine, section=SECTION_NAME, engines=", ".join(PING_ENGINES)))
+
+        self._icmp_engine = None
+        self._ping_environment = None
+        self._relay_sessions = {}
+        self._relays_without_batch_api = set()
+        self._relay_lock = threading.Lock()
+
+        if self._config.ping_engine == PING_ENGINE_NATIVE:
+            self._icmp_engine = icmp_engine.IcmpEchoEngine(p_timeout=DEFAULT_LOCAL_PING_TIMEOUT_IN_SECONDS)
+
+    @property
+    def config(self):
+        return self._config
+
+    @property
+    def icmp_engine(self):
+        return self._icmp_engine
+
     def is_valid_ping(self, p_host):
 
         if URL_SEPERATOR in p_host:
@@ -102,50 +148,236 @@ class Pinger(object):
         else:
             return self.local_ping(p_host=p_host)
 
-    def remote_ping(self, p_url, p_default_port, p_default_timeout=DEFAULT_PING_TIMEOUT_IN_SECONDS):
+    def ping_many(self, p_hosts, p_default_port=None):
+        """
+        Pings several hosts concurrently (at most [Pinger]ping_pool_size at a time) so that the duration is
+        bounded by the slowest host instead of the sum of all hosts. Hosts delegated to the same relay host are
+        sent in a single request if the relay supports it.
 
-        if not URL_SEPERATOR in p_url:
-            msg = "No URL separator found in '{url}'!"
-            raise Exception(msg.format(url=p_url))
-        try:
+        :param p_hosts: list of hosts as accepted by ping()
+        :return: dictionary {host: delay in milliseconds or None if the host does not respond}
+        """
 
-            index = p_url.find(URL_SEPERATOR)
-            first_url = p_url[:index]
-            remaining_url = p_url[index + 1:]
+        hosts = list(dict.fromkeys(p_hosts))
+        results = {}
 
-            host, port = tools.split_host_url(p_url=first_url, p_default_port_number=p_default_port)
+        if self._icmp_engine is not None:
+            # All local pings are multiplexed on the sockets of the engine, only remote pings need threads
+            results.update(self._icmp_engine.ping_many(p_hosts=[host for host in hosts if URL_SEPERATOR not in host]))
+            hosts = [host for host in hosts if URL_SEPERATOR in host]
 
-            url = "http://{host}:{port}/api/ping?host={remaining_url}".format(
-                host=host,
-                port=port,
-                remaining_url=remaining_url
-            )
-            fmt = "Delegating to remote host using URL {url}"
-            self._logger.debug(fmt.format(url=url))
+        if len(hosts) == 0:
+            return results
 
-            r = requests.get(url, timeout=p_default_timeout)
+        if p_default_port is None:
+            p_default_port = self._default_port
 
-            fmt = "Result of remote ping: {delay}"
-            self._logger.debug(fmt.format(delay=r.text))
+        batches = self.get_relay_batches(p_hosts=hosts, p_default_port=p_default_port)
+        batched_hosts = {host for batch in batches.values() for host in batch}
+        # Threads are only started on demand, so the pool is big enough for the hosts of failing batches
+        max_workers = max(1, min(self._config.ping_pool_size, len(hosts)))
 
-            delay = float(r.text.replace(',', '.'))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers,
+                                                   thread_name_prefix=self.__class__.__name__) as executor:
+            futures = {executor.submit(self.remote_ping_batch, relay, batch): batch
+                       for relay, batch in batches.items()}
+            futures.update({executor.submit(self.ping, host, p_default_port): host
+                            for host in hosts if host not in batched_hosts})
+
+            while len(futures) > 0:
+                done, _not_done = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    request = futures.pop(future)
+
+                    if isinstance(request, dict):
+                        batch_results = future.result()
+
+                        if batch_results is None:
+                            # The relay does not support batches -> ping its hosts one by one
+                            futures.update({executor.submit(self.ping, host, p_default_port): host
+                                            for host in request})
+
+                        else:
+                            results.update(batch_results)
+
+                        continue
+
+                    try:
+                        results[request] = future.result()
+
+                    except Exception as e:
+                        fmt = "Exception '{msg}' while pinging host {host}"
+                        self._logger.warning(fmt.format(msg=str(e), host=request))
+                        results[request] = None
+
+        return results
+
+    def split_remote_url(self, p_url, p_default_port):
+        """
+        :return: tuple (relay host, relay port, remaining URL) of a remote ping URL "relay[:port],host"
+        """
+
+        index = p_url.find(URL_SEPERATOR)
+        host, port = tools.split_host_url(p_url=p_url[:index], p_default_port_number=p_default_port)
+        return host, port, p_url[index + 1:]
+
+    def get_relay_batches(self, p_hosts, p_default_port):
+        """
+        :return: dictionary {(relay host, relay port): {remote URL: remaining URL}} of all relays with at least two
+                 hosts to be pinged and which may support the batch API
+        """
+
+        batches = {}
+
+        for host in p_hosts:
+            if URL_SEPERATOR not in host:
+                continue
+
+            try:
+                relay_host, relay_port, remaining_url = self.split_remote_url(p_url=host,
+                                                                              p_default_port=p_default_port)
+
+            except ValueError:
+                # reported by the single remote ping
+                continue
+
+            if (relay_host, relay_port) not in self._relays_without_batch_api:
+                batches.setdefault((relay_host, relay_port), {})[host] = remaining_url
+
+        return {relay: batch for relay, batch in batches.items() if len(batch) > 1}
+
+    def get_relay_session(self, p_host, p_port):
+        """
+        :return: the session of a relay host keeping its connections alive (at most [Pinger]relay_pool_size)
+        """
+
+        with self._relay_lock:
+            session = self._relay_sessions.get((p_host, p_port))
+
+            if session is None:
+                session = requests.Session()
+                # Concurrent pings wait for a free connection instead of opening additional ones
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self._config.relay_pool_size,
+                                                        pool_block=True)
+                session.mount("http://", adapter)
+                self._relay_sessions[(p_host, p_port)] = session
+
+            return session
+
+    def close(self):
+        """
+        Closes the connections to the relay hosts.
+        """
+
+        with self._relay_lock:
+            for session in self._relay_sessions.values():
+                session.close()
+
+            self._relay_sessions = {}
+
+    def remote_ping_batch(self, p_relay, p_batch, p_default_timeout=DEFAULT_PING_TIMEOUT_IN_SECONDS):
+        """
+        Lets a relay host ping several hosts with a single request.
+
+        :param p_relay: tuple (relay host, relay port)
+        :param p_batch: dictionary {remote URL: URL to be pinged by the relay}
+        :return: dictionary {remote URL: delay or None} or None if the relay does not support the batch API
+        """
+
+        host, port = p_relay
+        url = "http://{host}:{port}{path}".format(host=host, port=port, path=RELAY_BATCH_API_PATH)
+
+        fmt = "Delegating {count} hosts to remote host using URL {url}"
+        self._logger.debug(fmt.format(count=len(p_batch), url=url))
+
+        try:
+            r = self.get_relay_session(p_host=host, p_port=port).post(
+                url, json={"hosts": list(p_batch.values())}, timeout=p_default_timeout)
+
+            if r.status_code in (HTTP_STATUS_NOT_FOUND, HTTP_STATUS_METHOD_NOT_ALLOWED):
+                self.set_relay_without_batch_api(p_relay=p_relay)
+                return None
+
+            r.raise_for_status()
+            results = self.get_relay_batch_results(p_batch=p_batch, p_delays=r.json())
 
         except Exception as e:
             fmt = "Exception during remote ping: {msg}"
             self._logger.error(fmt.format(msg=str(e)))
-            return None
+            return {remote_url: None for remote_url in p_batch}
 
-        return delay
+        return results
 
-    # https://stackoverflow.com/questions/2953462/pinging-servers-in-python
-    def local_ping(self, p_host):
+    def set_relay_without_batch_api(self, p_relay):
+        """
+        Makes get_relay_batches() skip the relay host from now on.
         """
-        Checks if a host reacts to a ICMP ping request.
-        Remember that a host may not respond to a ping (ICMP) request even if the host name is valid.
 
-        :param p_host: DNS or ip address of the host to be pinged
-        :return: the delay in milliseconds (as float) if the host responds, None otherwise
+        host, port = p_relay
+        fmt = "Remote host {host}:{port} does not support batch pings -> pinging hosts one by one"
+        self._logger.info(fmt.format(host=host, port=port))
+
+        with self._relay_lock:
+            self._relays_without_batch_api.add(p_relay)
+
+    def get_relay_batch_results(self, p_batch, p_delays):
+        """
+        :param p_delays: response of the batch API {URL pinged by the relay: delay or None}
+        :return: dictionary {remote URL: delay or None}
+        """
+
+        results = {}
+
+        for remote_url, remaining_url in p_batch.items():
+            delay = p_delays.get(remaining_url)
+            results[remote_url] = float(delay) if delay is not None else None
+
+        return results
+
+    def get_remote_ping_url(self, p_url, p_default_port):
         """
+        :return: the URL of the ping API of the relay host (first part of p_url) pinging the remaining hosts
+        """
+
+        host, port, remaining_url = self.split_remote_url(p_url=p_url, p_default_port=p_default_port)
+
+        url = "http://{host}:{port}/api/ping?host={remaining_url}".format(
+            host=host,
+            port=port,
+            remaining_url=remaining_url
+        )
+        fmt = "Delegating to remote host using URL {url}"
+        self._logger.debug(fmt.format(url=url))
+
+        return url
+
+    def parse_remote_ping_result(self, p_text):
+
+        fmt = "Result of remote ping: {delay}"
+        self._logger.debug(fmt.format(delay=p_text))
+
+        return float(p_text.replace(',', '.'))
+
+    def remote_ping(self, p_url, p_default_port, p_default_timeout=DEFAULT_PING_TIMEOUT_IN_SECONDS):
+
+        if not URL_SEPERATOR in p_url:
+            msg = "No URL separator found in '{url}'!"
+            raise Exception(msg.format(url=p_url))
+        try:
+            host, port, _remaining_url = self.split_remote_url(p_url=p_url, p_default_port=p_default_port)
+            url = self.get_remote_ping_url(p_url=p_url, p_default_port=p_default_port)
+            r = self.get_relay_session(p_host=host, p_port=port).get(url, timeout=p_default_timeout)
+            delay = self.parse_remote_ping_result(p_text=r.text)
+
+        except Exception as e:
+            fmt = "Exception during remote ping: {msg}"
+            self._logger.error(fmt.format(msg=str(e)))
+            return None
+
+        return delay
+
+    def get_local_ping_command(self, p_host):
 
         fmt = "{ping_command} {w_option} 1 {c_option} {host}"
         raw_command = fmt.format(ping_command=self._config.ping_command,
@@ -155,22 +387,29 @@ class Pinger(object):
                                  host=shlex.quote(p_host))
 
         command = shlex.split(raw_command)
-        delay = None
 
         fmt = "Executing command {cmd} in Popen"
         self._logger.debug(fmt.format(cmd=command))
 
-        # make sure we get floating points and not commas!
-        run_env = os.environ.copy()
-        run_env["LANG"] = "en_US"
+        return command
+
+    def get_ping_environment(self):
 
-        proc = subprocess.run(command, stdout=subprocess.PIPE, env=run_env)
+        if self._ping_environment is None:
+            # make sure we get floating points and not commas!
+            self._ping_environment = os.environ.copy()
+            self._ping_environment["LANG"] = "en_US"
 
-        if proc.returncode >= 2:
+        return self._ping_environment
+
+    def parse_local_ping_output(self, p_host, p_command, p_returncode, p_output):
+
+        if p_returncode >= 2:
             fmt = "{cmd} returns exit code {exitcode}"
-            raise ConfigurationException(fmt.format(cmd=command, exitcode=proc.returncode))
+            raise ConfigurationException(fmt.format(cmd=p_command, exitcode=p_returncode))
 
-        stdout_string = proc.stdout.decode("UTF-8")
+        delay = None
+        stdout_string = p_output.decode("UTF-8")
 
         for line in stdout_string.split("\n"):
             fmt = "ping output: {line}"
@@ -182,8 +421,385 @@ class Pinger(object):
                 delay = float(result.group(3))
                 break
 
+        self.log_ping_result(p_host=p_host, p_delay=delay)
+        return delay
+
+    def log_ping_result(self, p_host, p_delay):
+
         fmt = "Host {host} is {status}"
         self._logger.debug(
-            fmt.format(host=p_host, status="responding (%.1f ms)" % delay if delay is not None else "down"))
+            fmt.format(host=p_host, status="responding (%.1f ms)" % p_delay if p_delay is not None else "down"))
 
-        return delay
+    # https://stackoverflow.com/questions/2953462/pinging-servers-in-python
+    def local_ping(self, p_host):
+        """
+        Checks if a host reacts to a ICMP ping request.
+        Remember that a host may not respond to a ping (ICMP) request even if the host name is valid.
+
+        :param p_host: DNS or ip address of the host to be pinged
+        :return: the delay in milliseconds (as float) if the host responds, None otherwise
+        """
+
+        if self._icmp_engine is not None:
+            delay = self._icmp_engine.ping(p_host=p_host)
+            self.log_ping_result(p_host=p_host, p_delay=delay)
+            return delay
+
+        command = self.get_local_ping_command(p_host=p_host)
+        proc = subprocess.run(command, stdout=subprocess.PIPE, env=self.get_ping_environment())
+
+        return self.parse_local_ping_output(p_host=p_host, p_command=command, p_returncode=proc.returncode,
+                                            p_output=proc.stdout)
+
+
+class AsyncPinger(object):
+    """
+    Asyncio variant of Pinger for services running in an asyncio event loop. Each ping is bounded by a timeout
+    (a host not responding in time is reported as down) and can be cancelled. Local pings run the ping command
+    as asyncio subprocess or use the native ICMP engine in a single executor thread per sweep, remote pings use
+    asyncio streams, so no thread is tied up per host. The connections to relay hosts are kept alive (at most
+    [Pinger]relay_pool_size per relay) and hosts delegated to the same relay are sent in a single request if the
+    relay supports it (see Pinger.ping_many()).
+    """
+
+    def __init__(self, p_default_port=None, p_config=None):
+
+        self._pinger = Pinger(p_default_port=p_default_port, p_config=p_config)
+        self._config = self._pinger.config
+        self._default_port = p_default_port
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+
+        # Streams and semaphores are bound to the event loop they were created in
+        self._relay_loop = None
+        self._idle_relay_connections = {}
+        self._relay_semaphores = {}
+
+    def is_valid_ping(self, p_host):
+
+        return self._pinger.is_valid_ping(p_host=p_host)
+
+    async def ping(self, p_host, p_default_port=None, p_timeout=DEFAULT_PING_TIMEOUT_IN_SECONDS):
+        """
+        :return: the delay in milliseconds (as float) if the host responds within the timeout, None otherwise
+        """
+
+        if p_default_port is None:
+            p_default_port = self._default_port
+
+        try:
+            if URL_SEPERATOR in p_host:
+                return await asyncio.wait_for(self.remote_ping(p_url=p_host, p_default_port=p_default_port),
+                                              timeout=p_timeout)
+
+            else:
+                return await asyncio.wait_for(self.local_ping(p_host=p_host), timeout=p_timeout)
+
+        except asyncio.TimeoutError:
+            fmt = "Timeout while pinging host {host}"
+            self._logger.debug(fmt.format(host=p_host))
+            return None
+
+    async def ping_many(self, p_hosts, p_default_port=None, p_timeout=DEFAULT_PING_TIMEOUT_IN_SECONDS):
+        """
+        Pings several hosts concurrently (at most [Pinger]ping_pool_size at a time) with a timeout per host.
+        Hosts delegated to the same relay host are sent in a single request if the relay supports it.
+
+        :return: dictionary {host: delay in milliseconds or None if the host does not respond}
+        """
+
+        hosts = list(dict.fromkeys(p_hosts))
+        results = {}
+
+        if p_default_port is None:
+            p_default_port = self._default_port
+
+        if self._pinger.icmp_engine is not None:
+            local_hosts = [host for host in hosts if URL_SEPERATOR not in host]
+            hosts = [host for host in hosts if URL_SEPERATOR in host]
+
+            if len(local_hosts) > 0:
+                # The engine multiplexes all requests on its sockets and is bounded by its own timeout
+                loop = asyncio.get_running_loop()
+                results.update(await loop.run_in_executor(None, self._pinger.icmp_engine.ping_many, local_hosts))
+
+        semaphore = asyncio.Semaphore(max(1, self._config.ping_pool_size))
+
+        async def ping_host(p_host):
+
+            async with semaphore:
+                try:
+                    return await self.ping(p_host=p_host, p_default_port=p_default_port, p_timeout=p_timeout)
+
+                except Exception as e:
+                    fmt = "Exception '{msg}' while pinging host {host}"
+                    self._logger.warning(fmt.format(msg=str(e), host=p_host))
+                    return None
+
+        async def ping_batch(p_relay, p_batch):
+
+            async with semaphore:
+                try:
+                    batch_results = await asyncio.wait_for(self.remote_ping_batch(p_relay=p_relay, p_batch=p_batch),
+                                                           timeout=p_timeout)
+
+                except asyncio.TimeoutError:
+                    fmt = "Timeout while pinging {count} hosts by relay host {host}:{port}"
+                    self._logger.debug(fmt.format(count=len(p_batch), host=p_relay[0], port=p_relay[1]))
+                    return {remote_url: None for remote_url in p_batch}
+
+            if batch_results is None:
+                # The relay does not support batches -> ping its hosts one by one (outside of the semaphore)
+                delays = await asyncio.gather(*[ping_host(p_host=host) for host in p_batch])
+                return dict(zip(p_batch, delays))
+
+            return batch_results
+
+        batches = self._pinger.get_relay_batches(p_hosts=hosts, p_default_port=p_default_port)
+        batched_hosts = {host for batch in batches.values() for host in batch}
+        single_hosts = [host for host in hosts if host not in batched_hosts]
+
+        all_batch_results, delays = await asyncio.gather(
+            asyncio.gather(*[ping_batch(p_relay=relay, p_batch=batch) for relay, batch in batches.items()]),
+            asyncio.gather(*[ping_host(p_host=host) for host in single_hosts]))
+
+        for batch_results in all_batch_results:
+            results.update(batch_results)
+
+        results.update(zip(single_hosts, delays))
+
+        return results
+
+    def get_relay_pool(self, p_relay):
+        """
+        :return: tuple (list of idle connections, semaphore) of the relay host in the running event loop
+        """
+
+        loop = asyncio.get_running_loop()
+
+        if loop is not self._relay_loop:
+            # The connections of a previous event loop cannot be used any more
+            self.close_relay_connections()
+            self._relay_loop = loop
+            self._relay_semaphores = {}
+
+        semaphore = self._relay_semaphores.get(p_relay)
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, self._config.relay_pool_size))
+            self._relay_semaphores[p_relay] = semaphore
+
+        return self._idle_relay_connections.setdefault(p_relay, []), semaphore
+
+    def close_relay_connections(self):
+
+        for connections in self._idle_relay_connections.values():
+            for _reader, writer in connections:
+                try:
+                    writer.close()
+
+                except RuntimeError:
+                    # event loop already closed
+                    pass
+
+        self._idle_relay_connections = {}
+
+    def close(self):
+        """
+        Closes the connections to the relay hosts.
+        """
+
+        self.close_relay_connections()
+        self._pinger.close()
+
+    async def read_relay_response(self, p_reader):
+        """
+        :return: tuple (status code, body, True if the connection may be reused)
+        """
+
+        header = await p_reader.readuntil(b"\r\n\r\n")
+        lines = header.decode("iso-8859-1").split("\r\n")
+        status_line = lines[0].split(" ")
+
+        if len(status_line) < 2 or not status_line[1].isdigit():
+            raise Exception("Unexpected response '{status}'".format(status=lines[0]))
+
+        headers = {}
+
+        for line in lines[1:]:
+            name, _separator, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+
+        keep_alive = status_line[0] == "HTTP/1.1" and headers.get("connection") != "close"
+
+        if headers.get("transfer-encoding") == "chunked":
+            chunks = []
+
+            while True:
+                size = int((await p_reader.readuntil(b"\r\n")).split(b";")[0], 16)
+
+                if size == 0:
+                    # skip the trailer
+                    while await p_reader.readuntil(b"\r\n") != b"\r\n":
+                        pass
+
+                    break
+
+                chunks.append(await p_reader.readexactly(size))
+                await p_reader.readexactly(2)
+
+            body = b"".join(chunks)
+
+        elif "content-length" in headers:
+            body = await p_reader.readexactly(int(headers["content-length"]))
+
+        else:
+            body = await p_reader.read()
+            keep_alive = False
+
+        return int(status_line[1]), body, keep_alive
+
+    async def send_relay_request(self, p_relay, p_method, p_target, p_body=None):
+        """
+        Sends an HTTP/1.1 request to a relay host using an idle kept-alive connection if there is one. Requests
+        exceeding [Pinger]relay_pool_size wait for a free connection instead of opening additional ones.
+
+        :param p_relay: tuple (relay host, relay port)
+        :return: tuple (status code, body)
+        """
+
+        idle_connections, semaphore = self.get_relay_pool(p_relay=p_relay)
+        host, port = p_relay
+
+        async with semaphore:
+            while True:
+                reused = False
+                reader = writer = None
+
+                while len(idle_connections) > 0 and writer is None:
+                    reader, writer = idle_connections.pop()
+
+                    if writer.is_closing() or reader.at_eof():
+                        writer.close()
+                        writer = None
+
+                    else:
+                        reused = True
+
+                if writer is None:
+                    reader, writer = await asyncio.open_connection(host, port)
+
+                keep_alive = False
+
+                try:
+                    request = "{method} {target} HTTP/1.1\r\nHost: {host}:{port}\r\n".format(
+                        method=p_method, target=p_target, host=host, port=port)
+
+                    if p_body is not None:
+                        request += "Content-Type: application/json\r\nContent-Length: {length}\r\n".format(
+                            length=len(p_body))
+
+                    writer.write(request.encode("ascii") + b"\r\n" + (p_body or b""))
+                    await writer.drain()
+
+                    status, body, keep_alive = await self.read_relay_response(p_reader=reader)
+                    return status, body
+
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+
+                    # The relay has closed the idle connection in the meantime -> retry with a new connection
+
+                finally:
+                    if keep_alive:
+                        idle_connections.append((reader, writer))
+
+                    else:
+                        writer.close()
+
+    async def remote_ping_batch(self, p_relay, p_batch):
+        """
+        Lets a relay host ping several hosts with a single request.
+
+        :param p_relay: tuple (relay host, relay port)
+        :param p_batch: dictionary {remote URL: URL to be pinged by the relay}
+        :return: dictionary {remote URL: delay or None} or None if the relay does not support the batch API
+        """
+
+        fmt = "Delegating {count} hosts to remote host {host}:{port}"
+        self._logger.debug(fmt.format(count=len(p_batch), host=p_relay[0], port=p_relay[1]))
+
+        try:
+            status, body = await self.send_relay_request(
+                p_relay=p_relay, p_method="POST", p_target=RELAY_BATCH_API_PATH,
+                p_body=json.dumps({"hosts": list(p_batch.values())}).encode("UTF-8"))
+
+            if status in (HTTP_STATUS_NOT_FOUND, HTTP_STATUS_METHOD_NOT_ALLOWED):
+                self._pinger.set_relay_without_batch_api(p_relay=p_relay)
+                return None
+
+            if status != HTTP_STATUS_OK:
+                raise Exception("Unexpected response status {status}".format(status=status))
+
+            return self._pinger.get_relay_batch_results(p_batch=p_batch, p_delays=json.loads(body))
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            fmt = "Exception during remote ping: {msg}"
+            self._logger.error(fmt.format(msg=str(e)))
+            return {remote_url: None for remote_url in p_batch}
+
+    async def remote_ping(self, p_url, p_default_port):
+
+        if not URL_SEPERATOR in p_url:
+            msg = "No URL separator found in '{url}'!"
+            raise Exception(msg.format(url=p_url))
+
+        try:
+            host, port, _remaining_url = self._pinger.split_remote_url(p_url=p_url, p_default_port=p_default_port)
+            components = urllib.parse.urlsplit(self._pinger.get_remote_ping_url(p_url=p_url,
+                                                                                 p_default_port=p_default_port))
+            status, body = await self.send_relay_request(
+                p_relay=(host, port), p_method="GET",
+                p_target="{path}?{query}".format(path=components.path, query=components.query))
+
+            if status != HTTP_STATUS_OK:
+                raise Exception("Unexpected response status {status}".format(status=status))
+
+            return self._pinger.parse_remote_ping_result(p_text=body.decode("UTF-8"))
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as e:
+            fmt = "Exception during remote ping: {msg}"
+            self._logger.error(fmt.format(msg=str(e)))
+            return None
+
+    async def local_ping(self, p_host):
+
+        if self._pinger.icmp_engine is not None:
+            loop = asyncio.get_running_loop()
+            delay = await loop.run_in_executor(None, self._pinger.icmp_engine.ping, p_host)
+            self._pinger.log_ping_result(p_host=p_host, p_delay=delay)
+            return delay
+
+        command = self._pinger.get_local_ping_command(p_host=p_host)
+        proc = await asyncio.create_subprocess_exec(*command, stdout=asyncio.subprocess.PIPE,
+                                                    env=self._pinger.get_ping_environment())
+
+        try:
+            output, _ = await proc.communicate()
+
+        except asyncio.CancelledError:
+            # e.g. timeout of ping(): do not leave the ping process behind
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+
+            raise
+
+        return self._pinger.parse_local_ping_output(p_host=p_host, p_command=command, p_returncode=proc.returncode,
+                                                    p_output=output)
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+from python_base_app import tools
+
+NANOSECONDS_PER_SECOND = 1000000000
+
+
+def monotonic_ns():
+    return time.monotonic_ns()
+
+
+if hasattr(time, "CLOCK_BOOTTIME"):
+    # Linux: the boot time clock keeps on ticking during a suspend (contrary to the monotonic clock)
+    # but it is not affected by NTP adjustments or manual changes of the wall clock.
+    def reference_clock_ns():
+        return time.clock_gettime_ns(time.CLOCK_BOOTTIME)
+
+else:
+    def reference_clock_ns():
+        return time.time_ns()
+
+
+def seconds_to_ns(p_seconds):
+    return int(p_seconds * NANOSECONDS_PER_SECOND)
+
+
+def ns_to_seconds(p_nanoseconds):
+    return p_nanoseconds / NANOSECONDS_PER_SECOND
+
+
+# Removed entries are only compacted once there are more than that many of them
+MINIMUM_COMPACTION_SIZE = 64
+
+SCHEDULER_STATE_VERSION = 1
+
+
+class TaskHandle(object):
+    """
+    Handle returned to the caller when adding a task. All operations take logarithmic time at most and
+    may be called from any thread.
+    """
+
+    def __init__(self, p_scheduler, p_task):
+
+        self._scheduler = p_scheduler
+        self._task = p_task
+
+    @property
+    def name(self):
+        return self._task.name
+
+    @property
+    def task(self):
+        return self._task
+
+    @property
+    def is_paused(self):
+        return self._task.paused
+
+    @property
+    def is_cancelled(self):
+        return self._task.cancelled
+
+    def cancel(self):
+        self._scheduler.cancel(p_task=self._task)
+
+    def pause(self):
+        self._scheduler.pause(p_task=self._task)
+
+    def resume(self):
+        self._scheduler.resume(p_task=self._task)
+
+    def change_interval(self, p_interval):
+        self._scheduler.change_interval(p_task=self._task, p_interval=p_interval)
+
+
+class Scheduler(object):
+    """
+    Heap of tasks ordered by their monotonic deadline (in nanoseconds). Each heap entry is a list
+    [deadline, sequence number, task] so that the comparison never has to look at the task itself and tasks
+    with identical deadlines are executed in the order in which they were scheduled.
+
+    Tasks are removed from the heap by replacing the task in their entry by None (lazy deletion), so
+    cancelling and rescheduling a task does not require a search or a re-heapification. Delays (see shift())
+    touch all tasks since each of them is limited individually.
+
+    The tasks are expected to provide the attributes `name`, `deadline`, `heap_entry`, `paused` and
+    `cancelled` and the methods `compute_next_execution_time()`, `reset_schedule()`, `shift_deadline()`,
+    `get_deadline_limit()` and `change_interval()`.
+    """
+
+    def __init__(self, p_wakeup_callback=None):
+        """
+        :param p_wakeup_callback: called (outside of the lock) whenever a push changes the next deadline
+        """
+
+        self._wakeup_callback = p_wakeup_callback
+        self._heap = []
+        self._sequence = itertools.count()
+        self._removed_entries = 0
+        self._tasks = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._heap) - self._removed_entries
+
+    def tasks(self):
+
+        with self._lock:
+            return list(self._tasks)
+
+    def get_task(self, p_name):
+
+        with self._lock:
+            for task in self._tasks:
+                if task.name == p_name:
+                    return task
+
+        return None
+
+    def add(self, p_task, p_now=None, p_keep_deadline=False):
+        """
+        :param p_keep_deadline: if True the deadline already set on the task (e.g. restored from a persisted
+                                schedule) is used instead of computing the first execution time
+        """
+
+        with self._lock:
+            self._tasks[p_task] = None
+
+            if not p_keep_deadline or p_task.deadline is None:
+                p_task.compute_next_execution_time(p_now=p_now)
+
+            self.push(p_task=p_task)
+
+        return TaskHandle(p_scheduler=self, p_task=p_task)
+
+    def push(self, p_task):
+
+        with self._lock:
+            if p_task.cancelled or p_task.paused:
+                return
+
+            entry = [p_task.deadline, next(self._sequence), p_task]
+            p_task.heap_entry = entry
+            heapq.heappush(self._heap, entry)
+            new_head = self._heap[0] is entry
+
+        if new_head and self._wakeup_callback is not None:
+            self._wakeup_callback()
+
+    def _remove_entry(self, p_task):
+
+        entry = p_task.heap_entry
+
+        if entry is not None:
+            entry[2] = None
+            p_task.heap_entry = None
+            self._removed_entries += 1
+
+            if self._removed_entries > MINIMUM_COMPACTION_SIZE and self._removed_entries > len(self._heap) // 2:
+                self._heap = [an_entry for an_entry in self._heap if an_entry[2] is not None]
+                heapq.heapify(self._heap)
+                self._removed_entries = 0
+
+    def _purge_removed_entries(self):
+
+        while len(self._heap) > 0 and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._removed_entries -= 1
+
+    def remove(self, p_task):
+
+        with self._lock:
+            self._remove_entry(p_task=p_task)
+            self._tasks.pop(p_task, None)
+
+    def cancel(self, p_task):
+
+        with self._lock:
+            p_task.cancelled = True
+            self.remove(p_task=p_task)
+
+    def pause(self, p_task):
+
+        with self._lock:
+            p_task.paused = True
+            self._remove_entry(p_task=p_task)
+
+    def resume(self, p_task, p_now=None):
+
+        with self._lock:
+            if p_task.paused:
+                p_task.paused = False
+                p_task.reset_schedule()
+                p_task.compute_next_execution_time(p_now=p_now)
+                self.push(p_task=p_task)
+
+    def change_interval(self, p_task, p_interval, p_now=None):
+
+        if p_now is None:
+            p_now = monotonic_ns()
+
+        with self._lock:
+            scheduled = p_task.heap_entry is not None
+            self._remove_entry(p_task=p_task)
+            p_task.change_interval(p_interval=p_interval, p_now=p_now)
+
+            if scheduled:
+                self.push(p_task=p_task)
+
+    def get_next_deadline(self):
+
+        with self._lock:
+            self._purge_removed_entries()
+
+            if len(self._heap) == 0:
+                return None
+
+            return self._heap[0][0]
+
+    def pop_due_task(self, p_now):
+
+        with self._lock:
+            self._purge_removed_entries()
+
+            if len(self._heap) == 0 or self._heap[0][0] > p_now:
+                return None
+
+            entry = heapq.heappop(self._heap)
+            task = entry[2]
+            task.heap_entry = None
+
+            return task
+
+    def shift(self, p_delay, p_now=None):
+        """
+        Postpones all scheduled tasks but never beyond the limit returned by get_deadline_limit() of each task
+        (e.g. one interval from now). Since the limits differ from task to task all entries have to be visited
+        (linear time) which is acceptable as a shift only happens after a downtime.
+
+        :param p_delay: delay in nanoseconds
+        """
+
+        if p_now is None:
+            p_now = monotonic_ns()
+
+        with self._lock:
+            clamped = False
+
+            for entry in self._heap:
+                task = entry[2]
+
+                if task is None:
+                    continue
+
+                deadline = entry[0] + p_delay
+                limit = task.get_deadline_limit(p_now=p_now)
+
+                if limit is not None and deadline > limit:
+                    deadline = limit
+                    clamped = True
+
+                entry[0] = deadline
+                task.shift_deadline(p_shift=deadline - task.deadline)
+
+            # Shifting all entries by the same delay keeps the heap order, clamping may break it
+            if clamped:
+                heapq.heapify(self._heap)
+
+
+class ClockDriftDetector(object):
+    """
+    Compares the progress of the monotonic clock with the progress of a reference clock which also covers
+    phases when the host was suspended. The difference between the two is the time that the process did
+    not get to run at all. Both clocks are immune to jumps of the wall clock.
+    """
+
+    def __init__(self, p_monotonic_clock=monotonic_ns, p_reference_clock=reference_clock_ns):
+
+        self._monotonic_clock = p_monotonic_clock
+        self._reference_clock = p_reference_clock
+        self._latest_monotonic = self._monotonic_clock()
+        self._latest_reference = self._reference_clock()
+
+    def get_drift(self):
+        """
+        :return: the drift in seconds between both clocks since the last call
+        """
+
+        monotonic = self._monotonic_clock()
+        reference = self._reference_clock()
+
+        drift = (reference - self._latest_reference) - (monotonic - self._latest_monotonic)
+
+        self._latest_monotonic = monotonic
+        self._latest_reference = reference
+
+        return ns_to_seconds(drift)
+
+
+class SchedulerStateStore(object):
+    """
+    Small JSON file recording the latest and the next execution of each task as wall clock time (seconds since
+    the epoch) so that a restarted process can continue the schedule instead of executing all tasks at once.
+    The monotonic deadlines cannot be stored themselves since the monotonic clock starts anew with each boot.
+    """
+
+    def __init__(self, p_filename):
+
+        self._filename = p_filename
+
+    @property
+    def filename(self):
+        return self._filename
+
+    def load(self):
+        """
+        :return: dictionary {task name: {"last_run": ..., "next_run": ...}}, empty if there is no file yet
+        """
+
+        if not os.path.exists(self._filename):
+            return {}
+
+        with open(self._filename, "r") as state_file:
+            state = json.load(state_file)
+
+        if state.get("version") != SCHEDULER_STATE_VERSION:
+            return {}
+
+        return state.get("tasks", {})
+
+    def save(self, p_tasks, p_now=None):
+        """
+        Writes the state of the tasks atomically (write to a temporary file and rename it).
+
+        :param p_tasks: tasks providing the attributes `name`, `last_run` and `deadline`
+        :param p_now: value of the monotonic clock in nanoseconds corresponding to the current wall clock time
+        """
+
+        if p_now is None:
+            p_now = monotonic_ns()
+
+        wall_now = time.time()
+        tasks = {}
+
+        for task in p_tasks:
+            next_run = None
+
+            if task.deadline is not None:
+                next_run = wall_now + ns_to_seconds(task.deadline - p_now)
+
+            tasks[task.name] = {"last_run": task.last_run, "next_run": next_run}
+
+        with tools.atomic_write(self._filename) as state_file:
+            json.dump({"version": SCHEDULER_STATE_VERSION, "tasks": tasks}, state_file, indent=2)
@@ -18,6 +18,13 @@
 #    with this program; if not, write to the Free Software Foundation, Inc.,
 #    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
+import bisect
+import threading
+
+DEFAULT_TASK_STATISTICS_SAMPLE_SIZE = 100
+DEFAULT_LATENESS_BUCKET_LIMITS = (0.01, 0.1, 1, 10, 60)  # seconds
+
+
 class MovingAverage(object):
 
     def __init__(self, p_sample_size):
@@ -54,3 +61,170 @@ class MovingAverage(object):
 
         else:
             return 1.0 * self._sum / len(self._values)
+
+
+class StreamingQuantile(object):
+    """
+    Estimates a quantile of a stream of values using the P² algorithm by Jain and Chlamtac (1985).
+    Only five markers are kept, so the memory consumption does not depend on the number of values.
+    """
+
+    def __init__(self, p_quantile):
+
+        self._quantile = p_quantile
+        self._heights = []
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired_positions = [1, 1 + 2 * p_quantile, 1 + 4 * p_quantile, 3 + 2 * p_quantile, 5]
+        self._increments = [0, p_quantile / 2, p_quantile, (1 + p_quantile) / 2, 1]
+
+    def _parabolic(self, i, d):
+
+        q = self._heights
+        n = self._positions
+
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    def _linear(self, i, d):
+
+        q = self._heights
+        n = self._positions
+
+        return q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+
+    def add_value(self, p_value):
+
+        q = self._heights
+        n = self._positions
+
+        if len(q) < 5:
+            q.append(p_value)
+            q.sort()
+            return
+
+        if p_value < q[0]:
+            q[0] = p_value
+            k = 0
+
+        elif p_value >= q[4]:
+            q[4] = p_value
+            k = 3
+
+        else:
+            k = 0
+
+            while p_value >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+
+        for i in range(5):
+            self._desired_positions[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired_positions[i] - n[i]
+
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                new_height = self._parabolic(i, d)
+
+                if not q[i - 1] < new_height < q[i + 1]:
+                    new_height = self._linear(i, d)
+
+                q[i] = new_height
+                n[i] += d
+
+    def get_value(self, p_default=None):
+
+        if len(self._heights) == 0:
+            return p_default
+
+        if len(self._heights) < 5:
+            return self._heights[int(round(self._quantile * (len(self._heights) - 1)))]
+
+        return self._heights[2]
+
+
+class Histogram(object):
+
+    def __init__(self, p_bucket_limits):
+
+        self._bucket_limits = tuple(sorted(p_bucket_limits))
+        self._counts = [0] * (len(self._bucket_limits) + 1)
+
+    def add_value(self, p_value):
+
+        self._counts[bisect.bisect_left(self._bucket_limits, p_value)] += 1
+
+    def get_counts(self):
+
+        counts = {}
+
+        for limit, count in zip(self._bucket_limits, self._counts):
+            counts["<={limit}".format(limit=limit)] = count
+
+        counts[">{limit}".format(limit=self._bucket_limits[-1])] = self._counts[-1]
+
+        return counts
+
+
+class TaskStatistics(object):
+    """
+    Runtime statistics of a recurring task. All structures have a fixed size independent of the number
+    of executions. The values may be updated by several worker threads.
+    """
+
+    def __init__(self, p_sample_size=DEFAULT_TASK_STATISTICS_SAMPLE_SIZE,
+                 p_lateness_bucket_limits=DEFAULT_LATENESS_BUCKET_LIMITS):
+
+        self._lock = threading.Lock()
+        self._execution_count = 0
+        self._exception_count = 0
+        self._skipped_count = 0
+        self._last_runtime = None
+        self._max_runtime = None
+        self._runtimes = MovingAverage(p_sample_size=p_sample_size)
+        self._runtime_p95 = StreamingQuantile(p_quantile=0.95)
+        self._lateness = Histogram(p_bucket_limits=p_lateness_bucket_limits)
+
+    def add_lateness(self, p_lateness):
+
+        with self._lock:
+            self._lateness.add_value(p_lateness)
+
+    def add_skipped_execution(self):
+
+        with self._lock:
+            self._skipped_count += 1
+
+    def add_execution(self, p_runtime, p_failed=False):
+
+        with self._lock:
+            self._execution_count += 1
+
+            if p_failed:
+                self._exception_count += 1
+
+            self._last_runtime = p_runtime
+
+            if self._max_runtime is None or p_runtime > self._max_runtime:
+                self._max_runtime = p_runtime
+
+            self._runtimes.add_value(p_runtime)
+            self._runtime_p95.add_value(p_runtime)
+
+    def get_summary(self):
+
+        with self._lock:
+            return {
+                "execution_count": self._execution_count,
+                "exception_count": self._exception_count,
+                "skipped_count": self._skipped_count,
+                "last_runtime": self._last_runtime,
+                "mean_runtime": self._runtimes.get_value(),
+                "p95_runtime": self._runtime_p95.get_value(),
+                "max_runtime": self._max_runtime,
+                "lateness": self._lateness.get_counts(),
+            }
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import select
+import signal
+import socket
+import sys
+import time
+import zlib
+
+from python_base_app import log_handling
+from python_base_app import tools
+
+DEFAULT_MINIMUM_RESTART_DELAY = 1  # seconds
+DEFAULT_MAXIMUM_RESTART_DELAY = 60  # seconds
+
+# A worker running at least that long is considered healthy again and is restarted without delay
+STABLE_WORKER_RUNTIME = 60  # seconds
+
+EXIT_CODE_WORKER_EXCEPTION = 1
+
+WAKEUP_BUFFER_SIZE = 1024
+
+
+def get_worker_pid_file(p_pid_file, p_worker_index):
+
+    if p_pid_file is None:
+        return None
+
+    return "%s.%d" % (p_pid_file, p_worker_index)
+
+
+def get_shard(p_name, p_shard_count):
+    """
+    Returns the index of the worker responsible for a name. The CRC is stable across processes and runs
+    (contrary to hash() which is salted per process).
+    """
+
+    return zlib.crc32(p_name.encode("utf-8")) % p_shard_count
+
+
+class WorkerState(object):
+
+    def __init__(self, p_index):
+
+        self.index = p_index
+        self.pid = None
+        self.start_time = None
+        self.restart_delay = 0
+        self.restart_time = 0
+        self.restart_requested = False
+
+
+class Supervisor(object):
+    """
+    Forks a fixed number of worker processes, restarts crashed workers with an exponential backoff and
+    forwards SIGTERM, SIGINT and SIGHUP to all workers. Workers terminated by SIGHUP are restarted
+    immediately so that a SIGHUP amounts to a rolling restart.
+    """
+
+    def __init__(self, p_worker_count, p_worker_method,
+                 p_minimum_restart_delay=DEFAULT_MINIMUM_RESTART_DELAY,
+                 p_maximum_restart_delay=DEFAULT_MAXIMUM_RESTART_DELAY):
+        """
+        :param p_worker_method: method called in the forked process with the worker index as parameter,
+                                returns the exit code of the worker
+        """
+
+        self._logger = log_handling.get_logger(self.__class__.__name__)
+        self._worker_count = p_worker_count
+        self._worker_method = p_worker_method
+        self._minimum_restart_delay = p_minimum_restart_delay
+        self._maximum_restart_delay = p_maximum_restart_delay
+        self._workers = [WorkerState(p_index=index) for index in range(p_worker_count)]
+        self._done = False
+        # Socket pair written to by the signal handlers (see run()). A threading.Event must not be used since its
+        # lock may be held by the interrupted main loop.
+        self._wakeup_receiver = None
+        self._wakeup_sender = None
+        self._forwarded_signals = [signal.SIGTERM, signal.SIGINT, signal.SIGHUP]
+
+    @property
+    def worker_pids(self):
+        return [worker.pid for worker in self._workers if worker.pid is not None]
+
+    def start_worker(self, p_worker):
+
+        # Make sure that buffered output is not written twice
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        pid = os.fork()
+
+        if pid == 0:
+            exit_code = EXIT_CODE_WORKER_EXCEPTION
+
+            try:
+                for signal_id in self._forwarded_signals + [signal.SIGCHLD]:
+                    signal.signal(signal_id, signal.SIG_DFL)
+
+                self.close_wakeup_sockets()
+
+                exit_code = self._worker_method(p_worker.index)
+
+            except BaseException as e:
+                fmt = "Exception '{msg}' in worker {index}"
+                self._logger.error(fmt.format(msg=str(e), index=p_worker.index))
+                tools.log_stack_trace(p_logger=self._logger)
+
+            finally:
+                # Never return into the code of the supervisor and do not execute its atexit handlers
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exit_code or 0)
+
+        p_worker.pid = pid
+        p_worker.start_time = time.monotonic()
+
+        fmt = "Started worker {index} with pid {pid}"
+        self._logger.info(fmt.format(index=p_worker.index, pid=pid))
+
+    def handle_signal(self, p_signum, p_stackframe):
+
+        _ = p_stackframe
+
+        if p_signum == signal.SIGCHLD:
+            self.send_wakeup()
+            return
+
+        if p_signum == signal.SIGHUP:
+            for worker in self._workers:
+                worker.restart_requested = worker.pid is not None
+
+        else:
+            self._done = True
+
+        self.forward_signal(p_signum=p_signum)
+        self.send_wakeup()
+
+    def create_wakeup_sockets(self):
+
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self._wakeup_receiver.setblocking(False)
+        self._wakeup_sender.setblocking(False)
+
+    def send_wakeup(self):
+
+        try:
+            self._wakeup_sender.send(b"\0")
+
+        except (BlockingIOError, InterruptedError):
+            # the main loop has not consumed the previous wakeups yet -> it will wake up anyway
+            pass
+
+    def clear_wakeups(self):
+
+        try:
+            while len(self._wakeup_receiver.recv(WAKEUP_BUFFER_SIZE)) > 0:
+                pass
+
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def close_wakeup_sockets(self):
+
+        if self._wakeup_receiver is not None:
+            self._wakeup_receiver.close()
+            self._wakeup_sender.close()
+            self._wakeup_receiver = None
+            self._wakeup_sender = None
+
+    def forward_signal(self, p_signum):
+
+        for pid in self.worker_pids:
+            try:
+                os.kill(pid, p_signum)
+
+            except ProcessLookupError:
+                pass
+
+    def reap_workers(self):
+
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+
+            except ChildProcessError:
+                return
+
+            if pid == 0:
+                return
+
+            for worker in self._workers:
+                if worker.pid == pid:
+                    self.handle_worker_exit(p_worker=worker, p_status=status)
+
+    def handle_worker_exit(self, p_worker, p_status):
+
+        runtime = time.monotonic() - p_worker.start_time
+        p_worker.pid = None
+        restart_requested = p_worker.restart_requested
+        p_worker.restart_requested = False
+
+        fmt = "Worker {index} terminated with status {status} after {runtime:.1f} seconds"
+        self._logger.info(fmt.format(index=p_worker.index, status=p_status, runtime=runtime))
+
+        if self._done:
+            return
+
+        if restart_requested or runtime >= STABLE_WORKER_RUNTIME:
+            p_worker.restart_delay = 0
+
+        else:
+            p_worker.restart_delay = min(self._maximum_restart_delay,
+                                         max(self._minimum_restart_delay, 2 * p_worker.restart_delay))
+
+        p_worker.restart_time = time.monotonic() + p_worker.restart_delay
+
+        if p_worker.restart_delay > 0:
+            fmt = "Restarting worker {index} in {delay} seconds"
+            self._logger.warning(fmt.format(index=p_worker.index, delay=p_worker.restart_delay))
+
+    def run(self):
+
+        fmt = "Starting supervisor with {count} worker processes"
+        self._logger.info(fmt.format(count=self._worker_count))
+
+        self.create_wakeup_sockets()
+
+        for signal_id in self._forwarded_signals + [signal.SIGCHLD]:
+            signal.signal(signal_id, self.handle_signal)
+
+        for worker in self._workers:
+            self.start_worker(p_worker=worker)
+
+        while True:
+            # Clear the wakeups before reaping so that no exit of a worker can get lost
+            self.clear_wakeups()
+            self.reap_workers()
+
+            if self._done and len(self.worker_pids) == 0:
+                break
+
+            timeout = None
+
+            if not self._done:
+                now = time.monotonic()
+
+                for worker in self._workers:
+                    if worker.pid is None:
+                        if worker.restart_time <= now:
+                            self.start_worker(p_worker=worker)
+
+                        else:
+                            wait = worker.restart_time - now
+                            timeout = wait if timeout is None else min(timeout, wait)
+
+            select.select([self._wakeup_receiver], [], [], timeout)
+
+        for signal_id in self._forwarded_signals + [signal.SIGCHLD]:
+            signal.signal(signal_id, signal.SIG_DFL)
+
+        self.close_wakeup_sockets()
+
+        self._logger.info("All workers terminated")
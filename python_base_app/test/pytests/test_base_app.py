@@ -0,0 +1,706 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import json
+import os
+import select
+import signal
+import threading
+import time
+
+import pytest
+
+from python_base_app import base_app
+from python_base_app import config_cache
+from python_base_app import config_validator
+from python_base_app import configuration
+from python_base_app import scheduler
+from python_base_app import supervisor
+from python_base_app import tools
+
+APP_NAME = "test_app"
+
+
+@pytest.fixture
+def default_app():
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(["--single-run"])
+    return base_app.BaseApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+
+
+def test_event_queue_inline(default_app):
+    calls = []
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="inline", p_handler_method=lambda: calls.append(1)))
+
+    default_app.event_queue()
+
+    assert calls == [1]
+
+
+def test_event_queue_thread_pool(default_app):
+    calls = []
+    default_app._app_config.task_worker_count = 2
+    default_app.add_recurring_task(base_app.RecurringTask(
+        p_name="pooled", p_handler_method=lambda: calls.append(threading.current_thread().name)))
+
+    default_app.event_queue()
+
+    assert len(calls) == 1
+    assert calls[0].startswith(base_app.TASK_THREAD_NAME_PREFIX)
+
+
+def test_thread_pool_skips_active_task(default_app):
+    release = threading.Event()
+    calls = []
+
+    def blocking_handler():
+        calls.append(1)
+        release.wait(5)
+
+    default_app._app_config.task_worker_count = 2
+    task = base_app.RecurringTask(p_name="blocking", p_handler_method=blocking_handler)
+    default_app.start_task_executor()
+
+    default_app.dispatch_task(p_task=task, p_delay=0)
+    default_app.dispatch_task(p_task=task, p_delay=0)
+    release.set()
+    default_app.stop_task_executor()
+
+    assert calls == [1]
+    assert task.active_runs == 0
+
+
+def test_thread_pool_propagates_exception(default_app):
+
+    def failing_handler():
+        raise ValueError("failed")
+
+    default_app._app_config.task_worker_count = 1
+    default_app.start_task_executor()
+    default_app.dispatch_task(p_task=base_app.RecurringTask(p_name="failing", p_handler_method=failing_handler),
+                              p_delay=0)
+    default_app.stop_task_executor()
+
+    with pytest.raises(ValueError):
+        default_app.raise_pending_task_exception()
+
+
+def test_thread_pool_raises_exception_in_single_run(default_app):
+
+    def failing_handler():
+        raise ValueError("failed")
+
+    default_app._app_config.task_worker_count = 1
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="failing", p_handler_method=failing_handler))
+
+    with pytest.raises(ValueError):
+        default_app.event_queue()
+
+    assert default_app._task_executor is None
+
+
+def test_asyncio_event_queue(default_app):
+    calls = []
+
+    async def coroutine_handler():
+        calls.append("coroutine")
+
+    def sync_handler():
+        calls.append(threading.current_thread() is threading.main_thread())
+
+    default_app._app_config.asyncio_event_loop = True
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="coroutine", p_handler_method=coroutine_handler))
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="sync", p_handler_method=sync_handler))
+
+    default_app.event_queue()
+
+    assert sorted(calls, key=str) == [False, "coroutine"]
+
+
+def test_asyncio_event_queue_restores_signal_handlers(default_app):
+
+    def previous_handler(p_signum, p_stackframe):
+        pass
+
+    original_handler = signal.signal(signal.SIGTERM, previous_handler)
+
+    try:
+        default_app._app_config.asyncio_event_loop = True
+        default_app.add_recurring_task(base_app.RecurringTask(p_name="noop", p_handler_method=lambda: None))
+        default_app.event_queue()
+
+        assert signal.getsignal(signal.SIGTERM) is previous_handler
+
+    finally:
+        signal.signal(signal.SIGTERM, original_handler)
+
+
+def test_task_statistics(default_app):
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="measured", p_handler_method=lambda: None))
+
+    default_app.event_queue()
+
+    summary = default_app.get_task_statistics()["measured"]
+    assert summary["execution_count"] == 1
+    assert summary["exception_count"] == 0
+    assert summary["last_runtime"] is not None
+
+
+@pytest.mark.parametrize("execution_mode", ["inline", "thread_pool", "asyncio_sync", "asyncio_coroutine"])
+def test_failing_task_bookkeeping_is_identical_in_all_execution_modes(default_app, execution_mode):
+
+    def failing_handler():
+        raise ValueError("failed")
+
+    async def failing_coroutine():
+        raise ValueError("failed")
+
+    if execution_mode == "thread_pool":
+        default_app._app_config.task_worker_count = 1
+
+    elif execution_mode.startswith("asyncio"):
+        default_app._app_config.asyncio_event_loop = True
+
+    handler_method = failing_coroutine if execution_mode == "asyncio_coroutine" else failing_handler
+    task = base_app.RecurringTask(p_name="failing", p_handler_method=handler_method, p_ignore_exceptions=True)
+    default_app.add_recurring_task(task)
+
+    default_app.event_queue()
+
+    summary = default_app.get_task_statistics()["failing"]
+    assert summary["execution_count"] == 1
+    assert summary["exception_count"] == 1
+    assert task.active_runs == 0
+
+
+def test_task_handle(default_app):
+    calls = []
+    handle = default_app.add_recurring_task(base_app.RecurringTask(p_name="handled",
+                                                                   p_handler_method=lambda: calls.append(1)))
+
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="other", p_handler_method=lambda: None))
+
+    assert default_app.get_task_handle(p_name="handled").task is handle.task
+    handle.cancel()
+
+    default_app.event_queue()
+
+    assert calls == []
+    assert default_app.get_task_handle(p_name="handled") is None
+
+
+@pytest.mark.parametrize("asyncio_event_loop", [False, True])
+def test_post_wakes_up_event_queue(default_app, asyncio_event_loop):
+    calls = []
+    default_app._app_config.asyncio_event_loop = asyncio_event_loop
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="yearly", p_handler_method=lambda: None,
+                                                          p_cron_expression="@yearly"))
+
+    def post_from_other_thread():
+        calls.append(threading.current_thread().name)
+        default_app.post(lambda: calls.append(threading.current_thread() is threading.main_thread()))
+
+    timer = threading.Timer(0.2, post_from_other_thread)
+    timer.start()
+
+    default_app.event_queue()
+    timer.join()
+
+    assert calls[1:] == [True]
+
+
+def test_new_earlier_task_wakes_up_event_queue(default_app):
+    calls = []
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="yearly", p_handler_method=lambda: None,
+                                                          p_cron_expression="@yearly"))
+
+    timer = threading.Timer(0.2, lambda: default_app.add_recurring_task(
+        base_app.RecurringTask(p_name="new", p_handler_method=lambda: calls.append(1))))
+    timer.start()
+
+    default_app.event_queue()
+    timer.join()
+
+    assert calls == [1]
+
+
+def test_coroutine_task_wakes_up_asyncio_event_queue():
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args([])
+    app = base_app.BaseApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+    app._app_config.asyncio_event_loop = True
+    calls = []
+
+    def job():
+        calls.append(1)
+        app.stop_event_queue()
+
+    async def submitting_handler():
+        app.submit(job)
+
+    app.add_recurring_task(base_app.RecurringTask(p_name="submitting", p_handler_method=submitting_handler,
+                                                  p_interval=30))
+    timer = threading.Timer(5, app.stop_event_queue)
+    timer.start()
+    start_time = time.monotonic()
+
+    app.event_queue()
+    timer.cancel()
+
+    assert calls == [1]
+    assert time.monotonic() - start_time < 3
+
+
+@pytest.mark.parametrize("task_worker_count", [0, 2])
+def test_submit(default_app, task_worker_count):
+    default_app._app_config.task_worker_count = task_worker_count
+
+    def failing_function():
+        raise ValueError("failed")
+
+    result = default_app.submit(lambda a, b: a + b, 1, b=2)
+    failure = default_app.submit(failing_function)
+
+    default_app.event_queue()
+
+    assert result.result(timeout=1) == 3
+    assert isinstance(failure.exception(timeout=1), ValueError)
+    assert len(default_app._scheduler) == 0
+    assert default_app.get_task_statistics() == {}
+
+
+def test_schedule_once_in_asyncio_event_loop(default_app):
+    async def coroutine_function(p_value):
+        return p_value
+
+    default_app._app_config.asyncio_event_loop = True
+    result = default_app.schedule_once(0, coroutine_function, 42)
+
+    default_app.event_queue()
+
+    assert result.result(timeout=1) == 42
+
+
+def test_cancel_scheduled_once(default_app):
+    calls = []
+    future = default_app.schedule_once(3600, lambda: calls.append(1))
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="other", p_handler_method=lambda: None))
+
+    assert future.cancel()
+
+    default_app.event_queue()
+
+    assert calls == []
+    assert [task.name for task in default_app._scheduler.tasks()] == ["other"]
+
+
+def test_persist_scheduler_state(default_app, tmp_path):
+    default_app._app_config.persist_scheduler_state = True
+    default_app._app_config.spool_dir = str(tmp_path)
+    default_app.add_recurring_task(base_app.RecurringTask(p_name="persisted", p_handler_method=lambda: None,
+                                                          p_interval=3600))
+
+    default_app.event_queue()
+
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(["--single-run"])
+    restarted_app = base_app.BaseApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments,
+                                     p_dir_name=APP_NAME)
+    restarted_app._app_config.persist_scheduler_state = True
+    restarted_app._app_config.spool_dir = str(tmp_path)
+    task = base_app.RecurringTask(p_name="persisted", p_handler_method=lambda: None, p_interval=3600)
+
+    restarted_app.add_recurring_task(task)
+
+    # the task is not executed again right after the restart
+    assert task.last_run is not None
+    assert scheduler.ns_to_seconds(task.deadline - scheduler.monotonic_ns()) > 3500
+
+
+def test_downtime_does_not_postpone_beyond_interval(default_app):
+    task = base_app.RecurringTask(p_name="short", p_handler_method=lambda: None, p_interval=10)
+    default_app.add_recurring_task(task)
+
+    default_app.track_downtime(p_downtime=3600)
+
+    assert scheduler.ns_to_seconds(default_app._scheduler.get_next_deadline() - scheduler.monotonic_ns()) <= 10
+
+
+def persist_next_run(p_app, p_tmp_path, p_name, p_next_run):
+    p_app._app_config.persist_scheduler_state = True
+    p_app._app_config.spool_dir = str(p_tmp_path)
+    store = p_app.get_scheduler_state_store()
+
+    with open(store.filename, "w") as state_file:
+        json.dump({"version": scheduler.SCHEDULER_STATE_VERSION,
+                   "tasks": {p_name: {"last_run": time.time() - 100, "next_run": p_next_run}}}, state_file)
+
+
+@pytest.mark.parametrize("p_fixed_schedule", [False, True])
+def test_restore_near_due_task(default_app, tmp_path, p_fixed_schedule):
+    persist_next_run(p_app=default_app, p_tmp_path=tmp_path, p_name="near", p_next_run=time.time() + 30)
+    task = base_app.RecurringTask(p_name="near", p_handler_method=lambda: None, p_interval=3600,
+                                  p_fixed_schedule=p_fixed_schedule)
+
+    default_app.add_recurring_task(task)
+
+    assert 25 < scheduler.ns_to_seconds(default_app._scheduler.get_next_deadline() - scheduler.monotonic_ns()) <= 30
+
+
+def test_restore_stale_task(default_app, tmp_path):
+    persist_next_run(p_app=default_app, p_tmp_path=tmp_path, p_name="stale", p_next_run=time.time() - 7200)
+    task = base_app.RecurringTask(p_name="stale", p_handler_method=lambda: None, p_interval=3600,
+                                  p_fixed_schedule=True)
+
+    default_app.add_recurring_task(task)
+
+    # spread over one interval instead of waiting for a complete interval
+    assert scheduler.ns_to_seconds(default_app._scheduler.get_next_deadline() - scheduler.monotonic_ns()) <= 3600
+    assert task.base_deadline == task.deadline
+
+
+def test_worker_shards_recurring_tasks(default_app):
+    default_app._app_config.worker_processes = 2
+    default_app._worker_index = 1
+    names = ["task%d" % i for i in range(10)]
+
+    handles = [default_app.add_recurring_task(base_app.RecurringTask(p_name=name, p_handler_method=lambda: None))
+               for name in names]
+
+    assert not default_app.is_primary_worker
+    assert [handle.name for handle in handles if handle is not None] == \
+           [name for name in names if supervisor.get_shard(p_name=name, p_shard_count=2) == 1]
+
+
+@pytest.mark.skipif(tools.is_windows(), reason="requires fork()")
+def test_workers_have_their_own_wakeup_sockets(default_app):
+
+    def run():
+        exit_code = 1
+
+        try:
+            if default_app._worker_index == 0:
+                # give the other worker time to start listening
+                time.sleep(0.2)
+                received = 0
+
+                for _ in range(20):
+                    default_app.send_wakeup()
+                    # e.g. sent by another thread while the event queue is busy
+                    time.sleep(0.02)
+                    readable, _writable, _exceptional = select.select([default_app._wakeup_receiver], [], [], 0.5)
+                    received += len(readable)
+                    default_app.clear_wakeups()
+
+                exit_code = 0 if received == 20 else 1
+
+            else:
+                end_time = time.monotonic() + 2
+
+                while time.monotonic() < end_time:
+                    default_app.wait_for_wakeup(p_timeout=0.1)
+                    default_app.clear_wakeups()
+
+                exit_code = 0
+
+        finally:
+            os._exit(exit_code)
+
+    default_app.run = run
+    pids = []
+
+    for worker_index in range(2):
+        pid = os.fork()
+
+        if pid == 0:
+            default_app.run_worker(p_worker_index=worker_index)
+
+        pids.append(pid)
+
+    assert [os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) for pid in pids] == [0, 0]
+
+
+class ReloadingApp(base_app.BaseApp):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reevaluated_sections = {}
+
+    @staticmethod
+    def configuration_factory():
+        config = configuration.Configuration()
+        config.add_section(base_app.BaseAppConfigModel(p_section_name=APP_NAME))
+        return config
+
+    def reevaluate_configuration_section(self, p_section_name, p_section, p_changes):
+        self.reevaluated_sections[p_section_name] = p_changes
+
+
+def create_reloading_app(p_config_file):
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(
+        ["--single-run", "--config", str(p_config_file)])
+    return ReloadingApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+
+
+def test_check_configuration_reports_all_errors(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nminimum_downtime_duration=abc\nmaximum_timer_slack=x\n")
+    app = create_reloading_app(p_config_file=config_file)
+
+    with pytest.raises(configuration.ConfigurationException, match="Found 2 error"):
+        app.check_configuration()
+
+    config_file.write_text("[test_app]\nminimum_downtime_duration=3\n")
+    assert app.check_configuration()[APP_NAME].minimum_downtime_duration == 3
+
+
+class ExtraConfigModel(configuration.ConfigModel):
+
+    def __init__(self):
+        super().__init__(p_section_name="Extra")
+        self.value = 1
+
+
+class PreparingApp(ReloadingApp):
+
+    def prepare_configuration(self, p_configuration):
+        p_configuration.add_section(ExtraConfigModel())
+        return super().prepare_configuration(p_configuration)
+
+
+def test_check_configuration_uses_prepare_configuration(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\n[Extra]\nvalue=5\n")
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(
+        ["--single-run", "--config", str(config_file)])
+    app = PreparingApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+
+    assert app.check_configuration()["Extra"].value == 5
+
+    config_file.write_text("[test_app]\n[Extra]\nvalue=x\n")
+
+    with pytest.raises(configuration.ConfigurationException, match="Found 1 error"):
+        app.check_configuration()
+
+
+def test_reload_configuration(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nminimum_downtime_duration=30\n")
+    app = create_reloading_app(p_config_file=config_file)
+    app.load_configuration()
+    app_config = app._app_config
+
+    assert app.reload_configuration() == {}
+
+    config_file.write_text("[test_app]\nminimum_downtime_duration=40\nmaximum_timer_slack=7\n")
+    changes = app.reload_configuration()
+
+    assert app._app_config is app_config
+    assert app_config.minimum_downtime_duration == 40
+    assert app.reevaluated_sections == {APP_NAME: {"minimum_downtime_duration": (30, 40),
+                                                   "maximum_timer_slack": (base_app.DEFAULT_MAXIMUM_TIMER_SLACK, 7)}}
+    assert changes == app.reevaluated_sections
+
+    # invalid configurations are not applied
+    config_file.write_text("[test_app]\nminimum_downtime_duration=abc\n")
+    assert app.reload_configuration() == {}
+    assert app_config.minimum_downtime_duration == 40
+
+
+@pytest.mark.skipif(tools.is_windows(), reason="requires SIGHUP")
+def test_reload_configuration_on_sighup(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nreload_configuration_on_sighup=1\n")
+    app = create_reloading_app(p_config_file=config_file)
+    app.load_configuration()
+    app.add_recurring_task(base_app.RecurringTask(p_name="yearly", p_handler_method=lambda: None,
+                                                  p_cron_expression="@yearly"))
+    config_file.write_text("[test_app]\nreload_configuration_on_sighup=1\nmaximum_timer_slack=7\n")
+    previous_handlers = {signal_id: signal.getsignal(signal_id) for signal_id in app._active_signals}
+
+    try:
+        app.install_handlers()
+        timer = threading.Timer(0.2, os.kill, (os.getpid(), signal.SIGHUP))
+        timer.start()
+        app.event_queue()
+        timer.join()
+
+    finally:
+        for signal_id, handler in previous_handlers.items():
+            signal.signal(signal_id, handler)
+
+    assert app._app_config.maximum_timer_slack == 7
+    assert list(app.reevaluated_sections) == [APP_NAME]
+
+
+def test_sighup_only_requests_reload(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nreload_configuration_on_sighup=1\n")
+    app = create_reloading_app(p_config_file=config_file)
+    app.load_configuration()
+    config_file.write_text("[test_app]\nreload_configuration_on_sighup=1\nmaximum_timer_slack=7\n")
+    thread_count = threading.active_count()
+
+    app.handle_signal(p_signum=signal.SIGHUP, p_stackframe=None)
+
+    assert threading.active_count() == thread_count
+    assert app._app_config.maximum_timer_slack != 7
+
+    app.execute_due_tasks(p_dispatch_method=app.dispatch_task)
+    assert app._app_config.maximum_timer_slack == 7
+
+
+class RemovingApp(ReloadingApp):
+
+    with_extra_section = True
+
+    def prepare_configuration(self, p_configuration):
+
+        if self.with_extra_section:
+            p_configuration.add_section(ExtraConfigModel())
+
+        return super().prepare_configuration(p_configuration)
+
+
+def test_reload_reports_removed_sections(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\n")
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(
+        ["--single-run", "--config", str(config_file)])
+    app = RemovingApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+    app.load_configuration()
+
+    app.with_extra_section = False
+    changes = app.reload_configuration()
+
+    assert changes == {"Extra": {"value": (1, None)}}
+    assert app.reevaluated_sections == changes
+    assert not app._config.section_exists("Extra")
+
+
+def test_changed_configuration_files_are_validated(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nminimum_downtime_duration=30\n")
+    app = create_reloading_app(p_config_file=config_file)
+    app.load_configuration()
+
+    config_file.write_text("[test_app]\nminimum_downtime_duration=abc\n")
+    app.handle_changed_configuration_files(p_filenames=[str(config_file)])
+    assert len(app._posted_callbacks) == 0
+
+    config_file.write_text("[test_app]\nminimum_downtime_duration=40\n")
+    app.handle_changed_configuration_files(p_filenames=[str(config_file)])
+
+    # the validated configuration is applied, not the file changed in the meantime
+    config_file.write_text("[test_app]\nminimum_downtime_duration=abc\n")
+    app.execute_posted_callbacks()
+    assert app._app_config.minimum_downtime_duration == 40
+
+
+def test_changed_configuration_files_use_prepare_configuration(tmp_path):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\n[Extra]\nvalue=5\n")
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(
+        ["--single-run", "--config", str(config_file)])
+    app = PreparingApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+    app.load_configuration()
+    app_config = app._app_config
+
+    config_file.write_text("[test_app]\n[Extra]\nvalue=6\n")
+    app.handle_changed_configuration_files(p_filenames=[str(config_file)])
+    assert app._app_config is app_config
+
+    app.execute_posted_callbacks()
+    assert app._config["Extra"].value == 6
+    assert list(app.reevaluated_sections) == ["Extra"]
+
+
+def test_configuration_cache_key_covers_schema_and_version():
+
+    def get_key(p_section, p_application_version=None):
+        config = configuration.Configuration()
+        config.add_section(p_section)
+        return config_cache.ConfigurationCache.get_key(p_filenames=[], p_environment={}, p_cmd_line_options=[],
+                                                       p_configuration=config,
+                                                       p_application_version=p_application_version)
+
+    key = get_key(ExtraConfigModel())
+
+    changed_default = ExtraConfigModel()
+    changed_default.value = 2
+    changed_type = ExtraConfigModel()
+    changed_type.value = "1"
+
+    assert get_key(ExtraConfigModel()) == key
+    assert get_key(changed_default) != key
+    assert get_key(changed_type) != key
+    assert get_key(ExtraConfigModel(), p_application_version="1.2.3") != key
+
+
+def test_configuration_cache(tmp_path, monkeypatch):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nminimum_downtime_duration=30\n")
+    cache_directory = tmp_path / "cache"
+
+    def create_app():
+        arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(
+            ["--config", str(config_file), "--config-cache", str(cache_directory),
+             "--option", "test_app.maximum_timer_slack=7"])
+        return ReloadingApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+
+    app = create_app()
+    app.load_configuration()
+
+    # plain JSON instead of a pickle file which could execute code when it is loaded
+    with open(cache_directory / "configuration.cache") as cache_file:
+        assert json.load(cache_file)["snapshot"]["values"][APP_NAME]["maximum_timer_slack"] == "7"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("configuration file parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(configuration.Configuration, "read_config_file", fail)
+        cached_app = create_app()
+        cached_app.load_configuration()
+
+    assert cached_app._app_config.minimum_downtime_duration == 30
+    assert cached_app._app_config.maximum_timer_slack == 7
+
+    # a changed file invalidates the cache
+    config_file.write_text("[test_app]\nminimum_downtime_duration=40\n")
+    changed_app = create_app()
+    changed_app.load_configuration()
+    assert changed_app._app_config.minimum_downtime_duration == 40
+
+
+def test_check_configuration_uses_cache(tmp_path, monkeypatch):
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nminimum_downtime_duration=30\n")
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(
+        ["--config", str(config_file), "--config-cache", str(tmp_path / "cache")])
+
+    def create_app():
+        return ReloadingApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+
+    create_app().check_configuration()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("configuration file validated again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(config_validator.ConfigurationValidator, "validate_files", fail)
+        assert create_app().check_configuration()[APP_NAME].minimum_downtime_duration == 30
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import hashlib
+import http.server
+import json
+import threading
+
+import pytest
+
+from python_base_app import base_app
+from python_base_app import config_provider
+from python_base_app import configuration
+
+APP_NAME = "test_app"
+
+
+class ConfigurationRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+
+        server = self.server
+        body = json.dumps(server.document).encode()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        server.requests.append(self.headers.get("If-None-Match"))
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def configuration_server():
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), ConfigurationRequestHandler)
+    server.document = {APP_NAME: {"minimum_downtime_duration": 33, "debug_mode": True}}
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = "http://127.0.0.1:%d/config" % server.server_address[1]
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_raw_settings():
+
+    settings = config_provider.get_raw_settings({"Section": {"hosts": ["a", "b"], "flag": False, "none": None}})
+
+    assert settings == {"Section": {"hosts[0]": "a", "hosts[1]": "b", "flag": "False"}}
+
+    with pytest.raises(configuration.ConfigurationException):
+        config_provider.get_raw_settings({"Section": 1})
+
+
+def test_percent_signs_are_literals():
+
+    config = configuration.Configuration()
+    config.add_section(base_app.BaseAppConfigModel(p_section_name=APP_NAME))
+    settings = config_provider.get_raw_settings({APP_NAME: {"environment_prefix": "ab%cd%(x)s"}})
+
+    config.read_settings(p_settings=settings, p_source=configuration.API_OPTION_SOURCE)
+
+    assert config[APP_NAME].environment_prefix == "ab%cd%(x)s"
+
+
+def test_conditional_requests_and_cache_fallback(configuration_server, tmp_path):
+
+    provider = config_provider.HttpJsonConfigurationProvider(p_url=configuration_server.url,
+                                                             p_cache_directory=str(tmp_path))
+
+    settings, changed = provider.fetch()
+    assert changed
+    assert settings == {APP_NAME: {"minimum_downtime_duration": "33", "debug_mode": "True"}}
+
+    assert provider.fetch() == (settings, False)
+    assert configuration_server.requests[0] is None
+    assert configuration_server.requests[1] is not None
+
+    configuration_server.document[APP_NAME]["minimum_downtime_duration"] = 44
+    settings, changed = provider.fetch()
+    assert changed
+    assert settings[APP_NAME]["minimum_downtime_duration"] == "44"
+
+    configuration_server.shutdown()
+    configuration_server.server_close()
+
+    assert provider.fetch() == (settings, False)
+
+    offline_provider = config_provider.HttpJsonConfigurationProvider(p_url=configuration_server.url,
+                                                                     p_cache_directory=str(tmp_path))
+    assert offline_provider.fetch() == (settings, True)
+
+    without_cache = config_provider.HttpJsonConfigurationProvider(p_url=configuration_server.url)
+
+    with pytest.raises(configuration.ConfigurationException):
+        without_cache.fetch()
+
+
+def test_settings_are_read_into_configuration(configuration_server, tmp_path):
+
+    config_file = tmp_path / "test.conf"
+    config_file.write_text("[test_app]\nminimum_downtime_duration=30\nmaximum_timer_slack=7\n")
+    arguments = base_app.get_argument_parser(p_app_name=APP_NAME).parse_args(
+        ["--single-run", "--config", str(config_file), "--config-provider-url", configuration_server.url,
+         "--config-cache", str(tmp_path), "--option", "test_app.debug_mode=false"])
+    app = base_app.BaseApp(p_app_name=APP_NAME, p_pid_file=None, p_arguments=arguments, p_dir_name=APP_NAME)
+
+    config = configuration.Configuration()
+    config.add_section(base_app.BaseAppConfigModel(p_section_name=APP_NAME))
+    app.prepare_configuration(config)
+
+    app_config = config[APP_NAME]
+    assert app_config.minimum_downtime_duration == 33
+    assert app_config.maximum_timer_slack == 7
+    assert not app_config.debug_mode
+    assert config.get_option_source(APP_NAME, "minimum_downtime_duration") == \
+           configuration.OptionSource(p_layer=configuration.SOURCE_PROVIDER, p_location=configuration_server.url)
+
+    # reading the configuration again (e.g. on reload) uses the latest fetched settings
+    request_count = len(configuration_server.requests)
+    app.read_configuration(config)
+    assert len(configuration_server.requests) == request_count
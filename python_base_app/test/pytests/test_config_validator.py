@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+from python_base_app import config_validator
+from python_base_app import configuration
+
+
+class RangeConfigModel(configuration.ConfigModel):
+
+    def __init__(self):
+        super().__init__(p_section_name="Range")
+
+        self.minimum = 1
+        self.maximum = 10
+        self.name = configuration.NONE_STRING
+
+    def check_constraints(self):
+
+        if self.minimum > self.maximum:
+            return ["minimum must not be larger than maximum"]
+
+        return []
+
+
+def create_configuration():
+
+    config = configuration.Configuration()
+    config.add_section(RangeConfigModel())
+    return config
+
+
+def test_collect_all_errors(tmp_path):
+
+    first_file = tmp_path / "first.conf"
+    first_file.write_text("[Range]\nname=first\nminimum=abc\nmaximum=5\n")
+    second_file = tmp_path / "second.conf"
+    second_file.write_text("[Range]\nunknown=1\nminimum=20\n\n[Unknown]\nx=1\n")
+
+    config = create_configuration()
+    validator = config_validator.ConfigurationValidator(p_configuration=config)
+    validator.validate_files(p_filenames=[str(first_file), str(second_file)])
+    validator.validate_overrides(p_environment_dict={"Range__maximum": "x"}, p_cmd_line_options=["Range.maximum=8"])
+    validator.validate_constraints()
+
+    errors = {(error.filename, error.line, error.section_name, error.option_name): error
+              for error in validator.get_errors()}
+
+    # minimum=abc is overridden by the second file and therefore not reported
+    assert set(errors) == {
+        (str(second_file), 2, "Range", "unknown"),
+        (str(second_file), 5, "Unknown", None),
+        (None, None, "Range", "maximum"),
+        (str(first_file), 1, "Range", None),
+    }
+    assert str(errors[(None, None, "Range", "maximum")]).startswith("environment 'Range__maximum': [Range]maximum:")
+    assert "minimum must not be larger than maximum" in str(errors[(str(first_file), 1, "Range", None)])
+
+
+def test_syntax_errors_do_not_stop_validation(tmp_path):
+
+    config_file = tmp_path / "broken.conf"
+    config_file.write_text("[Range]\nthis is not a setting\nminimum=x\n")
+
+    validator = config_validator.ConfigurationValidator(p_configuration=create_configuration())
+    validator.validate_files(p_filenames=[str(config_file), str(tmp_path / "missing.conf")])
+
+    errors = [(error.line, error.option_name) for error in validator.get_errors()]
+
+    assert (2, None) in errors
+    assert (3, "minimum") in errors
+    assert len(errors) == 3
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import queue
+
+import pytest
+
+from python_base_app import config_watcher
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_configuration_watcher(tmp_path, use_inotify):
+    config_file = tmp_path / "test.conf"
+    other_file = tmp_path / "other.conf"
+    config_file.write_text("[Section]\noption=1\n")
+    notifications = queue.Queue()
+
+    watcher = config_watcher.ConfigurationWatcher(p_filenames=[str(config_file)], p_callback=notifications.put,
+                                                  p_debounce_delay=0.2, p_poll_interval=0.1,
+                                                  p_use_inotify=use_inotify)
+    watcher.start()
+
+    try:
+        if use_inotify and not watcher.uses_inotify:
+            pytest.skip("inotify is not available")
+
+        other_file.write_text("ignored")
+
+        # replace the file like an editor would do -> one notification after the debounce delay
+        new_file = tmp_path / "test.conf.new"
+        new_file.write_text("[Section]\noption=2\n")
+        os.replace(new_file, config_file)
+        config_file.write_text("[Section]\noption=3\n")
+
+        assert notifications.get(timeout=5) == [str(config_file)]
+
+        with pytest.raises(queue.Empty):
+            notifications.get(timeout=0.5)
+
+    finally:
+        watcher.stop()
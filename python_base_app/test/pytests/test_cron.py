@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import datetime
+import os
+import time
+
+import pytest
+
+from python_base_app import base_app
+from python_base_app import configuration
+from python_base_app import cron
+from python_base_app import scheduler
+from python_base_app.base_app import RecurringTask
+
+# Friday
+REFERENCE_TIME = datetime.datetime(2026, 10, 16, 12, 34, 56)
+
+SECONDS_PER_HOUR = 3600
+
+
+def get_utc_timestamp(*p_args):
+    return datetime.datetime(*p_args, tzinfo=datetime.timezone.utc).timestamp()
+
+
+@pytest.fixture
+def berlin_time_zone():
+    old_time_zone = os.environ.get("TZ")
+    os.environ["TZ"] = "Europe/Berlin"
+    time.tzset()
+
+    yield
+
+    if old_time_zone is None:
+        del os.environ["TZ"]
+
+    else:
+        os.environ["TZ"] = old_time_zone
+
+    time.tzset()
+
+
+def test_every_five_minutes():
+    expression = cron.CronExpression("*/5 * * * *")
+    assert expression.get_next_time(REFERENCE_TIME) == datetime.datetime(2026, 10, 16, 12, 35)
+    assert expression.get_next_time(datetime.datetime(2026, 10, 16, 12, 35)) == \
+           datetime.datetime(2026, 10, 16, 12, 40)
+
+
+def test_next_day_and_month_rollover():
+    expression = cron.CronExpression("30 2 * * *")
+    assert expression.get_next_time(REFERENCE_TIME) == datetime.datetime(2026, 10, 17, 2, 30)
+
+    expression = cron.CronExpression("0 0 1 jan *")
+    assert expression.get_next_time(REFERENCE_TIME) == datetime.datetime(2027, 1, 1, 0, 0)
+
+
+def test_day_of_week():
+    expression = cron.CronExpression("0 8 * * mon-wed")
+    assert expression.get_next_time(REFERENCE_TIME) == datetime.datetime(2026, 10, 19, 8, 0)
+
+    # Sunday may be given as 0 or 7
+    assert cron.CronExpression("0 8 * * 7").get_next_time(REFERENCE_TIME) == \
+           cron.CronExpression("0 8 * * 0").get_next_time(REFERENCE_TIME)
+
+
+def test_day_of_month_or_day_of_week():
+    expression = cron.CronExpression("0 0 20 * sat")
+    assert expression.get_next_time(REFERENCE_TIME) == datetime.datetime(2026, 10, 17, 0, 0)
+
+
+def test_macros():
+    assert cron.CronExpression("@hourly").get_next_time(REFERENCE_TIME) == datetime.datetime(2026, 10, 16, 13, 0)
+    assert cron.CronExpression("@daily").get_next_time(REFERENCE_TIME) == datetime.datetime(2026, 10, 17, 0, 0)
+
+
+def test_invalid_expressions():
+    for expression in ("* * * *", "60 * * * *", "*/0 * * * *", "x * * * *", "5-1 * * * *"):
+        with pytest.raises(configuration.ConfigurationException):
+            cron.CronExpression(expression)
+
+    with pytest.raises(configuration.ConfigurationException):
+        cron.CronExpression("0 0 30 feb *").get_next_time(REFERENCE_TIME)
+
+
+def test_shared_instances():
+    assert cron.get_cron_expression("*/5 * * * *") is cron.get_cron_expression("*/5 * * * *")
+
+
+def test_cron_task_deadline():
+    task = RecurringTask(p_name="cron", p_handler_method=None, p_cron_expression="* * * * *")
+    now = scheduler.monotonic_ns()
+    task.compute_next_execution_time(p_now=now)
+
+    assert now < task.deadline <= now + 60 * scheduler.NANOSECONDS_PER_SECOND
+
+
+def test_jitter_and_splay():
+    task = RecurringTask(p_name="jitter", p_handler_method=None, p_interval=10, p_fixed_schedule=True,
+                         p_jitter=2, p_splay=5)
+
+    task.compute_next_execution_time(p_now=0)
+    first_base_deadline = task.base_deadline
+    assert 0 <= first_base_deadline <= 5 * scheduler.NANOSECONDS_PER_SECOND
+    assert first_base_deadline <= task.deadline <= first_base_deadline + 2 * scheduler.NANOSECONDS_PER_SECOND
+
+    task.compute_next_execution_time(p_now=0)
+    assert task.base_deadline == first_base_deadline + 10 * scheduler.NANOSECONDS_PER_SECOND
+    assert task.base_deadline <= task.deadline <= task.base_deadline + 2 * scheduler.NANOSECONDS_PER_SECOND
+
+
+def test_cron_task_deadline_across_daylight_saving_time(berlin_time_zone):
+    # 2026-10-25 03:00 CEST -> 02:00 CET
+    task = RecurringTask(p_name="cron", p_handler_method=None, p_cron_expression="0 3 * * *")
+    wall_now = get_utc_timestamp(2026, 10, 24, 23, 0)  # 01:00 CEST
+
+    deadline = task.get_next_cron_deadline(p_now=0, p_wall_now=wall_now)
+    # three hours although the wall clock only advances by two
+    assert deadline == 3 * SECONDS_PER_HOUR * scheduler.NANOSECONDS_PER_SECOND
+
+
+def test_repeated_local_times_match_once(berlin_time_zone):
+    expression = cron.CronExpression("30 2 * * *")
+
+    # 02:40 CET after the first 02:30 (CEST) and the repeated 02:30 (CET)
+    assert expression.get_next_timestamp(p_after=get_utc_timestamp(2026, 10, 25, 1, 40)) == \
+           get_utc_timestamp(2026, 10, 26, 1, 30)
+
+    # 02:10 CET: 02:30 has already been executed at its first occurrence
+    assert expression.get_next_timestamp(p_after=get_utc_timestamp(2026, 10, 25, 1, 10)) == \
+           get_utc_timestamp(2026, 10, 26, 1, 30)
+
+    # 02:10 CEST
+    assert expression.get_next_timestamp(p_after=get_utc_timestamp(2026, 10, 25, 0, 10)) == \
+           get_utc_timestamp(2026, 10, 25, 0, 30)
+
+
+def test_skipped_local_times_match_after_the_gap(berlin_time_zone):
+    # 2026-03-29 02:00 CET -> 03:00 CEST
+    expression = cron.CronExpression("30 2 * * *")
+
+    assert expression.get_next_timestamp(p_after=get_utc_timestamp(2026, 3, 29, 0, 0)) == \
+           get_utc_timestamp(2026, 3, 29, 1, 0)
+
+
+def test_cron_splay(monkeypatch):
+    monkeypatch.setattr(base_app.random, "uniform", lambda p_minimum, p_maximum: p_maximum)
+    task = RecurringTask(p_name="cron", p_handler_method=None, p_cron_expression="* * * * *", p_splay=30)
+    task.compute_next_execution_time(p_now=0)
+
+    assert 30 * scheduler.NANOSECONDS_PER_SECOND < task.deadline <= 90 * scheduler.NANOSECONDS_PER_SECOND
+
+    # only the first execution is delayed
+    task.compute_next_execution_time(p_now=0)
+    assert 0 < task.deadline <= 60 * scheduler.NANOSECONDS_PER_SECOND
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from python_base_app import icmp_engine
+from python_base_app.configuration import ConfigurationException
+from python_base_app.pinger import Pinger, PingerConfigModel, PING_ENGINE_NATIVE
+
+
+def test_echo_request_checksum():
+    packet = icmp_engine.create_echo_request(p_family=socket.AF_INET, p_identifier=0x1234, p_sequence=7)
+
+    assert packet[0] == icmp_engine.ICMP_ECHO_REQUEST
+    # the checksum of a packet including its checksum is zero
+    assert icmp_engine.get_checksum(packet) == 0
+
+
+def test_parse_echo_reply():
+    reply = struct.pack("!BBHHH", icmp_engine.ICMP_ECHO_REPLY, 0, 0, 0x1234, 7) + icmp_engine.PAYLOAD
+    ip_header = bytes([0x45]) + bytes(19)
+
+    assert icmp_engine.parse_echo_reply(p_family=socket.AF_INET, p_packet=reply, p_raw=False) == (0x1234, 7)
+    assert icmp_engine.parse_echo_reply(p_family=socket.AF_INET, p_packet=ip_header + reply, p_raw=True) == \
+           (0x1234, 7)
+
+    request = icmp_engine.create_echo_request(p_family=socket.AF_INET, p_identifier=0x1234, p_sequence=7)
+    assert icmp_engine.parse_echo_reply(p_family=socket.AF_INET, p_packet=request, p_raw=False) is None
+
+
+def test_invalid_ping_engine():
+    config = PingerConfigModel()
+    config.ping_engine = "telepathy"
+
+    with pytest.raises(ConfigurationException):
+        Pinger(p_config=config)
+
+
+@pytest.mark.skipif(os.getenv("NO_PING"), reason="no ping allowed")
+def test_native_ping_localhost():
+    config = PingerConfigModel()
+    config.ping_engine = PING_ENGINE_NATIVE
+    pinger = Pinger(p_config=config)
+
+    assert pinger.ping(p_host="127.0.0.1") < 100
+
+    results = pinger.ping_many(p_hosts=["127.0.0.1", "localhost", "non.existing.host.invalid"])
+
+    assert results["127.0.0.1"] is not None
+    assert results["localhost"] is not None
+    assert results["non.existing.host.invalid"] is None
+
+    with pytest.raises(ConfigurationException):
+        pinger.ping(p_host="non.existing.host.invalid")
+
+
+def is_unprivileged_icmp_allowed():
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+
+    except OSError:
+        return False
+
+
+@pytest.mark.skipif(os.getenv("NO_PING"), reason="no ping allowed")
+@pytest.mark.skipif(not is_unprivileged_icmp_allowed(), reason="net.ipv4.ping_group_range excludes this user")
+def test_native_ping_localhost_unprivileged_socket():
+    engine = icmp_engine.IcmpEchoEngine(p_allow_raw_sockets=False)
+
+    echo_socket = icmp_engine.EchoSocket(p_family=socket.AF_INET, p_allow_raw_socket=False)
+    assert not echo_socket.raw
+    assert echo_socket.identifier != 0
+    echo_socket.close()
+
+    results = engine.ping_many(p_hosts=["127.0.0.1", "localhost"])
+
+    assert results["127.0.0.1"] is not None
+    assert results["localhost"] is not None
+
+
+def create_engine_with_slow_resolver(p_release):
+    engine = icmp_engine.IcmpEchoEngine(p_timeout=0.5)
+
+    def resolve(p_host):
+        if p_host == "slow.host":
+            p_release.wait(5)
+
+        if p_host in ("slow.host", "unknown.host"):
+            raise ConfigurationException("Cannot resolve host {host}".format(host=p_host))
+
+        return socket.AF_INET, (p_host, 0)
+
+    engine.resolve = resolve
+    return engine
+
+
+def test_resolve_many_records_failures_per_host():
+    release = threading.Event()
+    engine = create_engine_with_slow_resolver(p_release=release)
+
+    try:
+        start_time = time.monotonic()
+        addresses, failures = engine.resolve_many(p_hosts=["slow.host", "unknown.host", "127.0.0.1", "127.0.0.2"])
+
+        assert time.monotonic() - start_time < 2
+        assert addresses == {"127.0.0.1": (socket.AF_INET, ("127.0.0.1", 0)),
+                             "127.0.0.2": (socket.AF_INET, ("127.0.0.2", 0))}
+        assert sorted(failures) == ["slow.host", "unknown.host"]
+        assert "within" in str(failures["slow.host"])
+
+    finally:
+        release.set()
+
+
+def test_ping_many_with_unresolvable_hosts_only():
+    release = threading.Event()
+    engine = create_engine_with_slow_resolver(p_release=release)
+
+    try:
+        assert engine.ping_many(p_hosts=["slow.host", "unknown.host"]) == {"slow.host": None, "unknown.host": None}
+
+        with pytest.raises(ConfigurationException):
+            engine.ping_many(p_hosts=["unknown.host"], p_ignore_unknown_hosts=False)
+
+    finally:
+        release.set()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import pytest
+
+from python_base_app import ping_monitor
+from python_base_app.configuration import ConfigurationException
+
+
+class ScriptedPinger(object):
+    """
+    Returns the delays of a script {host: [delay or None, ...]} one after the other.
+    """
+
+    def __init__(self, p_script):
+        self._script = {host: list(delays) for host, delays in p_script.items()}
+
+    def ping_many(self, p_hosts):
+        return {host: self._script[host].pop(0) for host in p_hosts}
+
+
+def create_monitor(p_script, **p_settings):
+    config = ping_monitor.PingMonitorConfigModel()
+
+    for name, value in p_settings.items():
+        setattr(config, name, value)
+
+    monitor = ping_monitor.PingMonitor(p_pinger=ScriptedPinger(p_script=p_script), p_config=config)
+
+    for host in p_script:
+        monitor.add_host(p_host=host)
+
+    return monitor
+
+
+def test_statistics():
+    monitor = create_monitor(p_script={"host": [10.0, 14.0, None, 12.0]})
+
+    for _ in range(4):
+        monitor.check()
+
+    statistics = monitor.get_statistics(p_host="host")
+    assert statistics.mean_delay == 12.0
+    assert statistics.jitter == 3.0
+    assert statistics.packet_loss == 0.25
+    assert statistics.last_seen is not None
+    assert statistics.get_summary()["ping_count"] == 4
+
+
+def test_statistics_bounded_memory():
+    monitor = create_monitor(p_script={"host": [None] * 10 + [5.0] * 3}, sample_size=3)
+
+    for _ in range(13):
+        monitor.check()
+
+    statistics = monitor.get_statistics(p_host="host")
+    assert statistics.packet_loss == 0.0
+    assert statistics.mean_delay == 5.0
+
+
+def test_state_transitions_with_hysteresis():
+    monitor = create_monitor(p_script={"host": [1.0, 1.0, None, 1.0, None, None, None, 1.0, 1.0]},
+                             up_threshold=2, down_threshold=3)
+    transitions = []
+    monitor.add_state_listener(lambda statistics, old_state: transitions.append((old_state, statistics.state)))
+
+    for _ in range(9):
+        monitor.check()
+
+    # The single missing response does not mark the host as down
+    assert transitions == [(ping_monitor.STATE_UNKNOWN, ping_monitor.STATE_UP),
+                           (ping_monitor.STATE_UP, ping_monitor.STATE_DOWN),
+                           (ping_monitor.STATE_DOWN, ping_monitor.STATE_UP)]
+
+
+def test_failing_listener_does_not_stop_check():
+    monitor = create_monitor(p_script={"host": [1.0]}, up_threshold=1)
+    transitions = []
+
+    def failing_listener(p_statistics, p_old_state):
+        raise Exception("listener failed")
+
+    monitor.add_state_listener(failing_listener)
+    monitor.add_state_listener(lambda statistics, old_state: transitions.append(statistics.state))
+    monitor.check()
+
+    assert transitions == [ping_monitor.STATE_UP]
+
+
+def test_recurring_task():
+    monitor = create_monitor(p_script={}, ping_interval=30)
+    task = monitor.create_recurring_task()
+
+    assert task.interval == 30
+    assert task.handler_method == monitor.check
+
+
+def test_invalid_settings():
+    with pytest.raises(ConfigurationException):
+        create_monitor(p_script={}, down_threshold=0)
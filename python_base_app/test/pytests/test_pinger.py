@@ -18,12 +18,17 @@
 #    with this program; if not, write to the Free Software Foundation, Inc.,
 #    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
+import asyncio
+import http.server
+import json
 import os
+import threading
+import time
 
 import pytest
 
 from python_base_app.configuration import ConfigurationException
-from python_base_app.pinger import Pinger, PingerConfigModel
+from python_base_app.pinger import AsyncPinger, Pinger, PingerConfigModel
 from python_base_app.tools import is_mac_os
 
 
@@ -80,3 +85,195 @@ def test_ping_google_dns(default_pinger: Pinger):
 def test_ping_non_existing_host(default_pinger: Pinger):
     with pytest.raises(ConfigurationException):
         default_pinger.ping(p_host="localhostx")
+
+
+@pytest.fixture
+def fake_ping_command(tmp_path):
+    # Simulates a ping taking 0.5 seconds, the host "down" does not respond, the host "slow" hangs
+    script = tmp_path / "ping"
+    script.write_text('#!/bin/sh\n'
+                      'for host; do :; done\n'
+                      'if [ "$host" = "slow" ]; then exec sleep 3; fi\n'
+                      'sleep 0.5\n'
+                      'if [ "$host" = "down" ]; then exit 1; fi\n'
+                      'echo "rtt min/avg/max/mdev = 0.100/0.250/0.400/0.050 ms"\n')
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_ping_many(fake_ping_command):
+    config = PingerConfigModel()
+    config.ping_command = fake_ping_command
+    config.ping_pool_size = 10
+    pinger = Pinger(p_config=config)
+
+    start_time = time.monotonic()
+    results = pinger.ping_many(p_hosts=["host%d" % index for index in range(10)] + ["down", "host0"])
+    duration = time.monotonic() - start_time
+
+    assert len(results) == 11
+    assert results["host3"] == 0.25
+    assert results["down"] is None
+    assert duration < 2.5
+
+
+class RelayRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = b"12,5"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def relay_server():
+    server = http.server.HTTPServer(("127.0.0.1", 0), RelayRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_ping_many(fake_ping_command, relay_server):
+    config = PingerConfigModel()
+    config.ping_command = fake_ping_command
+    pinger = AsyncPinger(p_config=config, p_default_port=relay_server.server_address[1])
+    relay_host = "127.0.0.1,host"
+
+    start_time = time.monotonic()
+    results = asyncio.run(pinger.ping_many(p_hosts=["host%d" % index for index in range(10)] + ["down", relay_host]))
+    duration = time.monotonic() - start_time
+
+    assert len(results) == 12
+    assert results["host3"] == 0.25
+    assert results["down"] is None
+    assert results[relay_host] == 12.5
+    assert duration < 2.5
+
+    start_time = time.monotonic()
+    assert asyncio.run(pinger.ping(p_host="slow", p_timeout=0.1)) is None
+    assert time.monotonic() - start_time < 1
+
+
+class KeepAliveRelayRequestHandler(RelayRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connection_count += 1
+
+    def do_POST(self):
+        if not self.server.batch_api:
+            self.send_error(404)
+            return
+
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.batch_requests.append(request["hosts"])
+        body = json.dumps({host: None if host == "down" else 12.5 for host in request["hosts"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def keep_alive_relay_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveRelayRequestHandler)
+    server.daemon_threads = True
+    server.connection_count = 0
+    server.batch_requests = []
+    server.batch_api = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_remote_ping_reuses_connection(keep_alive_relay_server):
+    pinger = Pinger(p_config=PingerConfigModel(), p_default_port=keep_alive_relay_server.server_address[1])
+
+    for _ in range(5):
+        assert pinger.ping(p_host="127.0.0.1,host") == 12.5
+
+    pinger.close()
+
+    assert keep_alive_relay_server.connection_count == 1
+
+
+def test_ping_many_batch(keep_alive_relay_server):
+    pinger = Pinger(p_config=PingerConfigModel(), p_default_port=keep_alive_relay_server.server_address[1])
+    hosts = ["127.0.0.1,host%d" % index for index in range(10)] + ["127.0.0.1,down"]
+
+    results = pinger.ping_many(p_hosts=hosts)
+    pinger.close()
+
+    assert len(results) == 11
+    assert results["127.0.0.1,host3"] == 12.5
+    assert results["127.0.0.1,down"] is None
+    assert len(keep_alive_relay_server.batch_requests) == 1
+    assert sorted(keep_alive_relay_server.batch_requests[0]) == sorted(host.split(",")[1] for host in hosts)
+
+
+def test_ping_many_batch_fallback(keep_alive_relay_server):
+    keep_alive_relay_server.batch_api = False
+    pinger = Pinger(p_config=PingerConfigModel(), p_default_port=keep_alive_relay_server.server_address[1])
+    hosts = ["127.0.0.1,host%d" % index for index in range(10)]
+
+    results = pinger.ping_many(p_hosts=hosts)
+    assert len(results) == 10
+    assert results["127.0.0.1,host3"] == 12.5
+
+    # The relay is not asked for batches any more
+    connection_count = keep_alive_relay_server.connection_count
+    assert pinger.get_relay_batches(p_hosts=hosts, p_default_port=pinger._default_port) == {}
+    pinger.close()
+
+    assert connection_count <= PingerConfigModel().relay_pool_size
+
+
+def test_async_remote_ping_reuses_connection(keep_alive_relay_server):
+    pinger = AsyncPinger(p_config=PingerConfigModel(), p_default_port=keep_alive_relay_server.server_address[1])
+    hosts = ["127.0.0.1,host%d" % index for index in range(10)] + ["127.0.0.1,down"]
+
+    async def ping_hosts():
+        delays = [await pinger.ping(p_host="127.0.0.1,host") for _ in range(5)]
+        return delays, await pinger.ping_many(p_hosts=hosts)
+
+    delays, results = asyncio.run(ping_hosts())
+    pinger.close()
+
+    assert delays == [12.5] * 5
+    assert len(results) == 11
+    assert results["127.0.0.1,host3"] == 12.5
+    assert results["127.0.0.1,down"] is None
+    assert len(keep_alive_relay_server.batch_requests) == 1
+    assert keep_alive_relay_server.connection_count == 1
+
+
+def test_async_ping_many_batch_fallback(keep_alive_relay_server):
+    keep_alive_relay_server.batch_api = False
+    config = PingerConfigModel()
+    config.relay_pool_size = 2
+    pinger = AsyncPinger(p_config=config, p_default_port=keep_alive_relay_server.server_address[1])
+    hosts = ["127.0.0.1,host%d" % index for index in range(10)]
+
+    results = asyncio.run(pinger.ping_many(p_hosts=hosts))
+    pinger.close()
+
+    assert len(results) == 10
+    assert results["127.0.0.1,host3"] == 12.5
+    # The relay closes the connection of the rejected batch request
+    assert keep_alive_relay_server.connection_count <= config.relay_pool_size + 1
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import datetime
+import time
+
+from python_base_app import scheduler
+from python_base_app.base_app import OneShotTask, RecurringTask
+
+
+def create_task(p_name, p_deadline):
+    task = RecurringTask(p_name=p_name, p_handler_method=None, p_interval=10)
+    task.deadline = p_deadline
+    return task
+
+
+def test_scheduler_orders_by_deadline():
+    a_scheduler = scheduler.Scheduler()
+    a_scheduler.push(create_task(p_name="late", p_deadline=300))
+    a_scheduler.push(create_task(p_name="early", p_deadline=100))
+    a_scheduler.push(create_task(p_name="middle", p_deadline=200))
+
+    assert a_scheduler.get_next_deadline() == 100
+    assert a_scheduler.pop_due_task(p_now=250).name == "early"
+    assert a_scheduler.pop_due_task(p_now=250).name == "middle"
+    assert a_scheduler.pop_due_task(p_now=250) is None
+    assert len(a_scheduler) == 1
+
+
+def test_scheduler_keeps_insertion_order_for_same_deadline():
+    a_scheduler = scheduler.Scheduler()
+
+    for name in ("first", "second", "third"):
+        a_scheduler.push(create_task(p_name=name, p_deadline=100))
+
+    names = [a_scheduler.pop_due_task(p_now=100).name for _ in range(3)]
+
+    assert names == ["first", "second", "third"]
+
+
+def test_compute_next_execution_time():
+    task = RecurringTask(p_name="task", p_handler_method=None, p_interval=10)
+
+    task.compute_next_execution_time(p_now=1000)
+    assert task.deadline == 1000
+
+    task.compute_next_execution_time(p_now=2000)
+    assert task.deadline == 2000 + 10 * scheduler.NANOSECONDS_PER_SECOND
+
+
+def test_compute_next_execution_time_fixed_schedule():
+    task = RecurringTask(p_name="task", p_handler_method=None, p_interval=10, p_fixed_schedule=True)
+
+    task.compute_next_execution_time(p_now=1000)
+    task.compute_next_execution_time(p_now=5000)
+    assert task.deadline == 1000 + 10 * scheduler.NANOSECONDS_PER_SECOND
+
+
+def test_task_comparison_and_arithmetic():
+    now = scheduler.monotonic_ns()
+    early = create_task(p_name="early", p_deadline=now + scheduler.NANOSECONDS_PER_SECOND)
+    late = create_task(p_name="late", p_deadline=now + 3 * scheduler.NANOSECONDS_PER_SECOND)
+
+    assert early < late
+    assert late > early
+    assert sorted([late, early]) == [early, late]
+    assert late - early == datetime.timedelta(seconds=2)
+    assert early.get_heap_entry() is early
+
+    reference = datetime.datetime.utcnow() + datetime.timedelta(seconds=2)
+    assert early < reference
+    assert late > reference
+    assert datetime.timedelta(seconds=0) < late - reference <= datetime.timedelta(seconds=1)
+    assert datetime.timedelta(seconds=-1) <= reference - late < datetime.timedelta(seconds=0)
+
+
+def test_adapt_to_delay():
+    task = create_task(p_name="task", p_deadline=1000)
+    task.base_deadline = 1000
+
+    task.adapt_to_delay(p_delay=5, p_now=1000)
+    assert task.deadline == task.base_deadline == 1000 + 5 * scheduler.NANOSECONDS_PER_SECOND
+
+    # Don't schedule more than one interval into the future!
+    task.adapt_to_delay(p_delay=100, p_now=1000)
+    assert task.deadline == 1000 + 10 * scheduler.NANOSECONDS_PER_SECOND
+
+
+def test_clock_drift_detector():
+    clocks = {"monotonic": 0, "reference": 0}
+    detector = scheduler.ClockDriftDetector(p_monotonic_clock=lambda: clocks["monotonic"],
+                                            p_reference_clock=lambda: clocks["reference"])
+
+    clocks["monotonic"] += 5 * scheduler.NANOSECONDS_PER_SECOND
+    clocks["reference"] += 5 * scheduler.NANOSECONDS_PER_SECOND
+    assert detector.get_drift() == 0
+
+    # simulate a suspend of 60 seconds
+    clocks["monotonic"] += 1 * scheduler.NANOSECONDS_PER_SECOND
+    clocks["reference"] += 61 * scheduler.NANOSECONDS_PER_SECOND
+    assert detector.get_drift() == 60
+
+
+def test_cancel_task():
+    a_scheduler = scheduler.Scheduler()
+    handle = a_scheduler.add(create_task(p_name="cancelled", p_deadline=None), p_now=100)
+    a_scheduler.add(create_task(p_name="kept", p_deadline=None), p_now=200)
+
+    handle.cancel()
+
+    assert handle.is_cancelled
+    assert len(a_scheduler) == 1
+    assert a_scheduler.get_next_deadline() == 200
+    assert a_scheduler.get_task(p_name="cancelled") is None
+    assert a_scheduler.pop_due_task(p_now=300).name == "kept"
+
+    # a cancelled task must not be rescheduled by the event queue
+    a_scheduler.push(handle.task)
+    assert len(a_scheduler) == 0
+
+
+def test_pause_and_resume_task():
+    a_scheduler = scheduler.Scheduler()
+    handle = a_scheduler.add(create_task(p_name="paused", p_deadline=None), p_now=100)
+
+    handle.pause()
+    assert handle.is_paused
+    assert a_scheduler.get_next_deadline() is None
+    assert [task.name for task in a_scheduler.tasks()] == ["paused"]
+
+    a_scheduler.resume(p_task=handle.task, p_now=500)
+    assert not handle.is_paused
+    assert a_scheduler.get_next_deadline() == 500
+
+
+def test_change_interval():
+    a_scheduler = scheduler.Scheduler()
+    handle = a_scheduler.add(create_task(p_name="task", p_deadline=None), p_now=0)
+    task = a_scheduler.pop_due_task(p_now=0)
+    task.compute_next_execution_time(p_now=0)
+    a_scheduler.push(task)
+    assert a_scheduler.get_next_deadline() == 10 * scheduler.NANOSECONDS_PER_SECOND
+
+    a_scheduler.change_interval(p_task=handle.task, p_interval=30, p_now=0)
+
+    assert len(a_scheduler) == 1
+    assert a_scheduler.get_next_deadline() == 30 * scheduler.NANOSECONDS_PER_SECOND
+
+
+def test_shift_postpones_all_tasks():
+    a_scheduler = scheduler.Scheduler()
+    a_scheduler.push(create_task(p_name="first", p_deadline=100))
+    a_scheduler.push(create_task(p_name="second", p_deadline=200))
+
+    a_scheduler.shift(p_delay=1000)
+
+    assert a_scheduler.get_next_deadline() == 1100
+    assert a_scheduler.pop_due_task(p_now=1000) is None
+
+    task = a_scheduler.pop_due_task(p_now=1100)
+    assert task.name == "first"
+    assert task.deadline == 1100
+
+
+def test_shift_does_not_exceed_interval():
+    a_scheduler = scheduler.Scheduler()
+    now = scheduler.seconds_to_ns(1000)
+    one_shot = OneShotTask(lambda: None)
+    one_shot.deadline = now + scheduler.seconds_to_ns(8)
+    a_scheduler.push(create_task(p_name="recurring", p_deadline=now + scheduler.seconds_to_ns(5)))
+    a_scheduler.push(one_shot)
+
+    a_scheduler.shift(p_delay=scheduler.seconds_to_ns(3600), p_now=now)
+
+    # the recurring task is postponed by one interval (10 seconds) at most, the one-shot task by the full delay
+    assert a_scheduler.get_next_deadline() == now + scheduler.seconds_to_ns(10)
+    assert a_scheduler.pop_due_task(p_now=now + scheduler.seconds_to_ns(10)).name == "recurring"
+    assert one_shot.deadline == now + scheduler.seconds_to_ns(3608)
+
+
+def test_scheduler_state_store(tmp_path):
+    store = scheduler.SchedulerStateStore(p_filename=str(tmp_path / "spool" / "state.json"))
+
+    assert store.load() == {}
+
+    task = create_task(p_name="task", p_deadline=scheduler.seconds_to_ns(100))
+    task.last_run = 1234.5
+    store.save(p_tasks=[task], p_now=scheduler.seconds_to_ns(40))
+
+    state = store.load()
+    assert state["task"]["last_run"] == 1234.5
+    assert 50 < state["task"]["next_run"] - time.time() <= 60
+    assert [path.name for path in (tmp_path / "spool").iterdir()] == ["state.json"]
+
+
+def test_restore_schedule():
+    task = RecurringTask(p_name="task", p_handler_method=None, p_interval=100)
+
+    task.restore_schedule(p_next_run=time.time() + 50, p_now=0)
+    assert scheduler.seconds_to_ns(49) < task.deadline <= scheduler.seconds_to_ns(50)
+
+    # never later than one interval from now
+    task.restore_schedule(p_next_run=time.time() + 1000, p_now=0)
+    assert task.deadline == scheduler.seconds_to_ns(100)
+
+    # stale tasks are spread over their interval
+    deadlines = set()
+
+    for _ in range(10):
+        task.restore_schedule(p_next_run=time.time() - 1000, p_now=0)
+        deadlines.add(task.deadline)
+
+    assert len(deadlines) > 1
+    assert all(0 <= deadline <= scheduler.seconds_to_ns(100) for deadline in deadlines)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import random
+
+import flask
+
+from python_base_app import actuator
+from python_base_app import stats
+
+
+def test_streaming_quantile_small_sample():
+    quantile = stats.StreamingQuantile(p_quantile=0.5)
+    assert quantile.get_value() is None
+
+    for value in (3, 1, 2):
+        quantile.add_value(value)
+
+    assert quantile.get_value() == 2
+
+
+def test_streaming_quantile_uniform_distribution():
+    random.seed(4711)
+    quantile = stats.StreamingQuantile(p_quantile=0.95)
+
+    for _ in range(10000):
+        quantile.add_value(random.uniform(0, 100))
+
+    assert 93 < quantile.get_value() < 97
+
+
+def test_histogram():
+    histogram = stats.Histogram(p_bucket_limits=(1, 10))
+
+    for value in (0.5, 1, 5, 10, 11, 100):
+        histogram.add_value(value)
+
+    assert histogram.get_counts() == {"<=1": 2, "<=10": 2, ">10": 2}
+
+
+def test_task_statistics():
+    statistics = stats.TaskStatistics(p_sample_size=2)
+    statistics.add_execution(p_runtime=1.0)
+    statistics.add_execution(p_runtime=3.0, p_failed=True)
+    statistics.add_execution(p_runtime=2.0)
+    statistics.add_skipped_execution()
+    statistics.add_lateness(p_lateness=0.5)
+
+    summary = statistics.get_summary()
+
+    assert summary["execution_count"] == 3
+    assert summary["exception_count"] == 1
+    assert summary["skipped_count"] == 1
+    assert summary["last_runtime"] == 2.0
+    assert summary["max_runtime"] == 3.0
+    assert summary["mean_runtime"] == 2.5
+    assert summary["lateness"]["<=1"] == 1
+
+
+def test_actuator_task_endpoint():
+    app = flask.Flask(__name__)
+    handler = actuator.ActuatorViewHandler(p_app=app, p_url_prefix="/actuator",
+                                           p_task_statistics_provider=lambda: {"task": {"execution_count": 1}})
+
+    try:
+        response = app.test_client().get("/actuator/tasks")
+
+    finally:
+        handler.destroy()
+
+    assert response.status_code == 200
+    assert response.get_json() == {"task": {"execution_count": 1}}
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2026  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import os
+import select
+import signal
+import threading
+import time
+
+import pytest
+
+from python_base_app import supervisor
+from python_base_app import tools
+
+
+def test_get_shard_is_stable():
+    assert supervisor.get_shard(p_name="task", p_shard_count=4) == supervisor.get_shard(p_name="task",
+                                                                                          p_shard_count=4)
+    assert {supervisor.get_shard(p_name=str(i), p_shard_count=4) for i in range(100)} == {0, 1, 2, 3}
+
+
+def test_get_worker_pid_file():
+    assert supervisor.get_worker_pid_file(p_pid_file="/run/app.pid", p_worker_index=1) == "/run/app.pid.1"
+    assert supervisor.get_worker_pid_file(p_pid_file=None, p_worker_index=1) is None
+
+
+@pytest.mark.skipif(tools.is_windows(), reason="requires fork()")
+def test_supervisor_restarts_crashed_worker(tmp_path):
+
+    def worker_method(p_worker_index):
+        crash_marker = tmp_path / "crashed.{index}".format(index=p_worker_index)
+
+        if p_worker_index == 0 and not crash_marker.exists():
+            crash_marker.touch()
+            return 1
+
+        (tmp_path / "running.{index}".format(index=p_worker_index)).touch()
+
+        while True:
+            time.sleep(0.1)
+
+    def terminate_when_all_workers_run():
+        for _ in range(100):
+            if (tmp_path / "running.0").exists() and (tmp_path / "running.1").exists():
+                break
+
+            time.sleep(0.1)
+
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    a_supervisor = supervisor.Supervisor(p_worker_count=2, p_worker_method=worker_method,
+                                         p_minimum_restart_delay=0.1)
+    terminator = threading.Thread(target=terminate_when_all_workers_run)
+    terminator.start()
+
+    a_supervisor.run()
+    terminator.join()
+
+    assert (tmp_path / "crashed.0").exists()
+    assert (tmp_path / "running.0").exists()
+    assert (tmp_path / "running.1").exists()
+    assert a_supervisor.worker_pids == []
+
+
+def test_signal_handler_wakes_up_main_loop_through_socket():
+    a_supervisor = supervisor.Supervisor(p_worker_count=1, p_worker_method=None)
+    a_supervisor.create_wakeup_sockets()
+
+    try:
+        a_supervisor.handle_signal(p_signum=signal.SIGCHLD, p_stackframe=None)
+        assert select.select([a_supervisor._wakeup_receiver], [], [], 0)[0] != []
+
+        a_supervisor.clear_wakeups()
+        assert select.select([a_supervisor._wakeup_receiver], [], [], 0)[0] == []
+
+    finally:
+        a_supervisor.close_wakeup_sockets()
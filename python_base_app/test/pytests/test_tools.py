@@ -358,3 +358,26 @@ def test_wrap_wrap_retry_until_non_none_wait_time_three_retries_exceeded():
 
     assert exec_time_in_seconds >= 3
     assert exec_time_in_seconds < 3.1
+
+
+def test_atomic_write_relative_filename(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    with tools.atomic_write("state.json") as a_file:
+        a_file.write("new")
+
+    assert (tmp_path / "state.json").read_text() == "new"
+    assert [path.name for path in tmp_path.iterdir()] == ["state.json"]
+
+
+def test_atomic_write_keeps_original_file_on_error(tmp_path):
+    filename = tmp_path / "state.json"
+    filename.write_text("old")
+
+    with pytest.raises(ValueError):
+        with tools.atomic_write(str(filename)) as a_file:
+            a_file.write("partial")
+            raise ValueError("failed")
+
+    assert filename.read_text() == "old"
+    assert [path.name for path in tmp_path.iterdir()] == ["state.json"]
@@ -0,0 +1,55 @@
+#!/bin/bash
+
+#    Copyright (C) 2019-20  Marcus Rickert
+#
+#    See https://github.com/marcus67/python_base_app
+#
+#    This program is free software; you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation; either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License along
+#    with this program; if not, write to the Free Software Foundation, Inc.,
+#    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+##################################################################################
+# Please, beware that this file has been generated! Do not make any changes here #
+# but only to python_base_app/templates/make-debian-package.template.sh!         #
+##################################################################################
+
+SCRIPT_DIR=`dirname $0`
+BASE_DIR=`realpath ${SCRIPT_DIR}/..`
+set -e
+
+
+
+echo "Installing PIP packages required for building..."
+pip3 install babel
+
+
+
+# Build PIP package a_package-0.0.1.tar.gz...
+pushd . > /dev/null
+cd /root/package/python_base_app/test/resources/ci_toolbox
+
+
+
+
+
+
+pwd
+pybabel compile -d a_package/translations
+
+
+python3 ./setup.py sdist
+
+
+popd
+
+
@@ -18,6 +18,9 @@
 #    with this program; if not, write to the Free Software Foundation, Inc.,
 #    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
+import datetime
+import json
+import tempfile
 import unittest
 import os.path
 
@@ -51,6 +54,20 @@ class SomeTestConfigModel(configuration.ConfigModel):
         self.string_array = ["somebody", "in", "there"]
 
 
+class TypedTestConfigModel(configuration.ConfigModel):
+
+    def __init__(self):
+        super().__init__(p_section_name=SECTION_NAME)
+
+        self.float = 1.5
+        self.none_float = configuration.NONE_FLOAT
+        self.duration = configuration.Duration(60)
+        self.none_duration = configuration.NONE_DURATION
+        self.time = datetime.time(hour=8)
+        self.comma_separated_list = configuration.CommaSeparatedList(["a", "b"])
+        self.none_dict = configuration.NONE_DICT
+
+
 class TestConfiguration(base_test.BaseTestCase):
 
     def test_configuration_int(self):
@@ -206,6 +223,102 @@ class TestConfiguration(base_test.BaseTestCase):
             self.assertTrue(model.bool)
 
 
+    def test_option_spec(self):
+
+        model = SomeTestConfigModel()
+
+        spec = model.get_option_spec("empty_int_array")
+        self.assertTrue(spec.is_list)
+        self.assertEqual(spec.type_name, "int")
+        self.assertEqual(spec.convert(p_section_name=SECTION_NAME, p_value="42"), 42)
+
+        spec = model.get_option_spec("none_bool")
+        self.assertFalse(spec.is_list)
+        self.assertEqual(spec.type_name, "bool")
+
+        self.assertIsNone(model.get_option_spec("unknown"))
+
+    def test_schema_is_compiled_once_per_class(self):
+
+        model = SomeTestConfigModel()
+        other_model = SomeTestConfigModel()
+
+        self.assertIs(model.get_schema(), other_model.get_schema())
+        self.assertIs(model.get_option_spec("int"), other_model.get_option_spec("int"))
+
+    def test_lazy_optional_section(self):
+
+        config = configuration.Configuration()
+        definition = configuration.OptionalSectionHandlerDefinition()
+        definition.section_name = SECTION_NAME
+        definition.package_name = "python_base_app.test"
+        definition.module_name = "test_configuration"
+        definition.config_model_class_name = "SomeTestConfigModel"
+        definition.lazy = True
+        config.register_optional_section_handler_definition(definition)
+
+        config.read_config_file(p_config_string="[MySection]\nint=42\n")
+
+        section = config[SECTION_NAME]
+        self.assertIsInstance(section, configuration.LazySection)
+        self.assertFalse(section.is_loaded)
+        self.assertIn("not loaded", config.get_optional_section_report()[0])
+
+        self.assertEqual(section.int, 42)
+        self.assertTrue(section.is_loaded)
+        self.assertEqual(type(config[SECTION_NAME]).__name__, "SomeTestConfigModel")
+        self.assertIn("import", config.get_optional_section_report()[0])
+
+    def test_typed_options(self):
+
+        model = TypedTestConfigModel()
+
+        config = configuration.Configuration()
+        config.add_section(p_section=model)
+
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="float", p_option_value="2.25")
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="none_float", p_option_value="3")
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="duration", p_option_value="1h 2m 3s")
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="none_duration", p_option_value="90")
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="time", p_option_value="12:30")
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="comma_separated_list",
+                                p_option_value="x, y,,z")
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="none_dict", p_option_value="a=1, b = 2")
+
+        self.assertEqual(model.float, 2.25)
+        self.assertEqual(model.none_float, 3.0)
+        self.assertEqual(model.duration, 3723)
+        self.assertIsInstance(model.duration, configuration.Duration)
+        self.assertEqual(model.none_duration, 90)
+        self.assertEqual(model.time, datetime.time(hour=12, minute=30))
+        self.assertEqual(model.comma_separated_list, ["x", "y", "z"])
+        self.assertEqual(model.none_dict, {"a": "1", "b": "2"})
+
+        for option, value in (("float", "abc"), ("duration", "12x"), ("time", "X"), ("none_dict", "a")):
+            with self.assertRaises(configuration.ConfigurationException):
+                config.set_config_value(p_section_name=SECTION_NAME, p_option=option, p_option_value=value)
+
+    def test_typed_options_survive_write_to_file(self):
+
+        model = TypedTestConfigModel()
+        model.none_dict = {"a": "1"}
+        config = configuration.Configuration()
+        config.add_section(p_section=model)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "typed.config")
+            config.write_to_file(p_filename=filename)
+
+            new_model = TypedTestConfigModel()
+            new_config = configuration.Configuration()
+            new_config.add_section(p_section=new_model)
+            new_config.read_config_file(p_filename=filename)
+
+        self.assertEqual(new_model.duration, 60)
+        self.assertEqual(new_model.comma_separated_list, ["a", "b"])
+        self.assertEqual(new_model.time, datetime.time(hour=8))
+        self.assertEqual(new_model.none_dict, {"a": "1"})
+
     def test_load_configuration(self):
 
         config = configuration.Configuration()
@@ -272,6 +385,149 @@ class TestConfiguration(base_test.BaseTestCase):
 
         self.assertEqual(model.int, NEW_INT_VALUE)
 
+    def test_override_by_environment_with_prefix(self):
+
+        config = configuration.Configuration()
+        model = SomeTestConfigModel()
+        config.add_section(p_section=model)
+
+        environment = {
+            "APP_{section}__int".format(section=SECTION_NAME): str(NEW_INT_VALUE),
+            "{section}__string".format(section=SECTION_NAME): "ignored without prefix",
+            "APP_UnknownSection__int": "ignored",
+            "APP_{section}__unknown".format(section=SECTION_NAME): "ignored",
+        }
+
+        self.assertIn("APP_{section}__int".format(section=SECTION_NAME),
+                      config.get_environment_index(p_prefix="APP_"))
+
+        config.read_environment_parameters(p_environment_dict=environment, p_prefix="APP_")
+
+        self.assertEqual(model.int, NEW_INT_VALUE)
+        self.assertEqual(model.string, STRING_VALUE)
+
+    def test_option_sources(self):
+
+        config = configuration.Configuration()
+        model = SomeTestConfigModel()
+        config.add_section(p_section=model)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "sources.config")
+
+            with open(filename, "w") as config_file:
+                config_file.write("[MySection]\nint=42\nstring=file\nint_array[0]=7\n")
+
+            config.read_config_file(p_filename=filename)
+            config.read_environment_parameters(p_environment_dict={"MySection__string": "environment"})
+            config.read_command_line_parameters(["MySection.bool=false"])
+
+            self.assertEqual(config.get_option_source(SECTION_NAME, "int"),
+                             configuration.OptionSource(p_layer=configuration.SOURCE_FILE, p_location=filename))
+            self.assertEqual(config.get_option_source(SECTION_NAME, "int_array").layer, configuration.SOURCE_FILE)
+            self.assertEqual(str(config.get_option_source(SECTION_NAME, "string")), "environment 'MySection__string'")
+            self.assertEqual(config.get_option_source(SECTION_NAME, "bool").layer, configuration.SOURCE_COMMAND_LINE)
+            self.assertEqual(config.get_option_source(SECTION_NAME, "none_int").layer, configuration.SOURCE_DEFAULT)
+            self.assertIsNone(config.get_option_source(SECTION_NAME, "unknown"))
+
+            output_filename = os.path.join(directory, "output.config")
+            config.write_to_file(p_filename=output_filename, p_include_defaults=False)
+
+            with open(output_filename) as output_file:
+                content = output_file.read()
+
+        self.assertEqual(content, "[MySection]\nstring=environment\nint=42\nbool=False\nint_array=[7]\n")
+
+    def test_write_to_file_keeps_lazy_sections_unloaded(self):
+
+        config = configuration.Configuration()
+        definition = configuration.OptionalSectionHandlerDefinition()
+        definition.section_name = SECTION_NAME
+        definition.package_name = "python_base_app.test"
+        definition.module_name = "test_configuration"
+        definition.config_model_class_name = "SomeTestConfigModel"
+        definition.lazy = True
+        config.register_optional_section_handler_definition(definition)
+
+        config.read_config_file(p_config_string="[MySection]\n")
+
+        with tempfile.TemporaryDirectory() as directory:
+            output_filename = os.path.join(directory, "output.config")
+            config.write_to_file(p_filename=output_filename, p_include_defaults=False)
+
+            with open(output_filename) as output_file:
+                content = output_file.read()
+
+        self.assertEqual(content, "")
+        self.assertFalse(config[SECTION_NAME].is_loaded)
+
+    def test_apply_changes_merges_option_sources(self):
+
+        config = configuration.Configuration()
+        config.add_section(p_section=SomeTestConfigModel())
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="int", p_option_value=str(NEW_INT_VALUE))
+
+        other_config = configuration.Configuration()
+        other_config.add_section(p_section=SomeTestConfigModel())
+        other_config.read_config_file(
+            p_config_string="[MySection]\nint={value}\nstring=changed\n".format(value=NEW_INT_VALUE))
+
+        changes = config.get_changes(p_other_configuration=other_config)
+        self.assertEqual(list(changes[SECTION_NAME]), ["string"])
+
+        config.apply_changes(p_other_configuration=other_config, p_changes=changes)
+
+        self.assertEqual(config.get_option_source(SECTION_NAME, "int").layer, configuration.SOURCE_API)
+        self.assertEqual(config.get_option_source(SECTION_NAME, "string").layer, configuration.SOURCE_STRING)
+
+    def test_snapshot_is_json_serializable(self):
+
+        config = configuration.Configuration()
+        config.add_section(p_section=TypedTestConfigModel())
+        config.read_config_file(p_config_string="[MySection]\nduration=1h\ntime=12:30\nnone_dict=a=1\n")
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="float", p_option_value="2.25")
+
+        snapshot = json.loads(json.dumps(config.get_snapshot()))
+
+        new_config = configuration.Configuration()
+        model = TypedTestConfigModel()
+        new_config.add_section(p_section=model)
+        new_config.restore_snapshot(p_snapshot=snapshot)
+
+        self.assertEqual(model.duration, 3600)
+        self.assertIsInstance(model.duration, configuration.Duration)
+        self.assertEqual(model.time, datetime.time(hour=12, minute=30))
+        self.assertEqual(model.none_dict, {"a": "1"})
+        self.assertEqual(model.float, 2.25)
+        self.assertIsNone(model.none_float)
+        self.assertEqual(model.comma_separated_list, ["a", "b"])
+        self.assertEqual(new_config.get_option_source(SECTION_NAME, "float").layer, configuration.SOURCE_API)
+        self.assertEqual(new_config.get_option_source(SECTION_NAME, "time").layer, configuration.SOURCE_STRING)
+
+    def test_frozen_view(self):
+
+        config = configuration.Configuration()
+        model = SomeTestConfigModel()
+        config.add_section(p_section=model)
+
+        view = config.get_frozen_view()
+        self.assertIs(view, config.get_frozen_view())
+        self.assertEqual(view[SECTION_NAME]["int_array"], (1, 2))
+
+        with self.assertRaises(TypeError):
+            view[SECTION_NAME]["int"] = 1
+
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="int", p_option_value=str(NEW_INT_VALUE))
+        config.set_config_value(p_section_name=SECTION_NAME, p_option="int_array[2]", p_option_value="3")
+
+        new_view = config.get_frozen_view()
+        self.assertIsNot(view, new_view)
+        self.assertEqual(view[SECTION_NAME]["int"], INT_VALUE)
+        self.assertEqual(view[SECTION_NAME]["int_array"], (1, 2))
+        self.assertEqual(new_view[SECTION_NAME]["int"], NEW_INT_VALUE)
+        self.assertEqual(new_view[SECTION_NAME]["int_array"], (1, 2, 3))
+        self.assertEqual(config.get_option_source(SECTION_NAME, "int").layer, configuration.SOURCE_API)
+
 
 if __name__ == '__main__':
     unittest.main()
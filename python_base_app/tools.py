@@ -18,6 +18,7 @@
 #    with this program; if not, write to the Free Software Foundation, Inc.,
 #    51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
+import contextlib
 import datetime
 import inspect
 import io
@@ -29,6 +30,7 @@ import re
 import socket
 import stat
 import sys
+import tempfile
 import threading
 import time
 import traceback
@@ -406,6 +408,29 @@ def start_simple_thread(method, *args, **kwargs):
     return new_thread
 
 
+@contextlib.contextmanager
+def atomic_write(p_filename, p_mode="w", p_encoding="UTF-8"):
+    """
+    Opens a temporary file in the directory of `p_filename` and renames it to `p_filename` when the block
+    is left without an exception. Otherwise, the temporary file is removed and the original file is kept.
+    """
+
+    directory = os.path.dirname(p_filename) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    handle, temporary_filename = tempfile.mkstemp(dir=directory, prefix="." + os.path.basename(p_filename) + ".")
+
+    try:
+        with os.fdopen(handle, p_mode, encoding=None if "b" in p_mode else p_encoding) as a_file:
+            yield a_file
+
+        os.replace(temporary_filename, p_filename)
+
+    except BaseException as e:
+        os.unlink(temporary_filename)
+        raise e
+
+
 def get_string_as_duration(p_string):
     if p_string is None:
         return None